@@ -1,6 +1,7 @@
 import argparse
+from functools import partial
 
-from skat.game import Tournament
+from skat.game import ParallelTournament, Tournament
 
 
 def get_args():
@@ -11,7 +12,7 @@ def get_args():
     parser.add_argument("-p0", type=str, default="random")
     parser.add_argument("-p1", type=str, default="random")
     parser.add_argument("-p2", type=str, default="random")
-    parser.add_argument("--seed", default=None)
+    parser.add_argument("--seed", type=int, default=None)
     parser.add_argument("--suit-game-only", action=argparse.BooleanOptionalAction)
     parser.add_argument("--hold-position", action=argparse.BooleanOptionalAction)
     parser.add_argument("--declare-game", type=int)
@@ -26,6 +27,23 @@ def get_args():
     parser.add_argument("--iss-file", type=str, default=None)
     parser.add_argument("--epsilon", type=float, default=0.98)
     parser.add_argument("--epsilon-decay", type=float, default=0.995)
+    parser.add_argument(
+        "--pooled",
+        action=argparse.BooleanOptionalAction,
+        help="Reuse one table for all rounds.",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=0, help="Play rounds on n processes."
+    )
+    parser.add_argument(
+        "--actors",
+        type=int,
+        default=0,
+        help="Train the dqn of -m0 with n actor processes instead of a tournament.",
+    )
+    parser.add_argument(
+        "--learner-steps", type=int, default=10000, help="Learner steps with --actors."
+    )
     return parser.parse_args()
 
 
@@ -38,6 +56,8 @@ def get_player(
 ):
     from skat.agents.command_line import CommandLineAgent
     from skat.agents.dqn import DQNAgent
+    from skat.agents.ismcts import ISMCTSAgent
+    from skat.agents.pimc import PIMCAgent
     from skat.agents.random import RandomAgent
 
     match arg:
@@ -45,6 +65,10 @@ def get_player(
             return RandomAgent()
         case "cli":
             return CommandLineAgent()
+        case "pimc":
+            return PIMCAgent()
+        case "ismcts":
+            return ISMCTSAgent()
         case "dqn":
             return DQNAgent(
                 train=training, path=path, epsilon=epsilon, epsilon_decay=epsilon_decay
@@ -53,20 +77,7 @@ def get_player(
             raise Exception("Agent not found.")
 
 
-def get_game(arg: int):
-    from skat.games.suit import SuitGame
-
-    match arg:
-        case 0 | 1 | 2 | 3:
-            return SuitGame(arg)
-        case _:
-            print("did not get this game declaration use 0-3")
-            return None
-
-
-if __name__ == "__main__":
-    args = get_args()
-    rounds = args.rounds
+def get_players(args) -> list:
     agent_args = [args.p0, args.p1, args.p2]
     train_args = [args.t0, args.t1, args.t2]
     path_args = [args.m0, args.m1, args.m2]
@@ -81,15 +92,57 @@ if __name__ == "__main__":
                 epsilon_decay=args.epsilon_decay,
             )
         )
+    return agents
 
-    t = Tournament(
-        rounds=rounds,
-        agents=agents,
+
+def train_actor_learner(args) -> None:
+    from skat.agents.rl.distributed import ActorLearner
+    from skat.agents.rl.dqn import DQN
+
+    dqn = DQN(
+        model_path=args.m0, epsilon=args.epsilon, epsilon_decay=args.epsilon_decay
+    )
+    with ActorLearner(dqn, actors=args.actors, seed=args.seed) as learner:
+        learner.train(args.learner_steps)
+    print(f"{learner.steps} learner steps on {learner.transitions} transitions")
+
+
+def get_game(arg: int):
+    from skat.games.suit import SuitGame
+
+    match arg:
+        case 0 | 1 | 2 | 3:
+            return SuitGame(arg)
+        case _:
+            print("did not get this game declaration use 0-3")
+            return None
+
+
+def play_tournament(args) -> None:
+    config = dict(
+        rounds=args.rounds,
         verbose=args.v,
         seed=args.seed,
         hold_position=args.hold_position,
         declare_game=get_game(args.declare_game),
         iss_file=args.iss_file,
+        pooled=bool(args.pooled),
     )
+    if args.workers > 0:
+        t = ParallelTournament(
+            workers=args.workers, agent_factory=partial(get_players, args), **config
+        )
+    else:
+        t = Tournament(agents=get_players(args), **config)
     t.start()
     print(f"{t.scores}")
+    print(f"soloist [won, lost] per seat: {t.seat_scores}")
+    print(f"soloist [won, lost] per game type: {t.game_type_scores}")
+
+
+if __name__ == "__main__":
+    args = get_args()
+    if args.actors > 0:
+        train_actor_learner(args)
+    else:
+        play_tournament(args)
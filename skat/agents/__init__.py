@@ -116,5 +116,13 @@ class Agent(ABC):
     def set_state(self, state: Player) -> None:
         self.state = state
 
+    def set_rng(self, rng) -> None:
+        """Give the agent its own random stream. Ignored by deterministic agents."""
+        return
+
     def trick_done_event(self, is_terminal) -> None:
         return
+
+    def close(self) -> None:
+        """Release what the agent holds, e.g. worker processes. Ignored by default."""
+        return
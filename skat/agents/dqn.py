@@ -62,13 +62,10 @@ class DQNAgent(skat.agents.command_line.CommandLineAgent):
                 player_id=self.state.seat_id
             )
 
-        # store in buffer
-        self.dqn.replay_buffer.push(
+        # store in buffer and optimize model
+        self.dqn.push(
             state=self.initial_state,
             action=self.last_action,
             next_state=next_state,
             reward=reward,
         )
-
-        # optimize model
-        self.dqn.optimize_model()
@@ -0,0 +1,311 @@
+"""
+Information-set Monte Carlo tree search (ISMCTS) for the card play. Every
+iteration deals the unseen cards anew, walks the tree with the moves that are
+valid in this deal and finishes the game with a rollout policy. The tree is kept
+between the moves of a round.
+"""
+
+import math
+import time
+from random import Random
+from typing import Callable, Optional, Union
+
+import numpy as np
+import torch
+
+from skat.agents.pimc import observe, to_points
+from skat.agents.random import RandomAgent
+from skat.bitboard import card_ids
+from skat.card import CARDS, Card
+from skat.games.tables import NULL
+from skat.observation import HAND_SIZE, OBSERVATION_SIZE, PLAYED_SIZE, TRICK_SIZE
+from skat.sampling import DealSampler
+from skat.search import SearchState
+from skat.solver import MAX_POINTS, VALUES
+from skat.utils.rng import Seed
+
+RolloutPolicy = Callable[[SearchState, int, Random], int]
+
+
+class Node:
+    """A node of the search tree, reached by card of player."""
+
+    __slots__ = ("card", "player", "children", "visits", "reward", "available")
+
+    def __init__(self, card: Optional[int] = None, player: int = -1) -> None:
+        self.card = card
+        self.player = player
+        self.children: dict[int, Node] = dict()
+        self.visits = 0
+        self.reward = 0.0  # summed rewards of player's side
+        self.available = 0  # iterations in which card was a valid move
+
+
+def random_policy(state: SearchState, legal: int, rng: Random) -> int:
+    """Play a random valid card."""
+    cards = card_ids(legal)
+    return cards[rng.randrange(len(cards))]
+
+
+def heuristic_policy(state: SearchState, legal: int, rng: Random) -> int:
+    """
+    Lead the strongest card, add points to a trick of the own side, take other
+    tricks as cheap as possible and throw the lowest card if that's not possible.
+    Null games are played randomly.
+    """
+    if state.type_id == NULL or not legal & (legal - 1):
+        return random_policy(state, legal, rng)
+    cards = card_ids(legal)
+    trick = state.trick
+    if not trick:
+        return max(cards, key=lambda c: state.strength[c][c])
+    strength = state.strength[trick[0]]
+    top = max(range(len(trick)), key=lambda i: strength[trick[i]])
+    top_strength = strength[trick[top]]
+    player = state.next_player
+    winner = (state.leader + top) % 3
+    if (winner == state.soloist) == (player == state.soloist):
+        return max(cards, key=lambda c: (strength[c] <= top_strength, VALUES[c]))
+    winning = [c for c in cards if strength[c] > top_strength]
+    if winning:
+        return min(winning, key=lambda c: strength[c])
+    return min(cards, key=lambda c: (VALUES[c], strength[c]))
+
+
+def observation(state: SearchState, seat: int) -> np.ndarray:
+    """Return the observation of seat in the layout of Round.get_state."""
+    trick_value = sum(VALUES[c] for c in state.trick)
+    color = [trick_value] if state.type_id == NULL else [0, 0, 0, 0, trick_value]
+    if state.type_id < 4:
+        color[state.type_id] = 1
+    played = [card_ids(mask) for mask in state.played]
+    arr = np.zeros(OBSERVATION_SIZE - 5 + len(color), dtype=np.float32)
+    arr[list(card_ids(state.hands[seat]))] = 1
+    offset = HAND_SIZE
+    arr[offset + np.arange(len(color))] = color
+    offset += len(color)
+    arr[offset] = state.points / 120.0
+    arr[offset + 1] = state.defender_points / 120.0
+    offset += 2
+    for i in range(3):
+        arr[[offset + i * HAND_SIZE + c for c in played[i]]] = 1
+    offset += PLAYED_SIZE
+    arr[offset] = trick_value / 120.0
+    offset += 1
+    arr[[offset + c for c in state.trick]] = 1
+    offset += TRICK_SIZE
+    arr[offset + (seat - state.leader) % 3] = 1
+    return arr
+
+
+class NetPolicy:
+    """
+    Rollout policy of a network like SuitSoloNet: play the valid card with the
+    highest output for the observation of the next player. Much slower than the
+    other policies, but guided by what the network learned.
+    """
+
+    def __init__(self, model: torch.nn.Module) -> None:
+        self.model = model.eval()
+
+    def __call__(self, state: SearchState, legal: int, rng: Random) -> int:
+        if not legal & (legal - 1):
+            return legal.bit_length() - 1
+        x = torch.from_numpy(observation(state, state.next_player))
+        with torch.no_grad():
+            output = self.model(x.unsqueeze(0))[0]
+        cards = list(card_ids(legal))
+        return cards[int(output[cards].argmax())]
+
+
+ROLLOUT_POLICIES: dict[str, RolloutPolicy] = {
+    "random": random_policy,
+    "heuristic": heuristic_policy,
+}
+
+
+def reward(state: SearchState) -> float:
+    """
+    The reward of the soloist in a finished state, between 0 and 1: half for the
+    card points, half for winning. Null games are won or lost.
+    """
+    if state.type_id == NULL:
+        return 0.0 if state.soloist_tricks else 1.0
+    return 0.5 * state.points / MAX_POINTS + 0.5 * (state.points > 60)
+
+
+class ISMCTSAgent(RandomAgent):
+    """
+    ISMCTS-Agent: searches a tree over the information sets of the card play and
+    plays the most visited card. Bidding, skat and game declaration are random
+    like RandomAgent.
+
+    Each iteration samples a deal consistent with what the seat has seen, selects
+    children by UCB where a child's exploration term counts the iterations in
+    which its card was available, adds one node and plays the rest of the deal
+    with the rollout policy: "random", "heuristic" or a callable like NetPolicy.
+    The subtree of the played cards is reused by the next choose_card of the same
+    round. A search stops after iterations or time_budget seconds.
+    """
+
+    def __init__(
+        self,
+        iterations: int = 10000,
+        time_budget: Optional[float] = 0.1,
+        exploration: float = 0.7,
+        rollout: Union[str, RolloutPolicy] = "heuristic",
+        reuse: bool = True,
+        rng: Seed = None,
+    ) -> None:
+        super().__init__(rng)
+        if isinstance(rollout, str):
+            if rollout not in ROLLOUT_POLICIES:
+                raise ValueError(f"unknown rollout policy {rollout}")
+            rollout = ROLLOUT_POLICIES[rollout]
+        self.iterations = iterations
+        self.time_budget = time_budget  # seconds per move, None for no limit
+        self.exploration = exploration
+        self.rollout = rollout
+        self.reuse = reuse
+        self.searched = 0  # iterations of the last search
+        self.root: Optional[Node] = None
+        self._root_key: Optional[tuple] = None  # game, soloist and hand of the root
+        self._root_cards: list[int] = list()  # cards played before the root
+
+    def _played_cards(self) -> list[int]:
+        state = self.state.public_state  # type: ignore
+        cards = [card for record in state.trick_history for card in record.cards]
+        cards.extend(turn.card.id for turn in state.game.trick.buffer)
+        return cards
+
+    def _find_root(self, cards: list[int]) -> Node:
+        """Return the node of the tree reached by cards, or a new root."""
+        state = self.state.public_state  # type: ignore
+        key = (state.game, state.solo_player_id)
+        root = self.root
+        known = len(self._root_cards)
+        if (
+            not self.reuse
+            or root is None
+            or self._root_key is None
+            or self._root_key[:2] != key
+            or cards[:known] != self._root_cards
+        ):
+            return Node()
+        hand = self._root_key[2]
+        for card in cards[known:]:
+            hand &= ~(1 << card)
+            root = root.children.get(card)
+            if root is None:
+                return Node()
+        if hand != self.state.hand.mask:  # type: ignore
+            return Node()
+        return root
+
+    def choose_card(self, valid_moves: set[Card]) -> Card:
+        """ISMCTS Agent chooses the most visited valid move"""
+        if self.state is None:
+            raise Exception("Can't choose a card without having a state.")
+        cards = self._played_cards()
+        root = self._find_root(cards)
+        moves = sorted(card.id for card in valid_moves)
+        if len(moves) > 1:
+            self.search(root)
+        choice = max(
+            moves,
+            key=lambda c: root.children[c].visits if c in root.children else -1,
+        )
+        state = self.state.public_state
+        self.root = root
+        self._root_key = (state.game, state.solo_player_id, self.state.hand.mask)
+        self._root_cards = cards
+        self.state.hand.remove(CARDS[choice])
+        return CARDS[choice]
+
+    def search(self, root: Node) -> None:
+        """Run iterations from root until the iteration or time budget is spent."""
+        position, known, hidden, sizes, allowed = observe(self.state)  # type: ignore
+        state = self.state.public_state  # type: ignore
+        soloist = position.soloist
+        # cards of completed tricks per seat, as in the observation
+        trick_mask = state.game.trick.mask
+        played = [mask & ~trick_mask for mask in state.belief.played_by]
+        defender_points = state.points_defenders
+        stack = state.player[soloist].trick_stack
+        soloist_tricks = (len(stack) - len(state.skat)) // 3
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.monotonic() + self.time_budget
+        rng = self.rng
+        sampler = DealSampler(hidden, sizes, allowed)
+        iterations = 0
+        while iterations < self.iterations:
+            slots = sampler.sample(rng)
+            hands = [known[i] | slots[i] for i in range(3)]
+            world = SearchState(
+                position.type_id,
+                soloist,
+                hands,
+                position.leader,
+                position.trick,
+                position.points + to_points(known[3] | slots[3]),
+                defender_points,
+                played,
+                soloist_tricks,
+            )
+            self.iterate(root, world, rng)
+            iterations += 1
+            if deadline is not None and iterations & 15 == 0:
+                if time.monotonic() > deadline:
+                    break
+        self.searched = iterations
+
+    def iterate(self, root: Node, state: SearchState, rng: Random) -> None:
+        """One iteration of selection, expansion, rollout and backpropagation."""
+        node = root
+        path = [root]
+        c = self.exploration
+        log = math.log
+        sqrt = math.sqrt
+        while not state.is_terminal:
+            legal = state.legal_mask()
+            player = state.next_player
+            children = node.children
+            untried = list()
+            best = None
+            best_score = -1.0
+            rest = legal
+            while rest:
+                low = rest & -rest
+                rest ^= low
+                card = low.bit_length() - 1
+                child = children.get(card)
+                if child is None:
+                    untried.append(card)
+                    continue
+                child.available += 1
+                score = child.reward / child.visits + c * sqrt(
+                    log(child.available) / child.visits
+                )
+                if score > best_score:
+                    best, best_score = child, score
+            if untried:
+                card = untried[rng.randrange(len(untried))]
+                child = Node(card, player)
+                child.available = 1
+                children[card] = child
+                state.play(card)
+                path.append(child)
+                break
+            node = best  # type: ignore
+            state.play(node.card)  # type: ignore
+            path.append(node)
+        rollout = self.rollout
+        while not state.is_terminal:
+            state.play(rollout(state, state.legal_mask(), rng))
+        value = reward(state)
+        soloist = state.soloist
+        root.visits += 1
+        for node in path[1:]:
+            node.visits += 1
+            node.reward += value if node.player == soloist else 1.0 - value
@@ -0,0 +1,295 @@
+"""
+Perfect-information Monte Carlo (PIMC) card play. The unseen cards are dealt into
+worlds which agree with everything a seat has seen, every valid card is evaluated
+in each world with open hands and the card with the best average is played.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from typing import NamedTuple, Optional, Sequence
+
+from skat.agents.random import RandomAgent
+from skat.bitboard import iter_cards, popcount
+from skat.card import CARDS, Card
+from skat.games.tables import FOLLOW_MASKS, LEAD_STRENGTH, NULL
+from skat.player import Player
+from skat.sampling import DealSampler
+from skat.solver import MAX_POINTS, VALUES, Solver
+from skat.trick import lookup_winner
+from skat.utils.rng import Seed
+
+GOALS = (61, 91, 120)  # soloist card points to win, win schneider and schwarz
+SOLVER_TABLE_BITS = 18
+SOLVE_TRICKS = 6  # tricks left when PIMCAgent starts to solve instead of rollouts
+EVALUATORS = ("solver", "rollout")
+
+_solver: Optional[Solver] = None  # reused by evaluate_worlds of one process
+
+
+class World(NamedTuple):
+    """A deal of all cards still in play, consistent with a seat's observations."""
+
+    hands: tuple[int, int, int]  # card masks
+    skat: int  # card mask
+
+
+class Position(NamedTuple):
+    """The public part of the card play, shared by all worlds."""
+
+    type_id: int
+    soloist: int
+    leader: int
+    trick: tuple[int, ...]  # card ids of the current trick
+    points: int  # card points of the tricks the soloist took
+
+
+def play(
+    position: Position, hands: list[int], card: int
+) -> tuple[Position, Optional[int]]:
+    """
+    Play card for the next player, hands are updated in place. Returns the new
+    position and the winner if the card completed a trick.
+    """
+    type_id, soloist, leader, trick, points = position
+    hands[(leader + len(trick)) % 3] ^= 1 << card
+    trick = trick + (card,)
+    if len(trick) < 3:
+        return position._replace(trick=trick), None
+    winner = (leader + lookup_winner(LEAD_STRENGTH[type_id][trick[0]], *trick)) % 3
+    if winner == soloist:
+        points += VALUES[trick[0]] + VALUES[trick[1]] + VALUES[trick[2]]
+    return Position(type_id, soloist, winner, (), points), winner
+
+
+def rollout(position: Position, hands: list[int], rng: Random) -> int:
+    """
+    Play the position to the end with random valid cards. Returns the final card
+    points of the soloist (120 or 0 in null games, for a won or lost game).
+    """
+    hands = list(hands)
+    follow = FOLLOW_MASKS[position.type_id]
+    null = position.type_id == NULL
+    while hands[0] | hands[1] | hands[2]:
+        hand = hands[(position.leader + len(position.trick)) % 3]
+        if position.trick:
+            hand = hand & follow[position.trick[0]] or hand
+        cards = [card.id for card in iter_cards(hand)]
+        position, winner = play(position, hands, cards[rng.randrange(len(cards))])
+        if null and winner == position.soloist:
+            return 0
+    if null:
+        return MAX_POINTS
+    return position.points
+
+
+def to_points(mask: int) -> int:
+    """Return the card points of a card mask."""
+    return sum(card.value for card in iter_cards(mask))
+
+
+def goal(points: int) -> int:
+    """The next goal of the soloist, given the card points taken so far."""
+    for points_goal in GOALS:
+        if points < points_goal:
+            return points_goal
+    return GOALS[-1]
+
+
+def observe(player: Player) -> tuple[Position, list[int], int, list[int], list[int]]:
+    """
+    Collect what player knows about the card play. Returns the position, the known
+    cards of the seats and the skat, the hidden card mask, the number of hidden
+    cards per slot and the masks of the cards each slot may hold, see
+    BeliefState.constraints.
+    """
+    state = player.public_state
+    known, hidden, sizes, allowed = state.belief.constraints(player.seat_id)
+    # the card points of the soloist's tricks are public, the skat is not
+    points = state.points_soloist - sum(card.value for card in state.skat)
+    trick = tuple(turn.card.id for turn in state.game.trick.buffer)
+    position = Position(
+        state.game.type_id, state.solo_player_id, state.front_hand, trick, points
+    )
+    return position, known, hidden, sizes, allowed
+
+
+def evaluate_worlds(
+    position: Position,
+    worlds: Sequence[World],
+    moves: Sequence[int],
+    evaluator: str = "solver",
+    rollouts: int = 8,
+    seed: Seed = None,
+    deadline: Optional[float] = None,
+    solve_tricks: int = 10,
+) -> list[list[float]]:
+    """
+    Evaluate moves in every world from the soloist's point of view. The solver
+    answers if the soloist reaches its next goal (1.0 or 0.0), rollouts average
+    the soloist's final card points. The solver is only used if at most
+    solve_tricks tricks are left, earlier positions are rolled out. Stops after
+    the first world which ends past the time.monotonic() deadline. Returns a row
+    of move values per world.
+    """
+    global _solver
+    if evaluator == "solver" and worlds:
+        cards = popcount(worlds[0].hands[0] | worlds[0].hands[1] | worlds[0].hands[2])
+        if (cards + len(position.trick) + 2) // 3 > solve_tricks:
+            evaluator = "rollout"
+    if evaluator == "solver":
+        if _solver is None or (_solver.type_id, _solver.soloist) != position[:2]:
+            _solver = Solver(*position[:2], table_bits=SOLVER_TABLE_BITS)
+    elif evaluator != "rollout":
+        raise ValueError(f"unknown evaluator {evaluator}")
+    rng = Random(seed)
+    rows = list()
+    for hands, skat in worlds:
+        base = position._replace(points=position.points + to_points(skat))
+        target = goal(base.points)
+        row = list()
+        for card in moves:
+            next_hands = list(hands)
+            next_position, winner = play(base, next_hands, card)
+            if evaluator == "rollout":
+                total = sum(
+                    rollout(next_position, next_hands, rng) for _ in range(rollouts)
+                )
+                row.append(total / rollouts)
+            elif position.type_id == NULL:
+                if winner == position.soloist:
+                    row.append(0.0)
+                else:
+                    solution = _solver.solve(  # type: ignore
+                        next_hands, next_position.leader, next_position.trick
+                    )
+                    row.append(float(solution.value == MAX_POINTS))
+            else:
+                need = target - next_position.points
+                solution = _solver.solve(  # type: ignore
+                    next_hands,
+                    next_position.leader,
+                    next_position.trick,
+                    alpha=need - 1,
+                    beta=need,
+                )
+                row.append(float(solution.value >= need))
+        rows.append(row)
+        if deadline is not None and time.monotonic() > deadline:
+            break
+    return rows
+
+
+class PIMCAgent(RandomAgent):
+    """
+    PIMC-Agent: plays the card with the best average over sampled worlds. Worlds
+    are solved with open hands once at most solve_tricks tricks are left and
+    played out by random rollouts before (or always with evaluator="rollout").
+    Bidding, skat and game declaration are random like RandomAgent.
+
+    Worlds respect the seat's own cards, all played cards, the pressed skat of the
+    soloist and the suits a seat is known to be void in. With workers > 0 the
+    worlds are split over a process pool, which is kept until close().
+    """
+
+    def __init__(
+        self,
+        worlds: int = 32,
+        time_budget: Optional[float] = 0.05,
+        workers: int = 0,
+        evaluator: str = "solver",
+        rollouts: int = 8,
+        solve_tricks: int = SOLVE_TRICKS,
+        rng: Seed = None,
+    ) -> None:
+        if evaluator not in EVALUATORS:
+            raise ValueError(f"unknown evaluator {evaluator}")
+        if worlds < 1:
+            raise ValueError("at least one world is needed")
+        super().__init__(rng)
+        self.worlds = worlds
+        self.time_budget = time_budget  # seconds per move, None for no limit
+        self.workers = workers
+        self.evaluator = evaluator
+        self.rollouts = rollouts
+        self.solve_tricks = solve_tricks
+        self.evaluated = 0  # worlds evaluated for the last card
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def close(self) -> None:
+        """Shut the process pool down."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def observe(self) -> tuple[Position, list[int], int, list[int], list[int]]:
+        """Collect what the seat knows about the card play, see observe()."""
+        if self.state is None:
+            raise Exception("Can't observe without having a state.")
+        return observe(self.state)
+
+    def sample_worlds(self, n: int) -> tuple[Position, list[World]]:
+        """Sample n worlds consistent with the seat's observations."""
+        position, known, hidden, sizes, allowed = self.observe()
+        sampler = DealSampler(hidden, sizes, allowed)
+        worlds = list()
+        for _ in range(n):
+            slots = sampler.sample(self.rng)
+            hands = tuple(k | s for k, s in zip(known, slots))
+            worlds.append(World(hands[:3], hands[3]))  # type: ignore
+        return position, worlds
+
+    def choose_card(self, valid_moves: set[Card]) -> Card:
+        """PIMC Agent chooses the valid move with the best average over worlds"""
+        if self.state is None:
+            raise Exception("Can't choose a card without having a state.")
+        moves = sorted(card.id for card in valid_moves)
+        if len(moves) == 1:
+            choice = CARDS[moves[0]]
+        else:
+            deadline = None
+            if self.time_budget is not None:
+                deadline = time.monotonic() + self.time_budget
+            position, worlds = self.sample_worlds(self.worlds)
+            rows = self.evaluate(position, worlds, moves, deadline)
+            self.evaluated = len(rows)
+            sign = 1 if self.state.seat_id == position.soloist else -1
+            totals = [sign * sum(values) for values in zip(*rows)]
+            # ties are broken by throwing fewer points
+            best = max(range(len(moves)), key=lambda i: (totals[i], -VALUES[moves[i]]))
+            choice = CARDS[moves[best]]
+        self.state.hand.remove(choice)
+        return choice
+
+    def evaluate(
+        self,
+        position: Position,
+        worlds: list[World],
+        moves: list[int],
+        deadline: Optional[float],
+    ) -> list[list[float]]:
+        """Evaluate the worlds here or split over the process pool."""
+        args = (moves, self.evaluator, self.rollouts)
+        tricks = self.solve_tricks
+        if self.workers <= 0:
+            seed = self.rng.getrandbits(64)
+            return evaluate_worlds(position, worlds, *args, seed, deadline, tricks)
+        n = self.workers
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(n)
+        futures = [
+            self._pool.submit(
+                evaluate_worlds,
+                position,
+                worlds[i::n],
+                *args,
+                self.rng.getrandbits(64),
+                deadline,
+                tricks,
+            )
+            for i in range(min(n, len(worlds)))
+        ]
+        rows = list()
+        for future in futures:
+            rows.extend(future.result())
+        return rows
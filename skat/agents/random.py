@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import random
 from typing import TYPE_CHECKING, Optional
 
 from skat.agents import Agent
@@ -9,6 +8,7 @@ from skat.games.grand import Grand
 from skat.games.null import Null
 from skat.games.suit import SuitGame
 from skat.player import Player
+from skat.utils.rng import Seed, make_rng
 
 if TYPE_CHECKING:
     from skat.games import Game
@@ -20,10 +20,14 @@ class RandomAgent(Agent):
     by an equal distributed random policy.
     """
 
-    def __init__(self) -> None:
-        """Initializes the random agent with a fixed seed."""
+    def __init__(self, rng: Seed = None) -> None:
+        """Initializes the random agent with its own random stream."""
         self.state: Optional[Player] = None
-        self.max_bid = random.choice(self.VALID_BIDS)
+        self.rng = make_rng(rng)
+        self.max_bid = self.rng.choice(self.VALID_BIDS)
+
+    def set_rng(self, rng: Seed) -> None:
+        self.rng = make_rng(rng)
 
     def bid(self, current_bid, offer=False) -> int:
         """Random Agent selects a bid from a list containing valid bids"""
@@ -35,14 +39,14 @@ class RandomAgent(Agent):
 
     def pickup_skat(self, state) -> bool:
         """Random Agent selects skats equal distributed"""
-        return bool(random.getrandbits(1))
+        return bool(self.rng.getrandbits(1))
 
     def press_skat(self) -> list[Card]:
         if self.state is None:
             raise Exception("Can't choose a card without having a state.")
         skat = list()
         for i in range(2):
-            skat.append(self.state.hand.pop(random.randint(0, 11 - i)))
+            skat.append(self.state.hand.pop(self.rng.randint(0, 11 - i)))
         return skat
 
     def declare_game(self, state) -> Game:
@@ -55,12 +59,12 @@ class RandomAgent(Agent):
             SuitGame(2),
             SuitGame(3),
         )
-        return random.choice(available_games)
+        return self.rng.choice(available_games)
 
     def choose_card(self, valid_moves: set[Card]) -> Card:
         """Random Agent chooses a random valid move"""
         if self.state is None:
             raise Exception("Can't choose a card without having a state.")
-        choice = random.choice(list(valid_moves))
+        choice = self.rng.choice(list(valid_moves))
         self.state.hand.remove(choice)
         return choice
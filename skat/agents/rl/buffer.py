@@ -1,22 +1,281 @@
-import random
-from collections import deque, namedtuple
+from typing import NamedTuple, Optional
 
-Transition = namedtuple("Transition", ("state", "action", "next_state", "reward"))
+import numpy as np
+import torch
+
+
+class Batch(NamedTuple):
+    """A batch of transitions, one row per transition."""
+
+    state: torch.Tensor  # (n, state_size)
+    action: torch.Tensor  # (n,) action indices
+    next_state: torch.Tensor  # (n, state_size), zeros for terminal transitions
+    reward: torch.Tensor  # (n,)
+    done: torch.Tensor  # (n,) True for terminal transitions
+    rows: torch.Tensor  # (n,) buffer rows of the transitions
+    weight: torch.Tensor  # (n,) importance-sampling weights of the loss
 
 
 class ReplayBuffer:
-    def __init__(self, buffer_size: int = 1000) -> None:
-        """ReplayBuffer stores Transitions in a FIFO buffer."""
-        self.buffer: deque[Transition] = deque([], maxlen=buffer_size)
+    def __init__(
+        self,
+        buffer_size: int = 1000,
+        state_size: Optional[int] = None,
+        device: str = "cpu",
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        ReplayBuffer stores transitions in preallocated tensors, used as a ring
+        buffer: the oldest transition is overwritten once the buffer is full. The
+        tensors are allocated by the first push if state_size is not given.
+        """
+        self.buffer_size = buffer_size
+        self.device = device
+        self.cursor = 0  # row of the next push
+        self.size = 0
+        self.generator = torch.Generator()
+        if seed is not None:
+            self.generator.manual_seed(seed)
+        self.states: Optional[torch.Tensor] = None
+        self.actions = torch.zeros(buffer_size, dtype=torch.long, device=device)
+        self.next_states: Optional[torch.Tensor] = None
+        self.rewards = torch.zeros(buffer_size, dtype=torch.float32, device=device)
+        self.dones = torch.zeros(buffer_size, dtype=torch.bool, device=device)
+        if state_size is not None:
+            self._allocate(state_size)
+
+    def _allocate(self, state_size: int) -> None:
+        shape = (self.buffer_size, state_size)
+        self.states = torch.zeros(shape, dtype=torch.float32, device=self.device)
+        self.next_states = torch.zeros_like(self.states)
+
+    def push(self, state, action, next_state, reward, done=None) -> int:
+        """
+        Add a transition to the buffer and return its row. The action is an index
+        or a one-hot row, a next_state of None marks a terminal transition.
+        """
+        state = torch.as_tensor(state).reshape(-1)
+        if self.states is None:
+            self._allocate(state.numel())
+        action = torch.as_tensor(action)
+        if action.numel() > 1:
+            action = action.reshape(-1).argmax()
+        if done is None:
+            done = next_state is None
+        i = self.cursor
+        self.states[i] = state  # type: ignore
+        self.actions[i] = action.reshape(())
+        if next_state is None:
+            self.next_states[i] = 0  # type: ignore
+        else:
+            self.next_states[i] = torch.as_tensor(next_state).reshape(-1)  # type: ignore
+        self.rewards[i] = float(reward)
+        self.dones[i] = bool(done)
+        self.cursor = (i + 1) % self.buffer_size
+        self.size = min(self.size + 1, self.buffer_size)
+        return i
+
+    def push_batch(self, states, actions, next_states, rewards, dones) -> torch.Tensor:
+        """
+        Add n transitions at once: states and next_states (n, state_size), action
+        indices, rewards and done flags (n,). Returns the rows written to.
+        """
+        states = torch.as_tensor(states, dtype=torch.float32)
+        n = len(states)
+        if self.states is None:
+            self._allocate(states.shape[1])
+        rows = (self.cursor + torch.arange(n)) % self.buffer_size
+        if n > self.buffer_size:
+            # only the last buffer_size transitions are kept
+            keep = slice(n - self.buffer_size, n)
+            states, rows = states[keep], rows[keep]
+            next_states, actions = next_states[keep], actions[keep]
+            rewards, dones = rewards[keep], dones[keep]
+        rows = rows.to(self.device)
+        self.states[rows] = states.to(self.device)  # type: ignore
+        self.actions[rows] = torch.as_tensor(actions, device=self.device).long()
+        next_states = torch.as_tensor(next_states, dtype=torch.float32)
+        self.next_states[rows] = next_states.to(self.device)  # type: ignore
+        self.rewards[rows] = torch.as_tensor(rewards, device=self.device).float()
+        self.dones[rows] = torch.as_tensor(dones, device=self.device).bool()
+        self.cursor = (self.cursor + n) % self.buffer_size
+        self.size = min(self.size + n, self.buffer_size)
+        return rows
 
-    def push(self, **kwargs):
-        """Add a transition to the buffer."""
-        self.buffer.append(Transition(**kwargs))
+    def sample_indices(self, batch_size: int) -> torch.Tensor:
+        """Return batch_size distinct random rows, in ascending order."""
+        if batch_size > self.size:
+            raise ValueError("sample larger than buffer")
+        if 2 * batch_size > self.size:
+            # a permutation of the buffer isn't much larger than the batch
+            rows = torch.randperm(self.size, generator=self.generator)[:batch_size]
+            return rows.sort().values.to(self.device)
+        # draw rows and redraw the duplicates, O(batch_size) instead of O(size)
+        rows = torch.randint(self.size, (batch_size,), generator=self.generator)
+        rows = rows.unique()
+        while len(rows) < batch_size:
+            missing = batch_size - len(rows)
+            extra = torch.randint(self.size, (missing,), generator=self.generator)
+            rows = torch.cat((rows, extra)).unique()
+        return rows.to(self.device)
 
-    def sample(self, batch_size: int):
-        """Return a random sample from the buffer."""
-        return random.sample(self.buffer, batch_size)
+    def gather(
+        self, rows: torch.Tensor, weight: Optional[torch.Tensor] = None
+    ) -> Batch:
+        """Return the transitions of rows as Batch, weighted 1 by default."""
+        if weight is None:
+            weight = torch.ones(len(rows), device=self.device)
+        return Batch(
+            self.states[rows],  # type: ignore
+            self.actions[rows],
+            self.next_states[rows],  # type: ignore
+            self.rewards[rows],
+            self.dones[rows],
+            rows,
+            weight,
+        )
+
+    def sample(self, batch_size: int) -> Batch:
+        """Return a random batch of distinct transitions."""
+        return self.gather(self.sample_indices(batch_size))
 
     def __len__(self):
         """Buffer size."""
-        return len(self.buffer)
+        return self.size
+
+
+class SumTree:
+    """
+    Binary tree in an array whose leaves hold non-negative priorities and whose
+    inner nodes hold the sum of their children. Node i has the children 2i and
+    2i+1, the leaves are the nodes capacity, ..., 2 capacity - 1 and node 1 is the
+    root. Updates and prefix-sum searches take O(log n) and run on whole arrays
+    of leaves at once.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.capacity = 1
+        while self.capacity < size:
+            self.capacity *= 2
+        self.tree = np.zeros(2 * self.capacity, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        """Sum of all priorities."""
+        return float(self.tree[1])
+
+    def __getitem__(self, leaves):
+        return self.tree[np.asarray(leaves) + self.capacity]
+
+    def update(self, leaves, priorities) -> None:
+        """Set the priorities of leaves and the sums above them."""
+        nodes = np.asarray(leaves, dtype=np.int64).reshape(-1) + self.capacity
+        self.tree[nodes] = priorities
+        nodes = np.unique(nodes // 2)
+        while nodes[0] >= 1:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            if nodes[0] == 1:
+                break
+            nodes = np.unique(nodes // 2)
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """Return the leaf each value falls into, the leaves cover [0, total)."""
+        nodes = np.ones(len(values), dtype=np.int64)
+        values = np.array(values, dtype=np.float64)
+        while nodes[0] < self.capacity:
+            nodes *= 2
+            left = self.tree[nodes]
+            right = values >= left
+            values -= np.where(right, left, 0.0)
+            nodes += right
+        return nodes - self.capacity
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    def __init__(
+        self,
+        buffer_size: int = 1000,
+        state_size: Optional[int] = None,
+        device: str = "cpu",
+        seed: Optional[int] = None,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        beta_increment: float = 1e-4,
+        epsilon: float = 1e-3,
+    ) -> None:
+        """
+        PrioritizedReplayBuffer samples a transition with a probability
+        proportional to its priority (|TD error| + epsilon) ** alpha, kept in a
+        SumTree. New transitions get the highest priority seen so far, so every
+        transition is replayed at least once. Batches are weighted by the
+        importance-sampling weights (n P(i)) ** -beta scaled to a maximum of 1,
+        beta grows by beta_increment per sample up to 1.
+        """
+        super().__init__(buffer_size, state_size, device, seed)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        self.tree = SumTree(buffer_size)
+        self.rng = np.random.default_rng(seed)
+        # writes per row, to tell a sampled transition from a newer one in its row
+        self.versions = np.zeros(buffer_size, dtype=np.int64)
+
+    def push(self, state, action, next_state, reward, done=None) -> int:
+        row = super().push(state, action, next_state, reward, done)
+        self.tree.update([row], self.max_priority**self.alpha)
+        self.versions[row] += 1
+        return row
+
+    def push_batch(self, states, actions, next_states, rewards, dones) -> torch.Tensor:
+        rows = super().push_batch(states, actions, next_states, rewards, dones)
+        indices = rows.cpu().numpy()
+        self.tree.update(indices, self.max_priority**self.alpha)
+        np.add.at(self.versions, indices, 1)
+        return rows
+
+    def row_versions(self, rows: torch.Tensor) -> np.ndarray:
+        """Return the versions of rows, see update_priorities."""
+        return self.versions[rows.cpu().numpy()]
+
+    def sample_indices(self, batch_size: int) -> torch.Tensor:
+        """Return batch_size rows drawn by priority, one per equal slice of the sum."""
+        if batch_size > self.size:
+            raise ValueError("sample larger than buffer")
+        segment = self.tree.total / batch_size
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+        rows = np.minimum(self.tree.find(values), self.size - 1)
+        return torch.as_tensor(rows, device=self.device)
+
+    def sample(self, batch_size: int) -> Batch:
+        """Return a batch drawn by priority with its importance-sampling weights."""
+        rows = self.sample_indices(batch_size)
+        probabilities = self.tree[rows.cpu().numpy()] / self.tree.total
+        weight = (self.size * probabilities) ** -self.beta
+        weight /= weight.max()
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        weight = torch.as_tensor(weight, dtype=torch.float32, device=self.device)
+        return self.gather(rows, weight)
+
+    def update_priorities(
+        self,
+        rows: torch.Tensor,
+        errors: torch.Tensor,
+        versions: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Set the priorities of rows from their absolute TD errors. With the
+        versions of row_versions at sampling time, rows overwritten since keep the
+        priority of their new transition.
+        """
+        errors = errors.detach().abs().reshape(-1).cpu().double().numpy()
+        priorities = errors + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        indices = rows.cpu().numpy()
+        if versions is not None:
+            current = self.versions[indices] == versions
+            indices, priorities = indices[current], priorities[current]
+            if not len(indices):
+                return
+        self.tree.update(indices, priorities**self.alpha)
@@ -0,0 +1,235 @@
+"""
+Actor/learner training of a DQN. Actor processes play batches of RoundEnvs with
+a frozen copy of the policy and send their transitions in chunks of numpy
+arrays through a queue. The learner, the calling process, fills the replay
+buffer, optimizes the model and publishes its weights to shared memory every
+publish_every steps. Actors load the newest weights before every step of their
+environments.
+"""
+
+import os
+from queue import Empty, Full
+from typing import Any, Optional
+
+import torch
+import torch.multiprocessing as mp
+import torch.nn as nn
+
+from skat.observation import OBSERVATION_SIZE
+from skat.utils.rng import Seed, make_generator, make_seed_sequence, round_seed
+
+from .dqn import DQN
+from .env import SkatVectorEnv
+
+
+class SharedWeights:
+    """The parameters and buffers of a model in shared memory, with a version."""
+
+    def __init__(self, model: nn.Module, context=mp) -> None:
+        self.tensors = {
+            name: tensor.detach().cpu().clone().share_memory_()
+            for name, tensor in model.state_dict().items()
+        }
+        self.version = context.Value("q", 0)
+
+    def publish(self, model: nn.Module) -> int:
+        """Copy the weights of model to shared memory, return the new version."""
+        with self.version.get_lock():
+            for name, tensor in model.state_dict().items():
+                self.tensors[name].copy_(tensor)
+            self.version.value += 1
+            return self.version.value
+
+    def load(self, model: nn.Module, version: int = -1) -> int:
+        """Load the weights into model if they are newer than version."""
+        if self.version.value == version:
+            return version
+        with self.version.get_lock():
+            model.load_state_dict(self.tensors)
+            return self.version.value
+
+
+def materialize(model: nn.Module) -> nn.Module:
+    """Initialize the lazy layers of model with a forward pass."""
+    with torch.no_grad():
+        model(torch.zeros((1, OBSERVATION_SIZE)))
+    return model
+
+
+def _put(queue, item, stop) -> None:
+    """Put item into the queue, waiting while it's full until stop is set."""
+    while not stop.is_set():
+        try:
+            queue.put(item, timeout=0.1)
+            return
+        except Full:
+            continue
+
+
+def _actor(
+    weights: SharedWeights,
+    queue,
+    stop,
+    model: type,
+    num_envs: int,
+    chunk_size: int,
+    epsilon: tuple[float, float, float],
+    seed: Seed,
+    env_kwargs: dict,
+) -> None:
+    """Play epsilon-greedy with the published policy and send the transitions."""
+    torch.set_num_threads(1)
+    policy = materialize(model())
+    version = weights.load(policy)
+    env_seed, explore_seed = make_seed_sequence(seed).spawn(2)
+    rng = make_generator(explore_seed)
+    epsilon_value, epsilon_decay, epsilon_min = epsilon
+    chunk: list[tuple] = list()
+    size = 0
+    with SkatVectorEnv(num_envs, seed=env_seed, **env_kwargs) as env:
+        observations, masks = env.reset()
+        while not stop.is_set():
+            version = weights.load(policy, version)
+            with torch.no_grad():
+                logits = policy(observations)
+            actions = logits.masked_fill(~masks, float("-inf")).argmax(dim=1)
+            explore = torch.from_numpy(rng.random(num_envs) < epsilon_value)
+            if explore.any():
+                legal = masks[explore].float()
+                actions[explore] = torch.multinomial(legal, 1).squeeze(1)
+            epsilon_value = max(epsilon_min, epsilon_value * epsilon_decay)
+            next_observations, masks, rewards, dones, _ = env.step(actions)
+            # next observations of finished rounds are from the new round, the
+            # done flags exclude them from the targets
+            chunk.append((observations, actions, next_observations, rewards, dones))
+            observations = next_observations
+            size += num_envs
+            if size >= chunk_size:
+                arrays = tuple(torch.cat(part).numpy() for part in zip(*chunk))
+                _put(queue, arrays, stop)
+                chunk, size = list(), 0
+
+
+class ActorLearner:
+    """
+    Trains dqn with actor processes that play RoundEnvs, see the module docstring.
+    Every actor steps num_envs environments at once and sends chunk_size
+    transitions per chunk, the queue holds at most queue_size chunks. env_kwargs
+    are passed to the SkatVectorEnv of the actors and have to be picklable.
+    """
+
+    def __init__(
+        self,
+        dqn: DQN,
+        actors: int = 0,
+        publish_every: int = 100,
+        num_envs: int = 16,
+        chunk_size: int = 256,
+        queue_size: int = 0,
+        seed: Seed = None,
+        context: str = "spawn",
+        **env_kwargs,
+    ) -> None:
+        self.dqn = dqn
+        self.actors = actors or max(1, (os.cpu_count() or 1) - 1)
+        self.publish_every = publish_every
+        self.num_envs = num_envs
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size or 4 * self.actors
+        self.seed_sequence = make_seed_sequence(seed)
+        self.context = mp.get_context(context)
+        self.env_kwargs = env_kwargs
+        self.steps = 0  # learner steps
+        self.transitions = 0  # transitions received from the actors
+        self.weights: Optional[SharedWeights] = None
+        self.queue: Any = None
+        self.stop: Any = None
+        self.processes: list = list()
+
+    def start(self) -> None:
+        """Publish the current weights and start the actor processes."""
+        policy = self.dqn.policy_net
+        self.weights = SharedWeights(policy, self.context)
+        self.queue = self.context.Queue(self.queue_size)
+        self.stop = self.context.Event()
+        epsilon = (self.dqn.epsilon, self.dqn.epsilon_decay, self.dqn.epsilon_min)
+        for i in range(self.actors):
+            process = self.context.Process(
+                target=_actor,
+                args=(
+                    self.weights,
+                    self.queue,
+                    self.stop,
+                    type(policy),
+                    self.num_envs,
+                    self.chunk_size,
+                    epsilon,
+                    round_seed(self.seed_sequence, i),
+                    self.env_kwargs,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+
+    def collect(self, block: bool = False) -> int:
+        """
+        Move the queued chunks into the replay buffer, waiting for one if block is
+        set. Returns the number of new transitions.
+        """
+        received = 0
+        while True:
+            try:
+                chunk = (
+                    self.queue.get(timeout=1.0) if block else self.queue.get_nowait()
+                )
+            except Empty:
+                if block:
+                    self._check_actors()
+                    continue
+                break
+            states, actions, next_states, rewards, dones = chunk
+            self.dqn.replay_buffer.push_batch(
+                states, actions, next_states, rewards, dones
+            )
+            received += len(states)
+            block = False
+        self.transitions += received
+        return received
+
+    def _check_actors(self) -> None:
+        for process in self.processes:
+            if process.exitcode is not None:
+                raise Exception(f"actor {process.pid} exited with {process.exitcode}")
+
+    def train(self, steps: int) -> None:
+        """Do steps learner steps, once the replay buffer holds a batch."""
+        if not self.processes:
+            self.start()
+        for _ in range(steps):
+            self.collect()
+            while len(self.dqn.replay_buffer) < self.dqn.batch_size:
+                self.collect(block=True)
+            self.dqn.optimize_model()
+            self.steps += 1
+            if self.steps % self.publish_every == 0:
+                self.weights.publish(self.dqn.policy_net)  # type: ignore
+
+    def close(self) -> None:
+        """Stop the actors, chunks still in the queue are dropped."""
+        if self.stop is not None:
+            self.stop.set()
+        for process in self.processes:
+            while process.is_alive():
+                try:
+                    self.queue.get(timeout=0.1)
+                except Empty:
+                    pass
+            process.join()
+        self.processes = list()
+
+    def __enter__(self) -> "ActorLearner":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -1,5 +1,7 @@
 import os
 import random
+import threading
+from typing import Optional
 
 import torch
 import torch.nn as nn
@@ -8,8 +10,9 @@ import torch.optim
 from torch.utils.tensorboard import SummaryWriter
 
 import skat.models
+from skat.observation import OBSERVATION_SIZE
 
-from .buffer import ReplayBuffer, Transition
+from .buffer import PrioritizedReplayBuffer, ReplayBuffer
 from .mask import MaskedCategorical
 
 
@@ -27,6 +30,10 @@ class DQN:
         learning_rate: float = 1e-4,
         model=skat.models.SuitSoloNet,
         model_path="./trained_models/checkpoint.pt",
+        prioritized: bool = False,
+        update_ratio: float = 1.0,
+        asynchronous: bool = False,
+        max_pending: int = 8,
     ) -> None:
         # use either 'cuda' or 'cpu'
         self.device = device
@@ -44,6 +51,10 @@ class DQN:
         # Networks
         self.policy_net = model().to(self.device)
         self.target_net = model().to(self.device)
+        # initialize lazy layers, before the weights are copied or used by threads
+        with torch.no_grad():
+            for net in (self.policy_net, self.target_net):
+                net(torch.zeros((1, OBSERVATION_SIZE), device=self.device))
 
         self.model_path = model_path
 
@@ -58,8 +69,11 @@ class DQN:
             self.policy_net.parameters(), lr=self.learning_rate
         )
 
-        # buffer
-        self.replay_buffer = ReplayBuffer(buffer_size=100000)
+        # buffer, prioritized replays transitions with large TD errors more often
+        buffer = PrioritizedReplayBuffer if prioritized else ReplayBuffer
+        self.replay_buffer: ReplayBuffer = buffer(
+            buffer_size=100000, device=self.device
+        )
 
         # step counter
         self.episode = 0
@@ -67,6 +81,23 @@ class DQN:
         # tensorboard
         self.writer = SummaryWriter()
 
+        # gradient steps per pushed transition, with asynchronous=True they run on
+        # a learner thread and push waits while more than max_pending are owed
+        self.update_ratio = update_ratio
+        self.max_pending = max_pending
+        self.pending = 0.0  # owed gradient steps
+        self.buffer_lock = threading.Lock()
+        # only the learner writes the policy net, greedy actions read it between
+        # optimizer steps
+        self.net_lock = threading.Lock()
+        self.learner_ready = threading.Condition()
+        self.learner: Optional[threading.Thread] = None
+        self.learner_error: Optional[BaseException] = None
+        self.stopped = False
+        if asynchronous:
+            self.learner = threading.Thread(target=self._learn, daemon=True)
+            self.learner.start()
+
     def select_action(
         self, state: torch.Tensor, valid_actions: torch.Tensor, explore: bool = True
     ) -> torch.Tensor:
@@ -83,7 +114,8 @@ class DQN:
             return action
         else:
             # select with (1-epsilon) probability a greedy argmax action
-            prediction = self.policy_net(state)
+            with self.net_lock, torch.no_grad():
+                prediction = self.policy_net(state)
             mc = MaskedCategorical(
                 logits=prediction,
                 mask=valid_actions,
@@ -92,45 +124,92 @@ class DQN:
             action[0][argmax] = 1
             return action
 
-    def optimize_model(self):
-        self.episode += 1
-        if len(self.replay_buffer) < self.batch_size:
+    def push(self, state, action, next_state, reward) -> None:
+        """
+        Store a transition and do the gradient steps it's owed, or leave them to
+        the learner thread.
+        """
+        with self.buffer_lock:
+            self.replay_buffer.push(
+                state=state, action=action, next_state=next_state, reward=reward
+            )
+        if self.learner is None:
+            self.pending += self.update_ratio
+            while self.pending >= 1:
+                self.pending -= 1
+                self.optimize_model()
             return
+        with self.learner_ready:
+            self.pending += self.update_ratio
+            self.learner_ready.notify_all()
+            # throttle the data collection while the learner falls behind
+            while self.pending > self.max_pending and self.learner_error is None:
+                self.learner_ready.wait()
+        if self.learner_error is not None:
+            raise Exception("the learner thread failed") from self.learner_error
+
+    def _learn(self) -> None:
+        """Do the owed gradient steps until close is called."""
+        try:
+            while True:
+                with self.learner_ready:
+                    while self.pending < 1 and not self.stopped:
+                        self.learner_ready.wait()
+                    if self.stopped:
+                        return
+                self.optimize_model()
+                with self.learner_ready:
+                    self.pending -= 1
+                    self.learner_ready.notify_all()
+        except BaseException as error:
+            with self.learner_ready:
+                self.learner_error = error
+                self.learner_ready.notify_all()
+
+    def close(self) -> None:
+        """Stop the learner thread, owed gradient steps are dropped."""
+        with self.learner_ready:
+            self.stopped = True
+            self.learner_ready.notify_all()
+        if self.learner is not None:
+            self.learner.join()
+            self.learner = None
 
-        # get a random sample from buffer (size=batch_size)
-        transitions = self.replay_buffer.sample(batch_size=self.batch_size)
-        batch = Transition(*zip(*transitions))
-
-        non_final_mask = torch.tensor(
-            tuple(map(lambda s: s is not None, batch.next_state)),
-            device=self.device,
-            dtype=torch.bool,
-        )
-        non_final_next_states = torch.cat(
-            [s for s in batch.next_state if s is not None]
-        ).to(self.device)
-        state_batch = torch.cat(batch.state).to(self.device)
-        action_batch = torch.cat(batch.action).to(self.device)
-        reward_batch = torch.cat(batch.reward).to(self.device)
+    def optimize_model(self):
+        self.episode += 1
+        with self.buffer_lock:
+            if len(self.replay_buffer) < self.batch_size:
+                return
+            # get a random sample from buffer (size=batch_size)
+            batch = self.replay_buffer.sample(batch_size=self.batch_size)
+            versions = None
+            if isinstance(self.replay_buffer, PrioritizedReplayBuffer):
+                # pushes during the gradient step may overwrite sampled rows
+                versions = self.replay_buffer.row_versions(batch.rows)
+        state_batch = batch.state.to(self.device)
+        action_batch = batch.action.to(self.device)
+        reward_batch = batch.reward.to(self.device)
+        non_final_mask = ~batch.done.to(self.device)
 
         # Q(s_t, a)
         # state_action_values
-        q = (
-            self.policy_net(state_batch)
-            .gather(1, action_batch.argmax(dim=1).unsqueeze(1))
-            .squeeze(1)
-        )
+        q = self.policy_net(state_batch).gather(1, action_batch.unsqueeze(1)).squeeze(1)
 
         next_state_values = torch.zeros(self.batch_size, device=self.device)
         next_state_values[non_final_mask] = (
-            self.target_net(non_final_next_states).max(1)[0].detach()
+            self.target_net(batch.next_state.to(self.device)[non_final_mask])
+            .max(1)[0]
+            .detach()
         )
 
         # Compute the expected Q values
-        expected_state_action_values = (
-            next_state_values * self.gamma + reward_batch.squeeze(1)
-        )
-        loss = F.smooth_l1_loss(expected_state_action_values, q)
+        expected_state_action_values = next_state_values * self.gamma + reward_batch
+        td_errors = expected_state_action_values - q
+        losses = F.smooth_l1_loss(expected_state_action_values, q, reduction="none")
+        loss = (batch.weight.to(self.device) * losses).mean()
+        if isinstance(self.replay_buffer, PrioritizedReplayBuffer):
+            with self.buffer_lock:
+                self.replay_buffer.update_priorities(batch.rows, td_errors, versions)
         self.writer.add_scalar("Loss/train", loss, self.episode)
         self.writer.add_scalar("epsilon", self.epsilon, self.episode)
         self.writer.add_scalar("buffer size", len(self.replay_buffer), self.episode)
@@ -140,7 +219,8 @@ class DQN:
         loss.backward()
         for param in self.policy_net.parameters():
             param.grad.data.clamp_(-1, 1)
-        self.optimizer.step()
+        with self.net_lock:
+            self.optimizer.step()
 
         # Update the target net
         if self.episode % self.target_update == 0:
@@ -0,0 +1,274 @@
+import multiprocessing as mp
+import traceback
+from typing import Callable, Optional
+
+import numpy as np
+import torch
+
+from skat.agents import Agent
+from skat.agents.random import RandomAgent
+from skat.card import CARDS, Card
+from skat.game import Round
+from skat.games import Game
+from skat.games.suit import SuitGame
+from skat.utils.rng import Seed, make_rng, make_seed_sequence, round_seed
+
+
+class ExternalAgent(Agent):
+    """
+    An agent whose cards are chosen from outside the Round, e.g. by an
+    environment. Set `action` before the Round asks the agent for a card.
+    """
+
+    def __init__(self) -> None:
+        self.state = None
+        self.action: Optional[Card] = None
+
+    def choose_card(self, valid_moves: set[Card]) -> Card:
+        if self.state is None:
+            raise Exception("Can't choose a card without having a state.")
+        if self.action not in valid_moves:
+            raise ValueError(f"{self.action} is not a valid move of {valid_moves}")
+        choice, self.action = self.action, None
+        self.state.hand.remove(choice)
+        return choice
+
+    def pickup_skat(self, state) -> bool:
+        return False
+
+    def bid(self, current_bid, offer=False) -> int:
+        return 0
+
+    def declare_game(self, state) -> Game:
+        raise Exception("an external agent can't declare games")
+
+    def press_skat(self) -> list[Card]:
+        raise Exception("an external agent can't press the skat")
+
+
+def random_suit_game(rng) -> Game:
+    """Default game declaration of the environments: a random suit game."""
+    return SuitGame(rng.randrange(4))
+
+
+class RoundEnv:
+    """
+    A single Skat environment over Round.step_player. The learning agent plays at
+    `seat` (a random seat per round if None), the other seats are played by agents
+    made by `opponent`. Actions are card ids, the reward is the change of the
+    learner's Round.cumulative_reward.
+    """
+
+    def __init__(
+        self,
+        seat: Optional[int] = 0,
+        soloist: Optional[int] = None,
+        opponent: Callable[[], Agent] = RandomAgent,
+        declare_game: Callable[..., Game] = random_suit_game,
+        seed: Seed = None,
+    ) -> None:
+        self.seat = seat
+        self.soloist = soloist
+        self.opponent = opponent
+        self.declare_game = declare_game
+        self.rng = make_rng(seed)
+        self.agent = ExternalAgent()
+        self.round: Optional[Round] = None
+        self.learner = 0
+        self.last_reward = 0.0
+
+    def reset(self) -> tuple[np.ndarray, np.ndarray]:
+        """Start a new round, play until it's the learner's turn, observe."""
+        self.learner = self.seat if self.seat is not None else self.rng.randrange(3)
+        agents: list[Agent] = list()
+        for seat in range(3):
+            if seat == self.learner:
+                agents.append(self.agent)
+            else:
+                opponent = self.opponent()
+                opponent.set_rng(self.rng.getrandbits(64))
+                agents.append(opponent)
+        soloist = self.learner if self.soloist is None else self.soloist
+        self.round = Round(
+            dealer=self.rng.randrange(3),
+            skip_bidding=True,
+            solo_player_id=soloist,
+            declare_game=self.declare_game(self.rng),
+            hand_game=True,
+            agents=agents,
+            start=False,
+            rng=self.rng.getrandbits(64),
+        )
+        self.round.prepare()
+        while self.round.next_player != self.learner and not self.round.is_finished:
+            self.round.step()
+        self.last_reward = self.round.cumulative_reward(self.learner)
+        return self.observe()
+
+    def observe(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the learner's observation and legal-action mask."""
+        if self.round is None or self.round.game is None:
+            raise Exception("reset the environment first")
+        player = self.round.player[self.learner]
+        legal = player.valid_mask(self.round.game.trick)
+        mask = (legal >> np.arange(len(CARDS))) & 1
+        return self.round.get_state(self.learner), mask.astype(bool)
+
+    def step(self, action: int) -> tuple[np.ndarray, np.ndarray, float, bool]:
+        """Play the card id `action` and all opponent cards until the next turn."""
+        if self.round is None:
+            raise Exception("reset the environment first")
+        self.agent.action = CARDS[action]
+        _, done = self.round.step_player(self.learner)
+        current_reward = self.round.cumulative_reward(self.learner)
+        reward, self.last_reward = current_reward - self.last_reward, current_reward
+        observation, mask = self.observe()
+        return observation, mask, reward, done
+
+
+def _worker(connection, env_kwargs: list[dict]) -> None:
+    """Host a chunk of RoundEnvs in a subprocess and serve SkatVectorEnv calls."""
+    envs = [RoundEnv(**kwargs) for kwargs in env_kwargs]
+    while True:
+        command, data = connection.recv()
+        try:
+            match command:
+                case "reset":
+                    results = [env.reset() for env in envs]
+                case "step":
+                    results = [_auto_step(env, a) for env, a in zip(envs, data)]
+                case "close":
+                    connection.close()
+                    return
+                case _:
+                    raise ValueError(f"unknown command {command}")
+        except Exception:
+            # the parent re-raises it, the worker keeps serving
+            connection.send(("error", traceback.format_exc()))
+            continue
+        connection.send(("ok", results))
+
+
+def _auto_step(env: RoundEnv, action: int):
+    """Step an env and reset it if the round is finished."""
+    observation, mask, reward, done = env.step(action)
+    if done:
+        final = observation
+        observation, mask = env.reset()
+        return observation, mask, reward, done, final
+    return observation, mask, reward, done, None
+
+
+class SkatVectorEnv:
+    """
+    Runs K Skat rounds as one batched, auto-resetting environment, either
+    in-process (workers=0) or spread over subprocess workers.
+
+    reset() returns (observations, masks) and step(actions) returns
+    (observations, masks, rewards, dones, info) as torch tensors of shape
+    (K, 171), (K, 32), (K,) and (K,). A finished round is reset right away, its
+    last observation is in info["final_observation"][k].
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        workers: int = 0,
+        seat: Optional[int] = 0,
+        soloist: Optional[int] = None,
+        opponent: Callable[[], Agent] = RandomAgent,
+        declare_game: Callable[..., Game] = random_suit_game,
+        seed: Seed = None,
+        device: str = "cpu",
+    ) -> None:
+        self.num_envs = num_envs
+        self.device = device
+        master = make_seed_sequence(seed)
+        env_kwargs = [
+            dict(
+                seat=seat,
+                soloist=soloist,
+                opponent=opponent,
+                declare_game=declare_game,
+                seed=round_seed(master, i),
+            )
+            for i in range(num_envs)
+        ]
+        self.envs: list[RoundEnv] = list()
+        self.connections: list = list()
+        self.processes: list = list()
+        if workers <= 0:
+            self.envs = [RoundEnv(**kwargs) for kwargs in env_kwargs]
+            return
+        chunks = np.array_split(np.arange(num_envs), min(workers, num_envs))
+        for chunk in chunks:
+            parent, child = mp.Pipe()
+            process = mp.Process(
+                target=_worker,
+                args=(child, [env_kwargs[i] for i in chunk]),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+        self.chunks = [len(chunk) for chunk in chunks]
+
+    def reset(self) -> tuple[torch.Tensor, torch.Tensor]:
+        if self.envs:
+            results = [env.reset() for env in self.envs]
+        else:
+            for connection in self.connections:
+                connection.send(("reset", None))
+            results = self._receive()
+        observations, masks = zip(*results)
+        return self._tensor(observations), self._tensor(masks)
+
+    def step(self, actions) -> tuple:
+        actions = [int(a) for a in actions]
+        if self.envs:
+            results = [_auto_step(env, a) for env, a in zip(self.envs, actions)]
+        else:
+            stop = 0
+            for connection, size in zip(self.connections, self.chunks):
+                start, stop = stop, stop + size
+                connection.send(("step", actions[start:stop]))
+            results = self._receive()
+        observations, masks, rewards, dones, finals = zip(*results)
+        info = {"final_observation": finals}
+        return (
+            self._tensor(observations),
+            self._tensor(masks),
+            torch.tensor(rewards, dtype=torch.float32, device=self.device),
+            torch.tensor(dones, dtype=torch.bool, device=self.device),
+            info,
+        )
+
+    def _receive(self) -> list:
+        """Collect the results of all workers, raise if a worker failed."""
+        replies = list()
+        for connection, process in zip(self.connections, self.processes):
+            try:
+                replies.append(connection.recv())
+            except EOFError:
+                raise Exception(f"env worker {process.pid} exited") from None
+        for status, payload in replies:
+            if status == "error":
+                raise Exception(f"env worker failed:\n{payload}")
+        return [result for _, payload in replies for result in payload]
+
+    def close(self) -> None:
+        for connection in self.connections:
+            connection.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.connections, self.processes = list(), list()
+
+    def __enter__(self) -> "SkatVectorEnv":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _tensor(self, arrays) -> torch.Tensor:
+        return torch.from_numpy(np.stack(arrays)).to(self.device)
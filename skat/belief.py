@@ -0,0 +1,147 @@
+from typing import NamedTuple, Optional
+
+from skat.bitboard import FULL_MASK, popcount, to_mask
+from skat.card import Card
+from skat.games.tables import FOLLOW_MASKS
+from skat.sampling import count_deals
+
+SKAT = 3  # slot index of the skat, seats are 0-2
+
+
+class Constraints(NamedTuple):
+    """What a seat knows about the deal of the cards still in play."""
+
+    known: list[int]  # card masks of the seats and the skat known to the seat
+    hidden: int  # card mask of the cards the seat can't locate
+    sizes: list[int]  # number of hidden cards per slot
+    allowed: list[int]  # card masks each slot may hold
+
+
+class BeliefState:
+    """
+    Keeps track of what is public about the cards of a Round: the played cards,
+    the cards each seat played and the follow groups (a suit or the trumps) a seat
+    is known to be void in, because it didn't follow such a lead.
+
+    Round.step and Round.apply report every card, which updates a few masks.
+    Round.undo, restore and reset force a rebuild from the trick history on the
+    next query. Other changes of the round (dealing) are detected by a cheap key
+    of the played cards and the hands.
+
+    Queries take the point of view of a seat, which also knows its own hand and,
+    as soloist of a game with skat pickup, the skat. Without a seat only the public
+    knowledge is used.
+    """
+
+    def __init__(self, state) -> None:
+        self.state = state
+        self.key: Optional[tuple] = None
+        self.played = 0  # mask of all played cards
+        self.played_by = [0, 0, 0]  # masks of the cards each seat played
+        self.voids = [0, 0, 0]  # masks of the follow groups a seat can't hold
+
+    def _key(self) -> tuple:
+        state = self.state
+        game = state.game
+        if game is None:
+            return (None, 0, 0, 0, 0)
+        hands = state.player
+        return (
+            game,
+            state.trick_history.mask | game.trick.mask,
+            hands[0].hand.mask,
+            hands[1].hand.mask,
+            hands[2].hand.mask,
+        )
+
+    def invalidate(self) -> None:
+        """Force a rebuild on the next query."""
+        self.key = None
+
+    def sync(self) -> None:
+        """Rebuild the masks from the round."""
+        self.played = 0
+        self.played_by = [0, 0, 0]
+        self.voids = [0, 0, 0]
+        state = self.state
+        if state.game is not None:
+            for record in state.trick_history:
+                for i, card_id in enumerate(record.cards):
+                    self._update((record.leader + i) % 3, card_id, record.cards[0])
+            trick = state.game.trick.buffer
+            for player_id, card in trick:
+                self._update(player_id, card.id, trick[0].card.id)
+        self.key = self._key()
+
+    def _update(self, player_id: int, card_id: int, lead_id: int) -> None:
+        bit = 1 << card_id
+        self.played |= bit
+        self.played_by[player_id] |= bit
+        follow = FOLLOW_MASKS[self.state.game.type_id][lead_id]
+        if not follow & bit:
+            self.voids[player_id] |= follow
+
+    def play_card(self, player_id: int, card: Card) -> None:
+        """Update the masks after player_id added card to the current trick."""
+        if self.key is None:
+            return
+        bit = 1 << card.id
+        expected = list(self.key)
+        expected[1] |= bit
+        expected[2 + player_id] &= ~bit
+        self.key = self._key()
+        if self.key != tuple(expected):
+            self.key = None
+            return
+        self._update(player_id, card.id, self.state.game.trick.buffer[0].card.id)
+
+    def _ensure(self) -> None:
+        if self.key is None or self.key != self._key():
+            self.sync()
+
+    def known(self, seat: Optional[int] = None) -> list[int]:
+        """Return the card masks of the seats and the skat known to seat."""
+        known = [0, 0, 0, 0]
+        if seat is not None:
+            state = self.state
+            known[seat] = state.player[seat].hand.mask
+            if seat == state.solo_player_id and not state.hand_game:
+                known[SKAT] = to_mask(state.skat)
+        return known
+
+    def out(self, seat: Optional[int] = None) -> int:
+        """Return the mask of the cards still in play that seat can't locate."""
+        self._ensure()
+        known = self.known(seat)
+        return FULL_MASK & ~self.played & ~(known[0] | known[1] | known[2] | known[3])
+
+    def possible(self, slot: int, seat: Optional[int] = None) -> int:
+        """Return the mask of the cards slot (a seat or SKAT) may hold for seat."""
+        known = self.known(seat)
+        if known[slot] or slot == seat:
+            return known[slot]
+        out = self.out(seat)
+        if slot == SKAT:
+            return out
+        return out & ~self.voids[slot]
+
+    def holders(self, card: Card, seat: Optional[int] = None) -> list[int]:
+        """Return the slots (seats or SKAT) that may hold card for seat."""
+        bit = 1 << card.id
+        return [slot for slot in range(4) if self.possible(slot, seat) & bit]
+
+    def constraints(self, seat: Optional[int] = None) -> Constraints:
+        """Return the known cards, the hidden cards and the slot constraints."""
+        self._ensure()
+        state = self.state
+        known = self.known(seat)
+        hidden = self.out(seat)
+        sizes = [len(player.hand) for player in state.player] + [2]
+        sizes = [n - popcount(mask) for n, mask in zip(sizes, known)]
+        allowed = [FULL_MASK & ~void for void in self.voids] + [FULL_MASK]
+        return Constraints(known, hidden, sizes, allowed)
+
+    def count_deals(self, seat: Optional[int] = None) -> int:
+        """Return the number of deals of the hidden cards consistent for seat."""
+        _, hidden, sizes, allowed = self.constraints(seat)
+        return count_deals(hidden, sizes, allowed)
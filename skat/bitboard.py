@@ -0,0 +1,71 @@
+"""
+32-bit card masks. Bit i of a mask is set if CARDS[i] is part of the set, so
+hands, tricks and played cards fit into a single int and set operations become
+bitwise operations.
+"""
+
+from typing import Iterable, Iterator
+
+from skat.card import CARDS, RANKS, SUITS, Card
+
+EMPTY_MASK = 0
+FULL_MASK = (1 << len(CARDS)) - 1
+SUIT_MASKS = tuple(((1 << len(RANKS)) - 1) << (i * len(RANKS)) for i in range(4))
+JACK_MASK = sum(1 << Card(i, 3).id for i in range(len(SUITS)))
+
+
+def card_mask(card: Card) -> int:
+    """Return the single-bit mask of a card."""
+    return 1 << card.id
+
+
+def to_mask(cards: Iterable[Card]) -> int:
+    """Return the mask of an iterable of cards."""
+    mask = 0
+    for card in cards:
+        mask |= 1 << card.id
+    return mask
+
+
+def iter_cards(mask: int) -> Iterator[Card]:
+    """Yield the cards of a mask in ascending id order."""
+    mask = int(mask)  # numpy masks, e.g. from Deck.batch_masks
+    while mask:
+        low = mask & -mask
+        yield CARDS[low.bit_length() - 1]
+        mask ^= low
+
+
+# ids of the set bits of every byte value, per byte of a mask (one suit each)
+_BYTE_IDS = tuple(
+    tuple(tuple(8 * k + i for i in range(8) if b >> i & 1) for b in range(256))
+    for k in range(4)
+)
+
+
+def card_ids(mask: int) -> tuple[int, ...]:
+    """Return the card ids of a mask in ascending order."""
+    return (
+        _BYTE_IDS[0][mask & 255]
+        + _BYTE_IDS[1][mask >> 8 & 255]
+        + _BYTE_IDS[2][mask >> 16 & 255]
+        + _BYTE_IDS[3][mask >> 24]
+    )
+
+
+def from_mask(mask: int) -> list[Card]:
+    """Return the cards of a mask as list in ascending id order."""
+    return list(iter_cards(mask))
+
+
+def popcount(mask: int) -> int:
+    """Return the number of cards in a mask."""
+    return mask.bit_count()
+
+
+def legal_moves(hand: int, forced: int) -> int:
+    """
+    Return the mask of legal moves. A player has to follow the forced cards if
+    possible, otherwise every card in the hand is allowed.
+    """
+    return hand & forced or hand
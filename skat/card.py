@@ -1,5 +1,6 @@
 SUITS = ("♦", "♥", "♠", "♣")
 RANKS = ("7", "8", "9", "J", "Q", "K", "X", "A")
+POINTS = (0, 0, 0, 2, 3, 4, 10, 11)
 
 
 class Card:
@@ -8,12 +9,53 @@ class Card:
     Suits = {♦, ♥, ♠, ♣} sorted by suit ascending
     Ranks = {7, 8, 9, J, Q, K, X, A} sorted by values ascending
     Values = {0, 0, 0, 2, 3, 4, 10, 11}
+
+    Cards are immutable flyweights: there are exactly 32 instances, held by
+    CARDS and indexed by their id. Card(suit, rank) returns the interned instance,
+    so equality, hashing and ordering are plain integer operations.
     """
 
-    def __init__(self, suit, rank) -> None:
-        self.suit = SUITS[suit]
-        self.rank = RANKS[rank]
-        self.value = [0, 0, 0, 2, 3, 4, 10, 11][rank]
+    __slots__ = ("id", "suit_index", "rank_index", "suit", "rank", "value")
+
+    id: int
+    suit_index: int
+    rank_index: int
+    suit: str
+    rank: str
+    value: int
+
+    def __new__(cls, suit: int, rank: int) -> "Card":
+        if not (0 <= suit < len(SUITS) and 0 <= rank < len(RANKS)):
+            raise ValueError(f"no card with suit {suit} and rank {rank}")
+        return CARDS[suit * len(RANKS) + rank]
+
+    @classmethod
+    def _create(cls, suit: int, rank: int) -> "Card":
+        """Build one of the 32 flyweights. Only used to fill CARDS."""
+        card = object.__new__(cls)
+        object.__setattr__(card, "id", suit * len(RANKS) + rank)
+        object.__setattr__(card, "suit_index", suit)
+        object.__setattr__(card, "rank_index", rank)
+        object.__setattr__(card, "suit", SUITS[suit])
+        object.__setattr__(card, "rank", RANKS[rank])
+        object.__setattr__(card, "value", POINTS[rank])
+        return card
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError("Card is immutable")
+
+    def __delattr__(self, name) -> None:
+        raise AttributeError("Card is immutable")
+
+    def __reduce__(self):
+        """Pickle by coordinates, unpickling returns the interned instance."""
+        return Card, (self.suit_index, self.rank_index)
+
+    def __copy__(self) -> "Card":
+        return self
+
+    def __deepcopy__(self, memo) -> "Card":
+        return self
 
     def __lt__(self, other) -> bool:
         """
@@ -23,28 +65,27 @@ class Card:
 
         For example: ♦Q is lower than ♦A, but ♦A is lower than ♥9.
         """
-        rank_comparison = RANKS.index(self.rank) < RANKS.index(other.rank)
-        suit_comparison = SUITS.index(self.suit) < SUITS.index(other.suit)
-        if self.suit == other.suit:
-            return rank_comparison
-        else:
-            return suit_comparison
+        return self.id < other.id
 
     def __gt__(self, other) -> bool:
         """
         The greater than function is just comparing ranks against each other,
         without respecting suit order.
         """
-        return RANKS.index(self.rank) > RANKS.index(other.rank)
+        return self.rank_index > other.rank_index
 
     def __eq__(self, other) -> bool:
         """
-        Two cards are equal if they have same suit and rank.
+        Two cards are equal if they have same suit and rank. As cards are
+        interned, this is an identity check.
         """
-        return self.suit == other.suit and self.rank == other.rank
+        return self is other
+
+    def __ne__(self, other) -> bool:
+        return self is not other
 
     def __hash__(self) -> int:
-        return hash((self.suit, self.rank))
+        return self.id
 
     def __str__(self) -> str:
         return (
@@ -62,9 +103,14 @@ class Card:
 
     @property
     def is_jack(self) -> bool:
-        return self.rank == "J"
+        return self.rank_index == 3
 
     @property
     def np_index(self) -> int:
         """Return the 32-hot-encoded numpy index of the card."""
-        return SUITS.index(self.suit) * len(RANKS) + RANKS.index(self.rank)
+        return self.id
+
+
+CARDS: tuple[Card, ...] = tuple(
+    Card._create(i, j) for i in range(len(SUITS)) for j in range(len(RANKS))
+)
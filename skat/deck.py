@@ -1,6 +1,14 @@
-import random
+from typing import Optional
 
-from skat.card import RANKS, SUITS, Card
+import numpy as np
+
+from skat.card import CARDS, Card
+from skat.utils.rng import Seed, make_generator, make_rng
+
+# slot offsets of p0, p1, p2 and the skat in a dealt deck
+DEAL_SLOTS = (0, 10, 20, 30)
+SLOT_SIZES = (10, 10, 10, 2)
+BATCH_CHUNK = 1 << 15  # rows permuted at once by Deck.batch
 
 
 class Deck:
@@ -9,9 +17,10 @@ class Deck:
     card-distribution (dealing).
     """
 
-    def __init__(self) -> None:
-        """Initialize an empty deck and seed the random function"""
+    def __init__(self, rng: Seed = None) -> None:
+        """Initialize an empty deck with its own random stream."""
         self.deck: list[Card] = list()
+        self.rng = make_rng(rng)
 
     def __len__(self) -> int:
         """
@@ -43,18 +52,15 @@ class Deck:
         Initialize and fill the 32 different cards from Card() into the deck.
         The list is initialized in a sorted fashion.
         """
-        self.deck = list()
-        for i, _ in enumerate(SUITS):
-            for j, _ in enumerate(RANKS):
-                self.deck.append(Card(i, j))
+        self.deck = list(CARDS)
 
-    def shuffle(self, seed=None) -> None:
+    def shuffle(self, seed: Seed = None) -> None:
         """
-        Shuffle the deck randomly.
+        Shuffle the deck randomly. Use the deck's random stream, or a stream made
+        from seed if given.
         """
-        random.seed(a=seed)
-        random.shuffle(self.deck)
-        random.seed(None)
+        rng = self.rng if seed is None else make_rng(seed)
+        rng.shuffle(self.deck)
 
     def deal_cards(self, quantity=10) -> list[Card]:
         """
@@ -76,9 +82,9 @@ class Deck:
     def factory(p0_hand=None, p1_hand=None, p2_hand=None, skat=None, seed=None):
         """
         Create a deck by providing fixed pieces of the deck. Fill not provided slots
-        with random probability.
+        with random probability, drawn from seed (a seed or a random stream).
         """
-        remaining_cards = [Card(i, j) for i in range(4) for j in range(8)]
+        remaining_cards = list(CARDS)
         deck_cards = [None for _ in range(32)]
 
         if p0_hand:
@@ -98,18 +104,80 @@ class Deck:
                 deck_cards[i + 30] = card
                 remaining_cards.remove(card)
 
-        random.seed(seed)
+        rng = make_rng(seed)
         for i in range(len(deck_cards)):
             if deck_cards[i] is None:
-                card = random.choice(remaining_cards)
+                card = rng.choice(remaining_cards)
                 deck_cards[i] = card
                 remaining_cards.remove(card)
-        random.seed(None)
 
         d = Deck()
         d.deck = deck_cards
         return d
 
+    @staticmethod
+    def batch(
+        n: int,
+        p0_hand=None,
+        p1_hand=None,
+        p2_hand=None,
+        skat=None,
+        seed: Seed = None,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Deal n decks at once and return them as (n, 32) uint8 array of card ids,
+        in the slot layout of Deck.factory (p0: 0-9, p1: 10-19, p2: 20-29,
+        skat: 30-31). Provided pieces are fixed in every deck, all other slots get
+        an independent uniform permutation of the remaining cards per deck.
+        """
+        template = np.full(len(CARDS), -1, dtype=np.int16)
+        pieces = (p0_hand, p1_hand, p2_hand, skat)
+        for offset, size, cards in zip(DEAL_SLOTS, SLOT_SIZES, pieces):
+            if cards is None:
+                continue
+            if len(cards) > size:
+                raise ValueError(f"{len(cards)} cards provided for {size} slots")
+            for i, card in enumerate(cards):
+                template[offset + i] = card.id
+        fixed = template[template >= 0]
+        if len(np.unique(fixed)) != len(fixed):
+            raise ValueError("provided cards are not disjoint")
+        free_slots = np.flatnonzero(template < 0)
+        free_cards = np.setdiff1d(np.arange(len(CARDS)), fixed).astype(np.uint8)
+
+        if out is None:
+            out = np.empty((n, len(CARDS)), dtype=np.uint8)
+        out[:] = np.where(template < 0, 0, template).astype(np.uint8)
+        rng = make_generator(seed)
+        for start in range(0, n, BATCH_CHUNK):
+            stop = min(n, start + BATCH_CHUNK)
+            keys = rng.random((stop - start, len(free_cards)))
+            permuted = free_cards[np.argsort(keys, axis=1)]
+            out[start:stop, free_slots] = permuted
+        return out
+
+    @staticmethod
+    def from_ids(ids) -> "Deck":
+        """Create a Deck from a sequence of card ids, e.g. a row of Deck.batch."""
+        d = Deck()
+        d.deck = [CARDS[i] for i in np.asarray(ids).tolist()]
+        return d
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Return the card ids of the deck as uint8 array."""
+        return np.fromiter((card.id for card in self.deck), dtype=np.uint8)
+
+    @staticmethod
+    def batch_masks(decks: np.ndarray) -> np.ndarray:
+        """
+        Return the (n, 4) uint32 card masks of p0, p1, p2 and the skat for a batch
+        of decks, see Hand.from_mask.
+        """
+        bits = np.left_shift(np.uint32(1), decks.astype(np.uint32))
+        return np.bitwise_or.reduceat(bits, DEAL_SLOTS, axis=1)
+
     def to_list(self) -> list[list[Card]]:
         if len(self) == 32:
             return [
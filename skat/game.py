@@ -1,7 +1,9 @@
 import copy
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from enum import Enum, auto
 from random import Random
-from typing import Optional, Union
+from typing import Callable, NamedTuple, Optional, Sequence, Union
 
 import numpy as np
 import torch
@@ -9,14 +11,27 @@ import tqdm
 
 import iss
 from skat.agents.random import RandomAgent
-from skat.card import Card
+from skat.belief import BeliefState
+from skat.bitboard import from_mask, to_mask
+from skat.card import CARDS, Card
 from skat.deck import Deck
 from skat.games import Game
-from skat.hand import Hand, HandOrder
+from skat.games.tables import new_game
+from skat.hand import HandOrder
+from skat.observation import ObservationBuilder
 from skat.player import Player
-from skat.trick import TrickHistory
+from skat.trick import TURNS, TrickHistory, TrickRecord
 from skat.utils.game_converter import get_game
 from skat.utils.misc import disjoint
+from skat.utils.rng import Seed, make_rng, make_seed_sequence, round_seed
+
+DEAL_ORDER = HandOrder("♦♥♠♣", "789QKXA", "♦♥♠♣", "J")
+REWARD_GOALS = {
+    "points": 2.0 / 120.0,
+    "win": 5.0,
+    "schneider": 2.0,
+    "schwarz": 2.0,
+}
 
 
 class GamePhase(Enum):
@@ -28,7 +43,59 @@ class GamePhase(Enum):
     COUNTING = auto()
 
 
+class GameResult(NamedTuple):
+    """The outcome of a single tournament game."""
+
+    index: int
+    dealer: int
+    soloist: int
+    game_type: Optional[int]  # Game.type_id
+    soloist_won: bool
+    points_soloist: int
+    points_defenders: int
+
+
+class RoundSnapshot(NamedTuple):
+    """
+    The state of a Round without players and agents. Hands and skat are card
+    masks, the current trick holds card ids in playing order, completed tricks are
+    the immutable TrickRecords of the history, so snapshots share them.
+    """
+
+    phase: GamePhase
+    dealer: int
+    soloist: int
+    game_type: Optional[int]  # Game.type_id
+    hands: tuple[int, int, int]
+    skat: int
+    trick: tuple[int, ...]
+    history: tuple[TrickRecord, ...]
+    points: tuple[int, int, int]
+    front_hand: Optional[int]  # winner of the last trick
+
+
+class _Undo:
+    """A move made by Round.apply. Entries are allocated once and reused."""
+
+    __slots__ = ("player_id", "card", "index", "completed", "front_hand")
+
+    def __init__(self) -> None:
+        self.player_id = 0
+        self.card: Card = CARDS[0]
+        self.index = 0  # position of the card in the hand
+        self.completed = False  # whether the move completed a trick
+        self.front_hand: Optional[int] = None  # Round._front_hand before the move
+
+
 class Tournament:
+    """
+    Plays a series of rounds of the agents. Every round draws its deal and one
+    random stream per agent from the master seed (rng, or else seed) and hands
+    the streams to the agents with set_rng, replacing any stream an agent was
+    built with. Pass seed_agents=False to keep the agents' own streams, the rounds are
+    then only reproducible if the agents are.
+    """
+
     def __init__(
         self,
         rounds=32,
@@ -39,54 +106,193 @@ class Tournament:
         declare_game=None,
         initial_cards=None,
         iss_file=None,
+        rng: Seed = None,
+        pooled: bool = False,
+        seed_agents: bool = True,
     ) -> None:
         self.rounds = rounds
         self.agents = agents
         self.scores = [0, 0]
+        # [won, lost] games of the soloist per seat and per game type
+        self.seat_scores = [[0, 0] for _ in range(3)]
+        self.game_type_scores: dict[Optional[int], list[int]] = dict()
+        self.results: list[GameResult] = list()
         self.dealer = 0
         self.verbose = verbose
         self.seed = seed
+        # every round derives its deal and agent streams from the master seed
+        self.seed_sequence = make_seed_sequence(rng if rng is not None else seed)
+        self.seed_agents = seed_agents
         self.hold_position = hold_position
         self.declare_game = declare_game
         self.initial_cards = initial_cards
+        # with pooled=True all rounds are played on one table, see Round.reset
+        self.pooled = pooled
+        self.table: Optional[Round] = None
         self.iss_games = None
         if iss_file:
             self.iss_games = iss.ISSGames(file_name=iss_file)
 
     def start(self):
-        iss_sample = None
+        iss_sample = self.sample_iss_games()
+        print(f"starting tournament with {self.rounds}...")
+        try:
+            for i in tqdm.tqdm(range(self.rounds)):
+                iss_game = iss_sample[i] if iss_sample else None
+                self.record(self.play_round(i, iss_game))
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Close the agents, e.g. the process pools of PIMCAgents."""
+        for agent in self.agents:
+            agent.close()
+
+    def sample_iss_games(self) -> Optional[list]:
         if self.iss_games:
-            iss_sample = self.iss_games.sample(n=self.rounds, seed=self.seed)
+            return self.iss_games.sample(n=self.rounds, seed=self.seed)
+        return None
 
-        print(f"starting tournament with {self.rounds}...")
-        for i in tqdm.tqdm(range(self.rounds)):
-            __soloist = self.dealer
-            __dealer = self.dealer
-            __declare = self.declare_game
-            if self.iss_games:
-                self.initial_cards = iss_sample[i].deck.to_list()
-                __soloist = iss_sample[i].soloist
-                __dealer = 0
-                __declare = get_game(iss_sample[i].type)
+    def play_round(self, index: int, iss_game=None) -> GameResult:
+        """
+        Play the round with the given index. Dealer, deal and agent random streams
+        only depend on the index, so rounds can be played in any order.
+        """
+        dealer = self.dealer if self.hold_position else (self.dealer + index) % 3
+        __soloist = dealer
+        __declare = self.declare_game
+        __initial_cards = self.initial_cards
+        if iss_game is not None:
+            __initial_cards = iss_game.deck.to_list()
+            __soloist = iss_game.soloist
+            __declare = get_game(iss_game.type)
+        deal_seed, *agent_seeds = round_seed(self.seed_sequence, index).spawn(4)
+        if self.seed_agents:
+            for agent, agent_seed in zip(self.agents, agent_seeds):
+                agent.set_rng(agent_seed)
+        if self.pooled and self.table is not None:
+            r = self.table
+            r.reset(
+                deal=__initial_cards,
+                soloist=__soloist,
+                game=__declare,
+                dealer=dealer,
+                rng=deal_seed,
+            )
+        else:
             r = Round(
-                dealer=self.dealer,
+                dealer=dealer,
                 skip_bidding=True,
                 solo_player_id=__soloist,
                 start=False,
                 verbose=self.verbose,
                 agents=self.agents,
-                seed=self.seed,
+                rng=deal_seed,
                 hand_game=True,
                 declare_game=__declare,
-                initial_cards=self.initial_cards,
+                initial_cards=__initial_cards,
             )
-            win = r.start()
-            if win:
-                self.scores[0] += 1
-            elif not win:
-                self.scores[1] += 1
-            if not self.hold_position:
-                self.dealer = (self.dealer + 1) % 3
+            if self.pooled:
+                self.table = r
+        win = r.start()
+        return GameResult(
+            index=index,
+            dealer=dealer,
+            soloist=r.solo_player_id,
+            game_type=r.game.type_id if r.game is not None else None,
+            soloist_won=win,
+            points_soloist=r.points_soloist,
+            points_defenders=r.points_defenders,
+        )
+
+    def record(self, result: GameResult) -> None:
+        """Add a game result to the scores and statistics."""
+        outcome = 0 if result.soloist_won else 1
+        self.scores[outcome] += 1
+        self.seat_scores[result.soloist][outcome] += 1
+        self.game_type_scores.setdefault(result.game_type, [0, 0])[outcome] += 1
+        self.results.append(result)
+
+
+_worker_tournament: Optional[Tournament] = None
+
+
+def _init_worker(config: dict, agent_factory: Callable[[], Sequence]) -> None:
+    """Build the tournament of a worker process once, with its own agents."""
+    global _worker_tournament
+    _worker_tournament = Tournament(agents=agent_factory(), **config)
+
+
+def _play_shard(shard: list[tuple[int, object]]) -> list[GameResult]:
+    """Play a shard of (round index, ISS game) pairs in a worker process."""
+    try:
+        return [_worker_tournament.play_round(i, iss_game) for i, iss_game in shard]
+    finally:
+        # the worker may exit after any shard, without a chance to clean up
+        _worker_tournament.close()
+
+
+def _random_agents() -> tuple[RandomAgent, RandomAgent, RandomAgent]:
+    return RandomAgent(), RandomAgent(), RandomAgent()
+
+
+class ParallelTournament(Tournament):
+    """
+    A Tournament whose rounds are sharded over a process pool. Every round is
+    seeded by its index, so the merged results are the same as a serial run with
+    the same seed. agent_factory has to be picklable and return three fresh agents,
+    each worker process builds its own set.
+    """
+
+    def __init__(
+        self,
+        workers: int = 0,
+        agent_factory: Callable[[], Sequence] = _random_agents,
+        chunk_size: int = 16,
+        **kwargs,
+    ) -> None:
+        kwargs.setdefault("agents", agent_factory())
+        super().__init__(**kwargs)
+        self.workers = workers or os.cpu_count() or 1
+        self.agent_factory = agent_factory
+        self.chunk_size = chunk_size
+
+    def start(self):
+        iss_sample = self.sample_iss_games()
+        indices = list(range(self.rounds))
+        games = [iss_sample[i] if iss_sample else None for i in indices]
+        pairs = list(zip(indices, games))
+        starts = range(0, len(pairs), self.chunk_size)
+        stops = [start + self.chunk_size for start in starts]
+        shards = [pairs[start:stop] for start, stop in zip(starts, stops)]
+        config = dict(
+            verbose=self.verbose,
+            seed=self.seed,
+            hold_position=self.hold_position,
+            declare_game=self.declare_game,
+            initial_cards=self.initial_cards,
+            rng=self.seed_sequence,
+            pooled=self.pooled,
+            seed_agents=self.seed_agents,
+        )
+        print(f"starting tournament with {self.rounds} on {self.workers} workers...")
+        results: list[GameResult] = list()
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(config, self.agent_factory),
+            ) as executor:
+                futures = [executor.submit(_play_shard, shard) for shard in shards]
+                with tqdm.tqdm(total=self.rounds) as progress:
+                    for future in as_completed(futures):
+                        shard_results = future.result()
+                        results.extend(shard_results)
+                        progress.update(len(shard_results))
+        finally:
+            self.close()
+        for result in sorted(results, key=lambda r: r.index):
+            self.record(result)
 
 
 class Round:
@@ -98,12 +304,14 @@ class Round:
         declare_game: Game = None,
         hand_game: Optional[bool] = None,
         agents: Optional[list] = None,
-        deck: Deck = Deck(),
+        deck: Optional[Deck] = None,
         start: bool = True,
         verbose: bool = False,
         seed=None,
         phase: GamePhase = GamePhase.WAITING,
         initial_cards: Optional[Union[list, tuple]] = None,
+        rng: Seed = None,
+        reward_goals: Optional[dict[str, float]] = None,
     ) -> None:
         if agents is None:
             agents = list()
@@ -112,16 +320,28 @@ class Round:
         self.dealer: int = dealer
         self.highest_bid: int = 0
         self.solo_player_id: int = solo_player_id
-        self.deck: Deck = deck
+        self.deck: Deck = deck if deck is not None else Deck()
         self.deal_deck: bool = True
-        self.initial_cards = initial_cards
+        self.initial_cards = None
         self.verbose = verbose
         self.hand_game = hand_game
+        # per-round bidding state as given, restored by reset()
+        self._solo_player_id = solo_player_id
+        self._hand_game = hand_game
         self.skat: list[Card] = list()
         self.game: Optional[Game] = declare_game
         self.skip_bidding: bool = skip_bidding
         self.trick_history = TrickHistory()
+        self._front_hand: Optional[int] = None  # winner of the last trick
+        self._undo_stack: list[_Undo] = list()  # moves made by apply()
+        self._undo_depth = 0  # entries of _undo_stack in use
+        self.observation = ObservationBuilder(self)
+        self.belief = BeliefState(self)
         self.seed = seed
+        self.rng = make_rng(rng if rng is not None else seed)
+        self._clone_rng: Optional[Random] = None  # seeds the streams of clones
+        # weights of cumulative_reward, see REWARD_GOALS
+        self.reward_goals = REWARD_GOALS if reward_goals is None else reward_goals
         if len(agents) > 0 and len(agents) != 3:
             raise Exception("specify either 3 players or None")
         elif len(agents) == 0:
@@ -129,28 +349,211 @@ class Round:
             self.init_players()
         elif len(agents) == 3:
             self.init_players(agents)
-        if self.initial_cards:
-            if len(self.initial_cards) == 4:
+        self.set_initial_cards(initial_cards)
+        if start:
+            # start the game with selected features immediately
+            self.start()
+
+    def set_initial_cards(self, initial_cards) -> None:
+        """Deal initial_cards=(p0, p1, p2, skat) instead of shuffled cards if given."""
+        self.initial_cards = initial_cards
+        self.deal_deck = True
+        if initial_cards:
+            if len(initial_cards) == 4:
                 # 4 seems good, but are 0,1,2,3 disjoint?
-                if not disjoint(self.initial_cards):
+                if not disjoint(initial_cards):
                     raise Exception("initial cards are not disjoint!")
             else:
                 raise Exception("provide 4 items, initial_cards=(p0, p1, p2, skat)")
             self.deal_deck = False
-        if start:
-            # start the game with selected features immediately
-            self.start()
+
+    def reset(
+        self,
+        deal: Optional[Union[list, tuple]] = None,
+        soloist: Optional[int] = None,
+        game: Optional[Game] = None,
+        dealer: Optional[int] = None,
+        rng: Seed = None,
+    ) -> None:
+        """
+        Prepare the table for a new round and reuse players, hands, deck and trick
+        history. deal=(p0, p1, p2, skat) fixes the cards, otherwise they are
+        shuffled. Without a game the soloist declares one in prepare(). Without a
+        soloist and for hand_game, the values given to the constructor are used
+        again, so bidding and the skat pickup are decided anew. A new random
+        stream is used for dealing if rng is given.
+        """
+        self.phase = GamePhase.WAITING
+        if dealer is not None:
+            self.dealer = dealer
+        self.highest_bid = 0
+        self.solo_player_id = soloist if soloist is not None else self._solo_player_id
+        self.hand_game = self._hand_game
+        self.set_initial_cards(deal)
+        self.skat = list()
+        self.game = game
+        if game is not None:
+            game.new_trick()
+        self.trick_history.clear()
+        self._front_hand = None
+        self._undo_depth = 0
+        self.belief.invalidate()
+        if rng is not None:
+            self.rng = make_rng(rng)
+            self._clone_rng = None
+        for player in self.player:
+            player.reset()
+
+    def snapshot(self) -> RoundSnapshot:
+        """Return the state of the round, see restore()."""
+        player = self.player
+        game = self.game
+        return RoundSnapshot(
+            phase=self.phase,
+            dealer=self.dealer,
+            soloist=self.solo_player_id,
+            game_type=game.type_id if game is not None else None,
+            hands=(player[0].hand.mask, player[1].hand.mask, player[2].hand.mask),
+            skat=to_mask(self.skat),
+            trick=tuple(turn.card.id for turn in game.trick.buffer) if game else (),
+            history=tuple(self.trick_history.buffer),
+            points=(
+                player[0].trick_points,
+                player[1].trick_points,
+                player[2].trick_points,
+            ),
+            front_hand=self._front_hand,
+        )
+
+    def restore(self, snapshot: RoundSnapshot) -> None:
+        """
+        Reset the round to a snapshot. Players and agents are kept, the game is
+        only replaced if the game type differs.
+        """
+        self.phase = snapshot.phase
+        self.dealer = snapshot.dealer
+        self.solo_player_id = snapshot.soloist
+        self._front_hand = snapshot.front_hand
+        self._undo_depth = 0
+        self.belief.invalidate()
+        if snapshot.game_type is None:
+            self.game = None
+        else:
+            if self.game is None or self.game.type_id != snapshot.game_type:
+                self.game = new_game(snapshot.game_type)
+            self.game.new_trick()
+            for i, card_id in enumerate(snapshot.trick):
+                self.game.trick.append((self.front_hand + i) % 3, CARDS[card_id])
+        self.skat = from_mask(snapshot.skat)
+        history = self.trick_history
+        history.clear()
+        for player, mask, points in zip(self.player, snapshot.hands, snapshot.points):
+            player.reset()
+            player.hand.extend(c for c in DEAL_ORDER.sequence if mask >> c.id & 1)
+            player.trick_points = points
+        if self.phase in (GamePhase.PLAYING, GamePhase.COUNTING):
+            self.player[self.solo_player_id].trick_stack.extend(self.skat)
+        for record in snapshot.history:
+            history.append(record)
+            stack = self.player[record.winner].trick_stack
+            stack.extend(CARDS[card_id] for card_id in record.cards)
+
+    def apply(self, card: Card) -> None:
+        """
+        Play card for the next player, for searching the card play. Unlike step()
+        no agent is asked or notified. Every move can be taken back with undo().
+        Moves change the hands, the trick and the history in place and reuse
+        their undo entries, only a completed trick allocates its TrickRecord.
+        """
+        if self.phase != GamePhase.PLAYING or self.game is None:
+            raise Exception("moves can only be applied while playing")
+        player_id = self.next_player
+        player = self.player[player_id]
+        trick = self.game.trick
+        if not player.valid_mask(trick) >> card.id & 1:
+            raise ValueError(f"{card} is not a valid move of player {player_id}")
+        stack = self._undo_stack
+        if self._undo_depth == len(stack):
+            stack.append(_Undo())
+        entry = stack[self._undo_depth]
+        self._undo_depth += 1
+        entry.player_id = player_id
+        entry.card = card
+        entry.index = player.hand.pop_card(card)
+        entry.front_hand = self._front_hand
+        trick.buffer.append(TURNS[player_id][card.id])
+        self.belief.play_card(player_id, card)
+        entry.completed = trick.is_full
+        if entry.completed:
+            record = self.trick_history.append(trick)
+            winner = self.player[record.winner]
+            winner.trick_points += record.value
+            trick_stack = winner.trick_stack
+            for turn in trick.buffer:
+                trick_stack.append(turn.card)
+            self._front_hand = record.winner
+            trick.buffer.clear()
+
+    def undo(self) -> None:
+        """Take back the last move made by apply()."""
+        if not self._undo_depth:
+            raise Exception("no move to undo")
+        self._undo_depth -= 1
+        entry = self._undo_stack[self._undo_depth]
+        self.belief.invalidate()
+        buffer = self.game.trick.buffer  # type: ignore
+        if entry.completed:
+            record = self.trick_history.pop()
+            winner = self.player[record.winner]
+            winner.trick_points -= record.value
+            del winner.trick_stack[-3:]
+            self._front_hand = entry.front_hand
+            leader, cards = record.leader, record.cards
+            buffer.append(TURNS[leader][cards[0]])
+            buffer.append(TURNS[(leader + 1) % 3][cards[1]])
+        else:
+            buffer.pop()
+        self.player[entry.player_id].hand.insert(entry.index, entry.card)
+
+    def clone(self, agents: Optional[list] = None) -> "Round":
+        """
+        Return a new Round in the same state without running the constructor.
+        Hands, trick stacks, the current trick and the history are copied, the
+        TrickRecords are shared. The clone is played by agents, or by RandomAgents.
+        Every clone gets a new random stream, drawn from a side stream of this
+        round, so clones play different lines and this round's draws don't change.
+        """
+        if self._clone_rng is None:
+            rng = Random()
+            rng.setstate(self.rng.getstate())
+            self._clone_rng = Random(rng.getrandbits(64))
+        clone = copy.copy(self)
+        clone.rng = Random(self._clone_rng.getrandbits(64))
+        clone._clone_rng = None
+        clone.deck = Deck(clone.rng)
+        clone.skat = list(self.skat)
+        if self.game is not None:
+            clone.game = new_game(self.game.type_id)
+            clone.game.trick.buffer.extend(self.game.trick.buffer)
+        clone.trick_history = self.trick_history.copy()
+        clone._undo_stack = list()
+        clone._undo_depth = 0
+        clone.observation = ObservationBuilder(clone)
+        clone.belief = BeliefState(clone)
+        clone.player = list()
+        clone.init_players(agents)
+        for player, source in zip(clone.player, self.player):
+            player.hand = source.hand.copy()
+            player.trick_stack = source.trick_stack.copy()
+            player.trick_points = source.trick_points
+        return clone
 
     @property
     def front_hand(self) -> int:
         """Return player_id in front-hand-position"""
-        if (
-            len(self.trick_history) > 0
-            and self.trick_history.buffer[-1].winner is not None
-        ):
-            return self.trick_history.buffer[-1].winner
-        else:
-            return (self.dealer + 1) % 3
+        if self._front_hand is not None:
+            return self._front_hand
+        return (self.dealer + 1) % 3
 
     @property
     def middle_hand(self) -> int:
@@ -198,7 +601,7 @@ class Round:
     def init_players(self, agents=None) -> None:
         if not agents:
             for i in range(3):
-                self.player.append(Player(RandomAgent(), i))
+                self.player.append(Player(RandomAgent(self.rng.getrandbits(64)), i))
         else:
             for idx, agent in enumerate(agents):
                 self.player.append(Player(agent, idx))
@@ -211,17 +614,8 @@ class Round:
         if self.game is None:
             # if the game is not declared, there is no trick to look up.
             return self.front_hand
-        match len(self.game.trick):
-            case 0:
-                return self.front_hand
-            case 1:
-                return self.middle_hand
-            case 2:
-                return self.back_hand
-            case 3:
-                return self.front_hand
-            case _:
-                raise Exception("more than 3 cards in trick, that smells!")
+        # a full trick is replaced by a new one in step, so len is 0, 1 or 2
+        return (self.front_hand + len(self.game.trick)) % 3
 
     @property
     def soloist_leading(self) -> bool:
@@ -272,55 +666,23 @@ class Round:
         """Deal cards."""
         if self.deal_deck:
             self.deck.initialize_cards()
-            self.deck.shuffle(seed=self.seed)
+            self.deck.shuffle(seed=self.rng)
             for player in self.player:
-                player.hand = Hand(self.deck.deal_cards())
-                player.hand.sort(order=HandOrder("♦♥♠♣", "789QKXA", "♦♥♠♣", "J"))
+                player.hand.clear()
+                player.receive_cards(self.deck.deal_cards())
+                player.hand.sort(order=DEAL_ORDER)
         else:
             for idx, player in enumerate(self.player):
-                player.hand = Hand(self.initial_cards[idx])  # type: ignore
-                player.hand.sort(order=HandOrder("♦♥♠♣", "789QKXA", "♦♥♠♣", "J"))
+                player.hand.clear()
+                player.receive_cards(self.initial_cards[idx])  # type: ignore
+                player.hand.sort(order=DEAL_ORDER)
             self.skat = self.initial_cards[3]  # type: ignore
 
-    def get_state(self, player_id) -> np.ndarray:
+    def get_state(self, player_id, out: Optional[np.ndarray] = None) -> np.ndarray:
         """Return a state vector for a given player. A player has a limited view on the
-        state in incomplete information games."""
-        __hand = self.player[player_id].hand.as_vector
-        __color = self.game.to_numpy()  # type: ignore
-        __points = np.array(
-            [self.points_soloist / 120.0, self.points_defenders / 120.0]
-        )
-        __played_cards = np.array([])
-        for i in range(3):
-            __played_cards = np.concatenate(
-                (__played_cards, self.trick_history.to_numpy(player_id=i))
-            )
-        __trick_value = np.array([self.game.trick.value / 120.0])  # type: ignore
-        __current_trick = self.game.trick.as_vector
-        __front_hand = np.zeros(3, dtype=int)
-        if player_id == self.front_hand:
-            __front_hand[0] = 1
-        elif player_id == self.middle_hand:
-            __front_hand[1] = 1
-        elif player_id == self.back_hand:
-            __front_hand[2] = 1
-        # assert len(__hand) == 32
-        # assert len(__color) == 5
-        # assert len(__points) == 2
-        # assert len(__trick_value) == 1
-        # assert len(__played_cards) == 96
-        return np.concatenate(
-            (
-                __hand,
-                __color,
-                __points,
-                __played_cards,
-                __trick_value,
-                __current_trick,
-                __front_hand,
-            ),
-            dtype=np.float32,
-        )
+        state in incomplete information games. The vector is written into out if
+        given, see ObservationBuilder for the layout."""
+        return self.observation.observe(player_id, out=out)
 
     def get_state_t(self, player_id) -> torch.Tensor:
         state = self.get_state(player_id)
@@ -328,47 +690,19 @@ class Round:
         # TODO: device should be derived from a config file
 
     def cumulative_reward(self, player_id) -> float:
-        is_solo = player_id == self.solo_player_id
-
-        reward_goals = {
-            "points": 2.0 / 120.0,
-            "win": 5.0,
-            "schneider": 2.0,
-            "schwarz": 2.0,
-        }
-
-        reward = 0.0
-
-        if is_solo:
-            reward += self.points_soloist * reward_goals["points"]
-            reward -= self.points_defenders * reward_goals["points"]
-            if self.soloist_won:
-                reward += reward_goals["win"]
-            if self.soloist_won_schneider:
-                reward += reward_goals["schneider"]
-            if self.soloist_won_schwarz:
-                reward += reward_goals["schwarz"]
-            if self.defenders_won:
-                reward -= reward_goals["win"]
-            if self.defenders_won_schneider:
-                reward -= reward_goals["schneider"]
-            if self.defenders_won_schwarz:
-                reward -= reward_goals["schwarz"]
-        else:
-            reward -= self.points_soloist * reward_goals["points"]
-            reward += self.points_defenders * reward_goals["points"]
-            if self.soloist_won:
-                reward -= reward_goals["win"]
-            if self.soloist_won_schneider:
-                reward -= reward_goals["schneider"]
-            if self.soloist_won_schwarz:
-                reward -= reward_goals["schwarz"]
-            if self.defenders_won:
-                reward += reward_goals["win"]
-            if self.defenders_won_schneider:
-                reward += reward_goals["schneider"]
-            if self.defenders_won_schwarz:
-                reward += reward_goals["schwarz"]
+        """
+        Return the reward of player_id for the current points, weighted by the
+        round's reward_goals. The soloist's reward is the negated defenders' reward.
+        """
+        goals = self.reward_goals
+        soloist = self.points_soloist
+        defenders = self.points_defenders
+        reward = (soloist - defenders) * goals["points"]
+        reward += goals["win"] * ((soloist > 60) - (defenders >= 60))
+        reward += goals["schneider"] * ((soloist > 90) - (defenders >= 90))
+        reward += goals["schwarz"] * ((soloist == 120) - (defenders == 120))
+        if player_id != self.solo_player_id:
+            reward = -reward
         return reward / 10.0
 
     def step(self) -> bool:
@@ -376,17 +710,20 @@ class Round:
         if self.phase == GamePhase.PLAYING:
             if self.game is None:
                 raise Exception("ur doin it worng")
-            self.game.trick.append(
-                self.next_player,
-                self.player[self.next_player].play_card(self.game.trick),
-            )
+            trick = self.game.trick
+            player_id = self.next_player
+            card = self.player[player_id].play_card(trick)
+            trick.append(player_id, card)
+            self.observation.play_card(player_id, card)
+            self.belief.play_card(player_id, card)
             if self.verbose:
-                print(f"trick={self.game.trick}")
-            if self.game.trick.is_full:
-                assert self.game.trick.winner is not None  # type safety
-                self.trick_history.append(copy.deepcopy(self.game.trick))
-                self.player[self.game.trick.winner].take_trick(self.game.trick)
+                print(f"trick={trick}")
+            if trick.is_full:
+                record = self.trick_history.append(trick)
+                self.player[record.winner].take_trick(trick)
+                self._front_hand = record.winner
                 self.game.new_trick()
+                self.observation.finish_trick(record)
                 # ping all player that the trick is done
                 for p in self.player:
                     is_terminal = len(self.trick_history) == 10
@@ -405,7 +742,7 @@ class Round:
             if not step:
                 # if no step was done, the game is in terminal state
                 return 0, self.is_finished
-            if self.next_player == player_id:
+            if self.next_player == player_id or self.is_finished:
                 current_points = self.player[player_id].trick_stack_value
                 reward = current_points - old_points
                 return reward, self.is_finished
@@ -440,6 +777,14 @@ class Round:
                 break
 
     def start(self):
+        self.prepare()
+        # card_outplay
+        while not self.is_finished:
+            self.step()
+        return self.count()
+
+    def prepare(self) -> None:
+        """Run all phases before the card play: deal, bid, skat and declaration."""
         # Wait for players
         while self.phase == GamePhase.WAITING:
             if len(self.player) == 3:
@@ -478,13 +823,11 @@ class Round:
         if self.game is None:
             self.game = self.player[self.solo_player_id].declare_game()
         # add skat to tricks
-        for card in self.skat:
-            self.player[self.solo_player_id].trick_stack.append(card)
-        # card_outplay
+        self.player[self.solo_player_id].take_cards(self.skat)
         self.phase = GamePhase.PLAYING
-        while not self.is_finished:
-            self.step()
-        # counting
+
+    def count(self) -> bool:
+        """Count the points and return True if the soloist won."""
         self.phase = GamePhase.COUNTING
         for p in self.player:
             is_soloist = p.seat_id == self.solo_player_id
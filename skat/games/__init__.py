@@ -10,6 +10,7 @@ from skat.trick import Trick
 class Game(ABC):
     trick: Trick
     order: HandOrder = HandOrder()
+    type_id: int  # index into skat.games.tables, 0-3 suit games, 4 grand, 5 null
 
     @abstractmethod
     def __init__(self) -> None:
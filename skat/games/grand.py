@@ -3,12 +3,51 @@ from typing import Optional
 import numpy as np
 
 import skat.games
-from skat.card import RANKS, SUITS, Card
+from skat.bitboard import to_mask
+from skat.card import CARDS, RANKS, SUITS, Card
 from skat.hand import HandOrder
-from skat.trick import Trick
+from skat.trick import Trick, lookup_winner
+
+# Precomputed, immutable membership tables. Only the Js are trumps.
+TRUMP_CARDS: tuple[Card, ...] = tuple(Card(i, 3) for i, _ in enumerate(SUITS))
+TRUMP_SET: frozenset[Card] = frozenset(TRUMP_CARDS)
+TRUMP_MASK: int = to_mask(TRUMP_CARDS)
+TRUMP_FLAGS: tuple[bool, ...] = tuple(card.is_jack for card in CARDS)
+SUIT_CARDS: tuple[tuple[Card, ...], ...] = tuple(
+    tuple(Card(suit, i) for i, _ in enumerate(RANKS) if i != 3)  # skip J
+    for suit, _ in enumerate(SUITS)
+)
+SUIT_SETS: tuple[frozenset[Card], ...] = tuple(frozenset(c) for c in SUIT_CARDS)
+SUIT_MASKS: tuple[int, ...] = tuple(to_mask(c) for c in SUIT_CARDS)
+# FOLLOW_MASKS[card.id] is the mask to follow if card is led
+FOLLOW_MASKS: tuple[int, ...] = tuple(
+    TRUMP_MASK if TRUMP_FLAGS[card.id] else SUIT_MASKS[card.suit_index]
+    for card in CARDS
+)
+# STRENGTH[card.id] orders the Js above all suit cards, a suit card only counts
+# in LEAD_STRENGTH if it follows the led suit.
+STRENGTH: tuple[int, ...] = tuple(
+    len(RANKS) + 1 + card.suit_index if card.is_jack else 1 + card.rank_index
+    for card in CARDS
+)
+# LEAD_STRENGTH[led_card.id][card.id] is the strength of a card in a trick led by
+# led_card, 0 if it can't win the trick.
+LEAD_STRENGTH: tuple[tuple[int, ...], ...] = tuple(
+    tuple(
+        (
+            STRENGTH[card.id]
+            if FOLLOW_MASKS[led.id] >> card.id & 1 or TRUMP_FLAGS[card.id]
+            else 0
+        )
+        for card in CARDS
+    )
+    for led in CARDS
+)
 
 
 class Grand(skat.games.Game):
+    type_id = 4
+
     def __init__(self) -> None:
         self.trick = GrandTrick()
         self.order = HandOrder(pivot_ranks="J")
@@ -18,19 +57,11 @@ class Grand(skat.games.Game):
 
     @staticmethod
     def trump_cards(suit=None) -> tuple[Card, ...]:
-        trumps = list()
-        for i, _ in enumerate(SUITS):
-            trumps.append(Card(i, 3))
-        return tuple(trumps)
+        return TRUMP_CARDS
 
     @staticmethod
     def suit_cards(suit) -> tuple[Card, ...]:
-        suits = list()
-        for i, _ in enumerate(RANKS):
-            if i == 3:
-                continue  # skip J
-            suits.append(Card(suit, i))
-        return tuple(suits)
+        return SUIT_CARDS[suit]
 
     @property
     def value(self) -> int:
@@ -46,41 +77,35 @@ class Grand(skat.games.Game):
 
 class GrandTrick(Trick):
     @property
-    def forced_cards(self) -> set[Card]:
+    def forced_cards(self) -> frozenset[Card]:
         if len(self.buffer) == 0:
-            return set()
+            return frozenset()
         else:
             if self.is_trump:
-                return set(Grand.trump_cards())
+                return TRUMP_SET
             else:
-                return set(Grand.suit_cards(SUITS.index(self.buffer[0].card.suit)))
+                return SUIT_SETS[self.buffer[0].card.suit_index]
+
+    @property
+    def forced_mask(self) -> int:
+        if len(self.buffer) == 0:
+            return 0
+        return FOLLOW_MASKS[self.buffer[0].card.id]
 
     @property
     def is_trump(self) -> bool:
         if len(self.buffer) <= 0:
             return False
-        return self.buffer[0].card.is_jack
+        return TRUMP_FLAGS[self.buffer[0].card.id]
 
     @property
     def winner(self) -> Optional[int]:
         if not self.is_full:
             return None
-        leading = self.buffer[0]
-        if self._is_trump_in_trick():
-            for turn in self.buffer[1:]:
-                if turn.card.is_jack:
-                    if leading.card.is_jack:
-                        if leading.card < turn.card:
-                            leading = turn
-                    else:
-                        leading = turn
-            return leading.player_id
-        else:
-            for turn in self.buffer[1:]:
-                if turn.card.suit == self.buffer[0].card.suit:
-                    if turn.card > leading.card:
-                        leading = turn
-            return leading.player_id
+        first, second, third = self.buffer
+        strength = LEAD_STRENGTH[first.card.id]
+        position = lookup_winner(strength, first.card.id, second.card.id, third.card.id)
+        return self.buffer[position].player_id
 
     def _is_trump_in_trick(self) -> bool:
-        return any(x.is_jack for _, x in self.buffer)
+        return bool(self.mask & TRUMP_MASK)
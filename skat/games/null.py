@@ -3,12 +3,40 @@ from typing import Optional
 import numpy as np
 
 import skat.games
-from skat.card import RANKS, SUITS, Card
+from skat.bitboard import to_mask
+from skat.card import CARDS, RANKS, SUITS, Card
 from skat.hand import HandOrder
-from skat.trick import Trick
+from skat.trick import Trick, lookup_winner
+
+# Precomputed, immutable membership tables. There are no trumps in a null game.
+TRUMP_CARDS: tuple[Card, ...] = tuple()
+TRUMP_SET: frozenset[Card] = frozenset()
+TRUMP_MASK: int = 0
+TRUMP_FLAGS: tuple[bool, ...] = tuple(False for _ in CARDS)
+SUIT_CARDS: tuple[tuple[Card, ...], ...] = tuple(
+    tuple(Card(suit, i) for i, _ in enumerate(RANKS)) for suit, _ in enumerate(SUITS)
+)
+SUIT_SETS: tuple[frozenset[Card], ...] = tuple(frozenset(c) for c in SUIT_CARDS)
+SUIT_MASKS: tuple[int, ...] = tuple(to_mask(c) for c in SUIT_CARDS)
+# FOLLOW_MASKS[card.id] is the mask to follow if card is led
+FOLLOW_MASKS: tuple[int, ...] = tuple(SUIT_MASKS[card.suit_index] for card in CARDS)
+# null game rank order: 7, 8, 9, X, J, Q, K, A
+RANK_ORDER: tuple[int, ...] = tuple("789XJQKA".index(rank) for rank in RANKS)
+STRENGTH: tuple[int, ...] = tuple(1 + RANK_ORDER[card.rank_index] for card in CARDS)
+# LEAD_STRENGTH[led_card.id][card.id] is the strength of a card in a trick led by
+# led_card, 0 if it doesn't follow the led suit.
+LEAD_STRENGTH: tuple[tuple[int, ...], ...] = tuple(
+    tuple(
+        STRENGTH[card.id] if FOLLOW_MASKS[led.id] >> card.id & 1 else 0
+        for card in CARDS
+    )
+    for led in CARDS
+)
 
 
 class Null(skat.games.Game):
+    type_id = 5
+
     def __init__(self) -> None:
         self.trick = NullTrick()
         self.order = HandOrder(ranks="789XJQKA")
@@ -19,14 +47,11 @@ class Null(skat.games.Game):
     @staticmethod
     def trump_cards(suit=None) -> tuple[Card, ...]:
         """There are no trumps, return always empty tuple"""
-        return tuple()
+        return TRUMP_CARDS
 
     @staticmethod
     def suit_cards(suit) -> tuple[Card, ...]:
-        suits = list()
-        for i, _ in enumerate(RANKS):
-            suits.append(Card(suit, i))
-        return tuple(suits)
+        return SUIT_CARDS[suit]
 
     @property
     def value(self) -> int:
@@ -38,11 +63,17 @@ class Null(skat.games.Game):
 
 class NullTrick(Trick):
     @property
-    def forced_cards(self) -> set[Card]:
+    def forced_cards(self) -> frozenset[Card]:
         if len(self.buffer) == 0:
-            return set()
+            return frozenset()
         else:
-            return set(Null.suit_cards(SUITS.index(self.buffer[0].card.suit)))
+            return SUIT_SETS[self.buffer[0].card.suit_index]
+
+    @property
+    def forced_mask(self) -> int:
+        if len(self.buffer) == 0:
+            return 0
+        return FOLLOW_MASKS[self.buffer[0].card.id]
 
     @property
     def is_trump(self) -> bool:
@@ -56,17 +87,14 @@ class NullTrick(Trick):
     def winner(self) -> Optional[int]:
         if not self.is_full:
             return None
-        leading = self.buffer[0]
-        for turn in self.buffer[1:]:
-            if turn.card.suit == self.buffer[0].card.suit:
-                if self.better_than(turn.card, leading.card):
-                    leading = turn
-        return leading.player_id
+        first, second, third = self.buffer
+        strength = LEAD_STRENGTH[first.card.id]
+        position = lookup_winner(strength, first.card.id, second.card.id, third.card.id)
+        return self.buffer[position].player_id
 
     @staticmethod
     def better_than(a: Card, b: Card):
         """Test if card `a` is better than card `b`"""
-        if a.suit != b.suit:
+        if a.suit_index != b.suit_index:
             raise Exception("Can't compare non equal suits")
-        order = ("7", "8", "9", "X", "J", "Q", "K", "A")
-        return order.index(a.rank) > order.index(b.rank)
+        return STRENGTH[a.id] > STRENGTH[b.id]
@@ -3,18 +3,76 @@ from typing import Optional
 import numpy as np
 
 import skat.games
-from skat.card import RANKS, SUITS, Card
+from skat.bitboard import to_mask
+from skat.card import CARDS, RANKS, SUITS, Card
 from skat.hand import HandOrder
-from skat.trick import Trick
+from skat.trick import Trick, lookup_winner
 
 MULTIPLIERS = (9, 10, 11, 12)
 
+# Precomputed, immutable membership tables. The first index is the trump suit.
+# SUIT_CARDS is independent of the trump suit: the non-jack cards of a suit.
+SUIT_CARDS: tuple[tuple[Card, ...], ...] = tuple(
+    tuple(Card(suit, i) for i, _ in enumerate(RANKS) if i != 3)  # skip J
+    for suit, _ in enumerate(SUITS)
+)
+SUIT_SETS: tuple[frozenset[Card], ...] = tuple(frozenset(c) for c in SUIT_CARDS)
+SUIT_MASKS: tuple[int, ...] = tuple(to_mask(c) for c in SUIT_CARDS)
+TRUMP_CARDS: tuple[tuple[Card, ...], ...] = tuple(
+    SUIT_CARDS[suit] + tuple(Card(j, 3) for j, _ in enumerate(SUITS))
+    for suit, _ in enumerate(SUITS)
+)  # ascending order, {♦J, ♥J, ♠J, ♣J} are the highest trumps
+TRUMP_SETS: tuple[frozenset[Card], ...] = tuple(frozenset(c) for c in TRUMP_CARDS)
+TRUMP_MASKS: tuple[int, ...] = tuple(to_mask(c) for c in TRUMP_CARDS)
+TRUMP_FLAGS: tuple[tuple[bool, ...], ...] = tuple(
+    tuple(bool(mask >> card.id & 1) for card in CARDS) for mask in TRUMP_MASKS
+)
+# FOLLOW_MASKS[trump_suit][card.id] is the mask to follow if card is led
+FOLLOW_MASKS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(
+        TRUMP_MASKS[suit] if TRUMP_FLAGS[suit][card.id] else SUIT_MASKS[card.suit_index]
+        for card in CARDS
+    )
+    for suit, _ in enumerate(SUITS)
+)
+# STRENGTH[trump_suit][card.id] orders trumps above all suit cards, a suit card
+# only counts in LEAD_STRENGTH if it follows the led suit.
+STRENGTH: tuple[tuple[int, ...], ...] = tuple(
+    tuple(
+        (
+            len(RANKS) + 1 + TRUMP_CARDS[suit].index(card)
+            if TRUMP_FLAGS[suit][card.id]
+            else 1 + card.rank_index
+        )
+        for card in CARDS
+    )
+    for suit, _ in enumerate(SUITS)
+)
+# LEAD_STRENGTH[trump_suit][led_card.id][card.id] is the strength of a card in a
+# trick led by led_card, 0 if it can't win the trick.
+LEAD_STRENGTH: tuple[tuple[tuple[int, ...], ...], ...] = tuple(
+    tuple(
+        tuple(
+            (
+                STRENGTH[suit][card.id]
+                if FOLLOW_MASKS[suit][led.id] >> card.id & 1
+                or TRUMP_FLAGS[suit][card.id]
+                else 0
+            )
+            for card in CARDS
+        )
+        for led in CARDS
+    )
+    for suit, _ in enumerate(SUITS)
+)
+
 
 class SuitGame(skat.games.Game):
     """Implements rules for a Suit-Game"""
 
     def __init__(self, suit):
         self.suit = suit
+        self.type_id = suit
         self.trick = SuitGameTrick(self.suit)
         self.order = HandOrder(suits=self.__suit_order(suit), pivot_ranks="J")
 
@@ -27,24 +85,12 @@ class SuitGame(skat.games.Game):
         """
         Returns an ascending ordered tuple of trumps for the selected game
         """
-        trumps = list()
-        for i, rank in enumerate(RANKS):
-            if i == 3:
-                continue  # skip J, we add him later.
-            trumps.append(Card(suit, i))
-        for j in range(len(SUITS)):
-            trumps.append(Card(j, 3))  # add Js {♦J, ♥J, ♠J, ♣J}
-        return tuple(trumps)
+        return TRUMP_CARDS[suit]
 
     @staticmethod
     def suit_cards(suit) -> tuple[Card, ...]:
         # TODO: option for ascending, descending
-        suits = list()
-        for i, _ in enumerate(RANKS):
-            if i == 3:
-                continue  # skip J
-            suits.append(Card(suit, i))
-        return tuple(suits)
+        return SUIT_CARDS[suit]
 
     @property
     def value(self) -> int:
@@ -84,21 +130,26 @@ class SuitGameTrick(Trick):
 
     def is_trump_card(self, card: Card) -> bool:
         """Check if given card is a trump card"""
-        card_set: set = {card}  # put the card in a set and compare it
-        return card_set < set(SuitGame.trump_cards(self.trump_suit))
+        return TRUMP_FLAGS[self.trump_suit][card.id]
 
     def is_trump_in_trick(self) -> bool:
-        return any(x in SuitGame.trump_cards(self.trump_suit) for _, x in self.buffer)
+        return bool(self.mask & TRUMP_MASKS[self.trump_suit])
 
     @property
-    def forced_cards(self) -> set[Card]:
+    def forced_cards(self) -> frozenset[Card]:
         if len(self.buffer) == 0:
-            return set()
+            return frozenset()
         else:
             if self.is_trump:
-                return set(SuitGame.trump_cards(self.trump_suit))
+                return TRUMP_SETS[self.trump_suit]
             else:
-                return set(SuitGame.suit_cards(SUITS.index(self.buffer[0].card.suit)))
+                return SUIT_SETS[self.buffer[0].card.suit_index]
+
+    @property
+    def forced_mask(self) -> int:
+        if len(self.buffer) == 0:
+            return 0
+        return FOLLOW_MASKS[self.trump_suit][self.buffer[0].card.id]
 
     @property
     def is_trump(self) -> bool:
@@ -111,35 +162,7 @@ class SuitGameTrick(Trick):
         """Returns the trick winner's player_id"""
         if not self.is_full:
             return None
-        leading = self.buffer[0]
-        if self.is_trump_in_trick():
-            # then only here can be the winner
-            for turn in self.buffer[1:]:
-                if self.is_trump_card(leading.card):
-                    if self.is_trump_card(turn.card):
-                        if leading.card.is_jack:
-                            if turn.card.is_jack:
-                                if leading.card < turn.card:
-                                    leading = turn
-                                else:
-                                    continue
-                            else:
-                                continue
-                        else:
-                            if turn.card.is_jack:
-                                leading = turn
-                            else:
-                                if leading.card < turn.card:
-                                    leading = turn
-                    else:
-                        continue
-                else:
-                    if self.is_trump_card(turn.card):
-                        leading = turn
-            return leading.player_id
-        else:
-            for turn in self.buffer[1:]:
-                if turn.card.suit == self.buffer[0].card.suit:
-                    if turn.card > leading.card:
-                        leading = turn
-            return leading.player_id
+        first, second, third = self.buffer
+        strength = LEAD_STRENGTH[self.trump_suit][first.card.id]
+        position = lookup_winner(strength, first.card.id, second.card.id, third.card.id)
+        return self.buffer[position].player_id
@@ -0,0 +1,83 @@
+"""
+Lookup tables of all game types, indexed by Game.type_id: 0-3 are the suit
+games (♦, ♥, ♠, ♣), 4 is grand and 5 is null.
+"""
+
+import os
+from typing import Optional
+
+import numpy as np
+
+from skat.games import Game, grand, null, suit
+from skat.trick import lookup_winner
+
+GRAND = 4
+NULL = 5
+GAME_TYPES = 6
+
+CACHE_DIR = os.environ.get(
+    "SKAT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "skat")
+)
+
+TRUMP_MASKS: tuple[int, ...] = suit.TRUMP_MASKS + (grand.TRUMP_MASK, null.TRUMP_MASK)
+# FOLLOW_MASKS[type_id][card.id] is the mask to follow if card is led
+FOLLOW_MASKS: tuple[tuple[int, ...], ...] = suit.FOLLOW_MASKS + (
+    grand.FOLLOW_MASKS,
+    null.FOLLOW_MASKS,
+)
+# LEAD_STRENGTH[type_id][led_card.id][card.id], see skat.trick.lookup_winner
+LEAD_STRENGTH: tuple[tuple[tuple[int, ...], ...], ...] = suit.LEAD_STRENGTH + (
+    grand.LEAD_STRENGTH,
+    null.LEAD_STRENGTH,
+)
+
+_winner_tables: dict[int, np.ndarray] = dict()
+
+
+def new_game(type_id: int) -> Game:
+    """Return a new Game of the given type_id."""
+    if 0 <= type_id < GRAND:
+        return suit.SuitGame(type_id)
+    if type_id == GRAND:
+        return grand.Grand()
+    if type_id == NULL:
+        return null.Null()
+    raise ValueError(f"invalid game type {type_id}")
+
+
+def trick_winner(type_id: int, first: int, second: int, third: int) -> int:
+    """Return the position (0, 1 or 2) of the winning card id in a full trick."""
+    return lookup_winner(LEAD_STRENGTH[type_id][first], first, second, third)
+
+
+def winner_table(type_id: int, cache_dir: Optional[str] = CACHE_DIR) -> np.ndarray:
+    """
+    Return the fully materialized (32, 32, 32) uint8 table of winning positions,
+    indexed by the card ids in playing order. The table is memoized and cached as
+    .npy file in cache_dir, pass cache_dir=None to skip the disk cache.
+    """
+    if type_id in _winner_tables:
+        return _winner_tables[type_id]
+    path = None
+    table = None
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, f"winner_table_{type_id}.npy")
+        if os.path.exists(path):
+            table = np.load(path)
+    if table is None:
+        strength = np.array(LEAD_STRENGTH[type_id], dtype=np.uint8)
+        led = np.arange(32)
+        first = strength[led, led][:, None, None]
+        second = strength[:, :, None]
+        third = strength[:, None, :]
+        first, second, third = np.broadcast_arrays(first, second, third)
+        table = np.argmax(np.stack((first, second, third)), axis=0).astype(np.uint8)
+        if path is not None:
+            os.makedirs(cache_dir, exist_ok=True)  # type: ignore
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as fp:
+                np.save(fp, table)
+            os.replace(tmp_path, path)
+    table.flags.writeable = False
+    _winner_tables[type_id] = table
+    return table
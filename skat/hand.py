@@ -1,13 +1,15 @@
 import collections.abc
+import functools
 import typing
-from typing import NamedTuple
+from typing import NamedTuple, Optional
 
 import numpy as np
 import torch
 
-from skat.card import Card
+from skat.bitboard import from_mask, to_mask
+from skat.card import CARDS, Card
 
-FULL_HAND = [Card(i, j) for i in range(4) for j in range(8)]
+FULL_HAND = list(CARDS)
 
 
 class HandOrder(NamedTuple):
@@ -16,21 +18,80 @@ class HandOrder(NamedTuple):
     pivot_suits: str = "♦♥♠♣"
     pivot_ranks: str = ""
 
+    @property
+    def sort_keys(self) -> tuple[int, ...]:
+        """32 sort keys indexed by card id, a higher key is a better card."""
+        return compile_order(self)
+
+    @property
+    def sequence(self) -> tuple[Card, ...]:
+        """All 32 cards sorted from best to worst."""
+        return compile_sequence(self)
+
+
+@functools.cache
+def compile_order(order: HandOrder) -> tuple[int, ...]:
+    """
+    Compile a HandOrder into 32 sort keys indexed by card id. Pivot cards (e.g.
+    Js) are better than all other cards and ordered by pivot rank, then pivot suit.
+    Other cards are ordered by suit, then rank. Suits or ranks missing in the order
+    sort lowest.
+    """
+    keys = list()
+    for card in CARDS:
+        pivot_rank = order.pivot_ranks.find(card.rank)
+        if pivot_rank >= 0:
+            pivot_suit = order.pivot_suits.find(card.suit)
+            keys.append(100 + (pivot_rank + 1) * 9 + pivot_suit + 1)
+        else:
+            suit, rank = order.suits.find(card.suit), order.ranks.find(card.rank)
+            keys.append((suit + 1) * 9 + rank + 1)
+    return tuple(keys)
+
+
+@functools.cache
+def compile_sequence(order: HandOrder) -> tuple[Card, ...]:
+    keys = compile_order(order)
+    return tuple(sorted(CARDS, key=lambda card: keys[card.id], reverse=True))
+
 
 class Hand(collections.abc.MutableSequence):
     def __init__(self, iterable=None) -> None:
         self.__hand: list[Card] = list()
+        self.__mask: int = 0
         if iterable:
             for item in iterable:
                 self.__hand.append(item)
+            self.__mask = to_mask(self.__hand)
+
+    @classmethod
+    def from_mask(cls, mask: int, order: Optional[HandOrder] = None) -> "Hand":
+        """
+        Create a Hand from a card mask. Cards are sorted by order if given,
+        otherwise they are in ascending id order.
+        """
+        mask = int(mask)
+        if order is None:
+            return cls(from_mask(mask))
+        return cls(card for card in order.sequence if mask >> card.id & 1)
 
     @typing.no_type_check
     def __setitem__(self, index: int, card: Card) -> None:
-        self.__hand[index] = card
+        if isinstance(index, slice):
+            self.__hand[index] = card
+            self.__mask = to_mask(self.__hand)
+        else:
+            self.__mask ^= 1 << self.__hand[index].id
+            self.__hand[index] = card
+            self.__mask |= 1 << card.id
 
     @typing.no_type_check
     def __delitem__(self, index: int) -> None:
-        del self.__hand[index]
+        if isinstance(index, slice):
+            del self.__hand[index]
+            self.__mask = to_mask(self.__hand)
+        else:
+            self.__mask ^= 1 << self.__hand.pop(index).id
 
     @typing.no_type_check
     def __getitem__(self, index: int):
@@ -50,11 +111,39 @@ class Hand(collections.abc.MutableSequence):
     def __eq__(self, other):
         return self.__hand == other.__hand
 
+    def __contains__(self, card) -> bool:
+        return isinstance(card, Card) and bool(self.__mask >> card.id & 1)
+
     def append(self, card: Card) -> None:
         self.__hand.append(card)
+        self.__mask |= 1 << card.id
 
     def insert(self, index: int, card: Card) -> None:
         self.__hand.insert(index, card)
+        self.__mask |= 1 << card.id
+
+    def pop_card(self, card: Card) -> int:
+        """Remove card and return its position, insert() puts it back."""
+        index = self.__hand.index(card)
+        del self.__hand[index]
+        self.__mask ^= 1 << card.id
+        return index
+
+    def clear(self) -> None:
+        self.__hand.clear()
+        self.__mask = 0
+
+    def copy(self) -> "Hand":
+        """Return a Hand with the same cards in the same order."""
+        hand = Hand()
+        hand.__hand = self.__hand.copy()
+        hand.__mask = self.__mask
+        return hand
+
+    @property
+    def mask(self) -> int:
+        """Returns the 32-bit card mask of the hand."""
+        return self.__mask
 
     @property
     def value(self) -> int:
@@ -80,32 +169,12 @@ class Hand(collections.abc.MutableSequence):
         return tensor
 
     def sort(self, order: HandOrder):
-        """Sort the Hand according to specified sort rules using Bubble-Sort."""
-        while True:
-            has_changed = False
-            for i in range(len(self.__hand) - 1):
-                if not self.tgt(self.__hand[i], self.__hand[i + 1], order):
-                    pivot = self.__hand[i]
-                    self.__hand[i] = self.__hand[i + 1]
-                    self.__hand[i + 1] = pivot
-                    has_changed = True
-            if not has_changed:
-                return
+        """Sort the Hand according to specified sort rules, best card first."""
+        keys = order.sort_keys
+        self.__hand.sort(key=lambda card: keys[card.id], reverse=True)
 
     @staticmethod
     def tgt(a: Card, b: Card, order: HandOrder):
         """Test if card `a` is better than card `b`"""
-        pivot_chars = tuple(order.pivot_ranks)
-        pivot_suits = tuple(order.pivot_suits)
-        if a.rank in pivot_chars or b.rank in pivot_chars:
-            if a.rank == b.rank:
-                return pivot_suits.index(a.suit) > pivot_suits.index(b.suit)
-            if a.rank in pivot_chars and b.rank in pivot_chars:
-                return pivot_chars.index(a.rank) > pivot_chars.index(b.rank)
-            else:
-                return a.rank in pivot_chars
-        if a.suit == b.suit:
-            return tuple(order.ranks).index(a.rank) > tuple(order.ranks).index(b.rank)
-        if not a.suit == b.suit:
-            return tuple(order.suits).index(a.suit) > tuple(order.suits).index(b.suit)
-        raise Exception("Something went completely wrong!")
+        keys = order.sort_keys
+        return keys[a.id] > keys[b.id]
@@ -0,0 +1,199 @@
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from skat.card import Card
+from skat.trick import TrickRecord
+
+HAND_SIZE = 32
+POINTS_SIZE = 2
+PLAYED_SIZE = 96
+TRICK_VALUE_SIZE = 1
+TRICK_SIZE = 32
+POSITION_SIZE = 3
+# size of the observation of suit games and grand, the color encoding of null
+# games is a single value, their observations are 4 values shorter
+OBSERVATION_SIZE = 171
+# one-hot position of the observer: front, middle or back hand
+_POSITIONS = np.eye(POSITION_SIZE, dtype=np.float32)
+
+
+class _Key(NamedTuple):
+    """The parts of a round the incremental updates keep track of."""
+
+    game: object
+    soloist: int
+    front_hand: int
+    history: int
+    trick: int
+    hand_0: int
+    hand_1: int
+    hand_2: int
+
+
+class ObservationBuilder:
+    """
+    Keeps the observation vectors of all three seats of a Round up to date.
+
+    The layout is the one of Round.get_state: hand (32), game encoding (5 for
+    suit games and grand, 1 for null, the last value is the current trick value),
+    points of soloist and defenders (2), played cards per seat (96), trick value
+    (1), current trick (32) and the position of the observer in the trick (3).
+
+    Round.step reports every card and every finished trick, which updates a few
+    entries per seat. Any other change of the round (dealing, skat, declaring a
+    game) is detected by a cheap key and triggers a full rebuild on the next
+    observe().
+    """
+
+    def __init__(self, state) -> None:
+        self.state = state
+        self.buffers: Optional[np.ndarray] = None  # (3, size) float32
+        self.key: Optional[_Key] = None
+        self._color = 0  # offset of the game encoding
+        self._points = 0
+        self._played = 0
+        self._trick_value = 0
+        self._trick = 0
+        self._position = 0
+
+    @property
+    def size(self) -> int:
+        if self.buffers is None:
+            self.sync()
+        return self.buffers.shape[1]  # type: ignore
+
+    def _key(self) -> "_Key":
+        state = self.state
+        return _Key(
+            state.game,
+            state.solo_player_id,
+            state.front_hand,
+            state.trick_history.mask,
+            state.game.trick.mask,
+            state.player[0].hand.mask,
+            state.player[1].hand.mask,
+            state.player[2].hand.mask,
+        )
+
+    def sync(self) -> None:
+        """Rebuild all observations from the round."""
+        state = self.state
+        color = state.game.to_numpy()
+        self._color = HAND_SIZE
+        self._points = self._color + len(color)
+        self._played = self._points + POINTS_SIZE
+        self._trick_value = self._played + PLAYED_SIZE
+        self._trick = self._trick_value + TRICK_VALUE_SIZE
+        self._position = self._trick + TRICK_SIZE
+        size = self._position + POSITION_SIZE
+        if self.buffers is None or self.buffers.shape[1] != size:
+            self.buffers = np.zeros((3, size), dtype=np.float32)
+        buffers = self.buffers
+        buffers[:] = 0
+        played = np.concatenate(
+            [state.trick_history.to_numpy(player_id=i) for i in range(3)]
+        )
+        for seat in range(3):
+            buffers[seat, np.arange(HAND_SIZE)] = state.player[seat].hand.as_vector
+            buffers[seat, self._played + np.arange(PLAYED_SIZE)] = played
+        buffers[:, self._color + np.arange(len(color))] = color
+        for _, card in state.game.trick.buffer:
+            buffers[:, self._trick + card.id] = 1
+        self._update_trick_value()
+        self._update_points()
+        self._update_position()
+        self.key = self._key()
+
+    def _advance(self, **changes) -> bool:
+        """
+        Move the key to the current state if the round only changed by `changes`
+        since the last update, otherwise drop the buffers' key to force a rebuild.
+        """
+        if self.key is None:
+            return False
+        expected = self.key._replace(**changes)
+        self.key = self._key()
+        if self.key != expected:
+            self.key = None
+            return False
+        return True
+
+    def play_card(self, player_id: int, card: Card) -> None:
+        """Update the observations after player_id played card."""
+        if self.key is None:
+            return
+        bit = 1 << card.id
+        hand = f"hand_{player_id}"
+        changes = {hand: getattr(self.key, hand) & ~bit, "trick": self.key.trick | bit}
+        if not self._advance(**changes):
+            return
+        self.buffers[player_id, card.id] = 0  # type: ignore
+        self.buffers[:, self._trick + card.id] = 1  # type: ignore
+        self._update_trick_value()
+
+    def finish_trick(self, record: TrickRecord) -> None:
+        """Update the observations after a trick was taken and a new one begins."""
+        if self.key is None:
+            return
+        changes = dict(
+            front_hand=record.winner,
+            history=self.key.history | record.mask,
+            trick=0,
+        )
+        if not self._advance(**changes):
+            return
+        buffers = self.buffers
+        for i, card_id in enumerate(record.cards):
+            seat = (record.leader + i) % 3
+            buffers[:, self._played + seat * HAND_SIZE + card_id] = 1
+            buffers[:, self._trick + card_id] = 0
+        self._update_trick_value()
+        self._update_points()
+        self._update_position()
+
+    def _update_trick_value(self) -> None:
+        value = self.state.game.trick.value
+        self.buffers[:, self._points - 1] = value  # type: ignore
+        self.buffers[:, self._trick_value] = value / 120.0  # type: ignore
+
+    def _update_points(self) -> None:
+        points = (
+            self.state.points_soloist / 120.0,
+            self.state.points_defenders / 120.0,
+        )
+        self.buffers[:, self._points + np.arange(POINTS_SIZE)] = points  # type: ignore
+
+    def _update_position(self) -> None:
+        front_hand = self.state.front_hand
+        for seat in range(3):
+            position = _POSITIONS[(seat - front_hand) % 3]
+            self.buffers[seat, self._position + np.arange(3)] = position  # type: ignore
+
+    def observe(self, player_id: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Return the observation of player_id, a new array or written into out. The
+        returned array is never the internal buffer.
+        """
+        if self.buffers is None or self.key != self._key():
+            self.sync()
+        buffer = self.buffers[player_id]  # type: ignore
+        if out is None:
+            return buffer.copy()
+        out[:] = buffer
+        return out
+
+
+def observe_batch(
+    states: Sequence, player_ids: Sequence[int], out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Fill an (N, size) array with the observations of player_ids[k] in the Round
+    states[k]. All rounds need observations of the same size.
+    """
+    if out is None:
+        size = states[0].observation.size if len(states) else OBSERVATION_SIZE
+        out = np.empty((len(states), size), dtype=np.float32)
+    for k, (state, player_id) in enumerate(zip(states, player_ids)):
+        state.observation.observe(player_id, out=out[k])
+    return out
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Optional
 
+from skat.bitboard import from_mask, legal_moves
 from skat.hand import Hand
 
 if TYPE_CHECKING:
@@ -19,6 +20,7 @@ class Player:
         self.seat_id: int = seat_id
         self.hand: Hand = Hand()
         self.trick_stack: Hand = Hand()
+        self.trick_points: int = 0  # running value of the trick stack
         self.public_state: Optional[Game] = None
 
     def __str__(self) -> str:
@@ -27,15 +29,15 @@ class Player:
     @property
     def trick_stack_value(self) -> int:
         """Returns the players current trick value."""
-        return self.trick_stack.value
+        return self.trick_points
+
+    def valid_mask(self, trick: Trick) -> int:
+        """Returns the card mask of valid moves given a trick and a hand"""
+        return legal_moves(self.hand.mask, trick.forced_mask)
 
     def valid_moves(self, trick: Trick):
         """Returns a set of valid moves given a trick and a hand"""
-        card_set = set(self.hand) & trick.forced_cards
-        if len(card_set) == 0:
-            return set(self.hand)
-        else:
-            return card_set
+        return set(from_mask(self.valid_mask(trick)))
 
     def receive_cards(self, cards: list[Card]):
         """Append the received cards from the dealer to the own hand."""
@@ -73,6 +75,19 @@ class Player:
         """Append won trick to the own trick stack."""
         for _, card in trick.buffer:
             self.trick_stack.append(card)
+        self.trick_points += trick.value
+
+    def take_cards(self, cards: list[Card]) -> None:
+        """Append cards to the own trick stack, e.g. the skat of the soloist."""
+        for card in cards:
+            self.trick_stack.append(card)
+            self.trick_points += card.value
+
+    def reset(self) -> None:
+        """Empty hand and trick stack for a new round."""
+        self.hand.clear()
+        self.trick_stack.clear()
+        self.trick_points = 0
 
     def set_state(self, state) -> None:
         self.public_state = state
@@ -0,0 +1,178 @@
+"""
+Deals of hidden cards under constraints. The hidden cards go to slots (the seats
+and the skat), every slot gets an exact number of cards out of the mask of cards
+it may hold. Cards that may go to the same slots are interchangeable, so deals
+are counted per group of such cards instead of per card.
+"""
+
+from bisect import bisect_right
+from itertools import islice
+from math import comb
+from random import Random
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+from skat.bitboard import card_ids, popcount
+from skat.utils.rng import Seed, make_generator
+
+
+def card_groups(hidden: int, allowed: Sequence[int]) -> list[tuple[int, tuple]]:
+    """
+    Group the card mask hidden by the slots a card may go to. Returns pairs of the
+    card mask and the slot indices of each group.
+    """
+    groups: dict[tuple, int] = dict()
+    rest = hidden
+    while rest:
+        low = rest & -rest
+        rest ^= low
+        slots = tuple(i for i, mask in enumerate(allowed) if mask & low)
+        groups[slots] = groups.get(slots, 0) | low
+    return [(mask, slots) for slots, mask in groups.items()]
+
+
+def splits(n: int, capacities: Sequence[int]) -> Iterator[tuple[int, ...]]:
+    """Yield all ways to split n cards into parts of at most capacities."""
+    if len(capacities) == 1:
+        if n <= capacities[0]:
+            yield (n,)
+        return
+    for k in range(min(n, capacities[0]) + 1):
+        for rest in splits(n - k, capacities[1:]):
+            yield (k,) + rest
+
+
+def multinomial(parts: Sequence[int]) -> int:
+    """Return the number of ways to split sum(parts) distinct cards into parts."""
+    ways = 1
+    n = 0
+    for k in parts:
+        n += k
+        ways *= comb(n, k)
+    return ways
+
+
+class DealSampler:
+    """
+    Uniform sampler of the deals of the card mask hidden where slot i gets
+    sizes[i] cards of allowed[i].
+
+    Cards are dealt group by group. The split of a group over its slots is drawn
+    with a probability proportional to the number of deals that complete it, then
+    the group's cards are shuffled into the split. Every consistent deal has the
+    same probability and no deal is ever rejected, however tight the constraints.
+    """
+
+    def __init__(
+        self, hidden: int, sizes: Sequence[int], allowed: Sequence[int]
+    ) -> None:
+        if sum(sizes) != popcount(hidden):
+            raise ValueError("slot sizes don't match the hidden cards")
+        self.sizes = tuple(sizes)
+        self.groups = card_groups(hidden, allowed)
+        self._ids = [card_ids(mask) for mask, _ in self.groups]
+        self._counts: dict[tuple, int] = dict()
+        self._choices: dict[tuple, tuple] = dict()
+        self.total = self.count(0, self.sizes)  # number of consistent deals
+
+    def count(self, i: int, free: tuple[int, ...]) -> int:
+        """Return the number of deals of the groups i, i+1, ... into free places."""
+        if i == len(self.groups):
+            return int(not any(free))
+        key = (i, free)
+        if key not in self._counts:
+            cumulative = self.choices(i, free)[0]
+            self._counts[key] = cumulative[-1] if cumulative else 0
+        return self._counts[key]
+
+    def choices(self, i: int, free: tuple[int, ...]) -> tuple[list, list, list]:
+        """
+        Return the cumulative deal counts, the splits and the remaining free places
+        of all splits of group i that can be completed.
+        """
+        key = (i, free)
+        if key not in self._choices:
+            mask, slots = self.groups[i]
+            cumulative: list[int] = list()
+            group_splits = list()
+            remaining = list()
+            total = 0
+            for split in splits(popcount(mask), [free[s] for s in slots] or [0]):
+                rest = list(free)
+                for s, k in zip(slots, split):
+                    rest[s] -= k
+                ways = multinomial(split) * self.count(i + 1, tuple(rest))
+                if ways:
+                    total += ways
+                    cumulative.append(total)
+                    group_splits.append(split)
+                    remaining.append(tuple(rest))
+            self._choices[key] = (cumulative, group_splits, remaining)
+        return self._choices[key]
+
+    def _check(self) -> None:
+        if not self.total:
+            raise ValueError("no deal is consistent with the constraints")
+
+    def sample(self, rng: Random) -> list[int]:
+        """Draw one deal, returns the card mask of every slot."""
+        self._check()
+        free = self.sizes
+        slots = [0] * len(free)
+        for i, (_, group_slots) in enumerate(self.groups):
+            cumulative, group_splits, remaining = self.choices(i, free)
+            k = bisect_right(cumulative, rng.randrange(cumulative[-1]))
+            cards = list(self._ids[i])
+            rng.shuffle(cards)
+            deal = iter(cards)
+            for s, n in zip(group_slots, group_splits[k]):
+                for c in islice(deal, n):
+                    slots[s] |= 1 << c
+            free = remaining[k]
+        return slots
+
+    def batch(
+        self, n: int, seed: Seed = None, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Draw n deals at once and return the (n, slots) uint32 card masks, for the
+        seats and the skat in the layout of Deck.batch_masks.
+        """
+        self._check()
+        rng = make_generator(seed)
+        if out is None:
+            out = np.zeros((n, len(self.sizes)), dtype=np.uint32)
+        else:
+            out[:] = 0
+        free = np.tile(np.array(self.sizes, dtype=np.int64), (n, 1))
+        for i, (_, group_slots) in enumerate(self.groups):
+            ids = np.array(self._ids[i], dtype=np.uint32)
+            chosen = np.empty((n, len(group_slots)), dtype=np.int64)
+            states, inverse = np.unique(free, axis=0, return_inverse=True)
+            inverse = inverse.ravel()
+            for u, state in enumerate(states):
+                rows = np.flatnonzero(inverse == u)
+                cumulative, group_splits, _ = self.choices(i, tuple(state.tolist()))
+                p = np.array(cumulative, dtype=np.float64) / float(cumulative[-1])
+                k = np.searchsorted(p, rng.random(len(rows)), side="right")
+                chosen[rows] = np.array(group_splits)[np.minimum(k, len(p) - 1)]
+            # shuffle the group's cards per deal, then cut them by the split
+            cards = ids[np.argsort(rng.random((n, len(ids))), axis=1)]
+            bits = np.left_shift(np.uint32(1), cards)
+            bounds = np.cumsum(chosen, axis=1)
+            positions = np.arange(len(ids))
+            part = (positions[None, :, None] >= bounds[:, None, :]).sum(axis=2)
+            for j, s in enumerate(group_slots):
+                masks = np.where(part == j, bits, np.uint32(0))
+                out[:, s] |= np.bitwise_or.reduce(masks, axis=1)
+            free[:, list(group_slots)] -= chosen
+        return out
+
+
+def count_deals(hidden: int, sizes: Sequence[int], allowed: Sequence[int]) -> int:
+    """
+    Return the number of deals of the card mask hidden where slot i gets sizes[i]
+    cards of allowed[i].
+    """
+    return DealSampler(hidden, sizes, allowed).total
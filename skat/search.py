@@ -0,0 +1,128 @@
+"""
+A small, fast state of the card play for search agents. Hands are card masks and
+tricks lists of card ids, so copying and stepping a state costs a few integer
+operations instead of the bookkeeping of a Round.
+"""
+
+from typing import Optional, Sequence
+
+from skat.games.tables import FOLLOW_MASKS, LEAD_STRENGTH, NULL
+from skat.solver import MAX_POINTS, VALUES
+from skat.trick import lookup_winner
+
+
+class SearchState:
+    """
+    The card play of one deal with open hands. points are the card points of the
+    soloist (including the skat), defender_points the ones of the defenders and
+    played the masks of the cards each seat played in completed tricks.
+    """
+
+    __slots__ = (
+        "type_id",
+        "soloist",
+        "hands",
+        "leader",
+        "trick",
+        "points",
+        "defender_points",
+        "played",
+        "soloist_tricks",
+        "follow",
+        "strength",
+    )
+
+    def __init__(
+        self,
+        type_id: int,
+        soloist: int,
+        hands: Sequence[int],
+        leader: int,
+        trick: Sequence[int] = (),
+        points: int = 0,
+        defender_points: int = 0,
+        played: Optional[Sequence[int]] = None,
+        soloist_tricks: int = 0,
+    ) -> None:
+        self.type_id = type_id
+        self.soloist = soloist
+        self.hands = list(hands)
+        self.leader = leader
+        self.trick = list(trick)
+        self.points = points
+        self.defender_points = defender_points
+        self.played = [0, 0, 0] if played is None else list(played)
+        self.soloist_tricks = soloist_tricks
+        self.follow = FOLLOW_MASKS[type_id]
+        self.strength = LEAD_STRENGTH[type_id]
+
+    def copy(self) -> "SearchState":
+        state = SearchState.__new__(SearchState)
+        state.type_id = self.type_id
+        state.soloist = self.soloist
+        state.hands = self.hands[:]
+        state.leader = self.leader
+        state.trick = self.trick[:]
+        state.points = self.points
+        state.defender_points = self.defender_points
+        state.played = self.played[:]
+        state.soloist_tricks = self.soloist_tricks
+        state.follow = self.follow
+        state.strength = self.strength
+        return state
+
+    @property
+    def next_player(self) -> int:
+        return (self.leader + len(self.trick)) % 3
+
+    @property
+    def is_terminal(self) -> bool:
+        """True if all cards are played or the soloist lost a null game."""
+        if self.type_id == NULL and self.soloist_tricks:
+            return True
+        return not (self.hands[0] | self.hands[1] | self.hands[2])
+
+    def legal_mask(self) -> int:
+        """Return the mask of valid cards of the next player."""
+        hand = self.hands[(self.leader + len(self.trick)) % 3]
+        if self.trick:
+            return hand & self.follow[self.trick[0]] or hand
+        return hand
+
+    def play(self, card: int) -> Optional[int]:
+        """
+        Play the card id for the next player, validity is not checked. Returns the
+        winner if the card completed a trick.
+        """
+        trick = self.trick
+        leader = self.leader
+        self.hands[(leader + len(trick)) % 3] ^= 1 << card
+        trick.append(card)
+        if len(trick) < 3:
+            return None
+        first, second, third = trick
+        winner = (
+            leader + lookup_winner(self.strength[first], first, second, third)
+        ) % 3
+        value = VALUES[first] + VALUES[second] + VALUES[third]
+        if winner == self.soloist:
+            self.points += value
+            self.soloist_tricks += 1
+        else:
+            self.defender_points += value
+        played = self.played
+        played[leader] |= 1 << first
+        played[(leader + 1) % 3] |= 1 << second
+        played[(leader + 2) % 3] |= 1 << third
+        self.leader = winner
+        self.trick = []
+        return winner
+
+    def value(self) -> int:
+        """
+        The card points of the soloist, in null games 120 for a won and 0 for a
+        lost game.
+        """
+        if self.type_id == NULL:
+            return 0 if self.soloist_tricks else MAX_POINTS
+        return self.points
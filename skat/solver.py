@@ -0,0 +1,347 @@
+"""
+Double-dummy (open-hand) solver for the card play. Given all hands, the game
+type, the soloist and the current trick it computes the optimal soloist card
+points of the remaining play and a best move.
+
+The search works on card masks and the tables of skat.games.tables: alpha-beta
+over card-point windows, a Zobrist-keyed transposition table at trick starts,
+move ordering with a history heuristic and pruning of equivalent cards.
+
+Scope: the search visits about 250k nodes per second in pure Python, which is
+not enough to compute the exact points of a full 10-trick suit game well under a
+second. On 10 random deals an exact full-deal solve took 0.2-21 s (4.7 s on
+average) for a suit game, 0.1-15 s (3.0 s) for a grand and 0-3.6 s (0.4 s)
+for a null game. What is fast is what the agents use: a win/loss query with the
+window alpha=60, beta=61 took 0.24 s on average on 100 full suit and grand
+deals (worst 4.5 s), and exact solves after three tricks 0.06 s on average
+(worst 0.4 s), after five tricks a few milliseconds.
+"""
+
+from random import Random
+from typing import NamedTuple, Optional, Sequence
+
+from skat.bitboard import iter_cards, popcount
+from skat.card import CARDS, POINTS
+from skat.games.tables import FOLLOW_MASKS, LEAD_STRENGTH, NULL
+from skat.trick import lookup_winner
+
+VALUES: tuple[int, ...] = tuple(card.value for card in CARDS)
+MAX_POINTS = sum(POINTS) * 4  # 120
+
+_zobrist = Random(0x5CA7)
+ZOBRIST: tuple[tuple[int, ...], ...] = tuple(
+    tuple(_zobrist.getrandbits(64) for _ in CARDS) for _ in range(3)
+)
+LEADER_KEYS: tuple[int, ...] = tuple(_zobrist.getrandbits(64) for _ in range(3))
+
+
+def _above(type_id: int) -> tuple[tuple[int, ...], ...]:
+    """
+    For every card id the ids of the stronger cards of its follow group (the
+    trumps or its plain suit), nearest first.
+    """
+    above = list()
+    for card in CARDS:
+        strength = LEAD_STRENGTH[type_id][card.id]
+        group = [c.id for c in iter_cards(FOLLOW_MASKS[type_id][card.id])]
+        stronger = [c for c in group if strength[c] > strength[card.id]]
+        above.append(tuple(sorted(stronger, key=lambda c: strength[c])))
+    return tuple(above)
+
+
+ABOVE: tuple[tuple[tuple[int, ...], ...], ...] = tuple(
+    _above(type_id) for type_id in range(len(FOLLOW_MASKS))
+)
+
+
+class Solution(NamedTuple):
+    """Result of a solver search."""
+
+    value: int  # soloist card points of the remaining play
+    card: Optional[int]  # id of a best card for the player to move
+
+
+class Solver:
+    """
+    Double-dummy solver of one game type and soloist.
+
+    Values are the card points the soloist takes in the remaining play, including
+    the cards of the current trick. Null games are solved for the win: the value is
+    120 if the soloist takes no trick and 0 otherwise.
+
+    The transposition table stores value bounds of trick-start positions, which
+    don't depend on the points already taken, so it stays valid between calls.
+    """
+
+    def __init__(self, type_id: int, soloist: int, table_bits: int = 20) -> None:
+        self.type_id = type_id
+        self.soloist = soloist
+        self.null = type_id == NULL
+        self.follow = FOLLOW_MASKS[type_id]
+        self.strength = LEAD_STRENGTH[type_id]
+        self.above = ABOVE[type_id]
+        # leads are tried strongest first, higher values first on equal strength
+        self.lead_order = tuple(
+            self.strength[c][c] * MAX_POINTS + VALUES[c] for c in range(len(CARDS))
+        )
+        self.table_mask = (1 << table_bits) - 1
+        self.table_keys: list[Optional[int]] = [None] * (1 << table_bits)
+        self.table: list[Optional[tuple[int, int, int, int]]] = [None] * (
+            1 << table_bits
+        )
+        self.nodes = 0
+        self.history = [[0] * len(CARDS) for _ in range(3)]
+        self._hands = [0, 0, 0]
+        self._key = 0
+        self._remaining = 0
+
+    def clear(self) -> None:
+        """Empty the transposition table."""
+        self.table_keys = [None] * len(self.table_keys)
+        self.table = [None] * len(self.table)
+
+    def solve(
+        self,
+        hands: Sequence[int],
+        leader: int,
+        trick: Sequence[int] = (),
+        alpha: Optional[int] = None,
+        beta: Optional[int] = None,
+    ) -> Solution:
+        """
+        Search the position of the card masks hands, where leader led the card ids
+        of trick.
+
+        Without a window the exact value is found by a binary search of null-window
+        searches, which share the transposition table. With a window (alpha, beta)
+        a single search is done, its value is exact inside the window and a bound
+        otherwise, e.g. alpha=60, beta=61 answers if the soloist can get 61.
+        """
+        trick = list(trick)
+        self._hands = list(hands)
+        self._key = 0
+        self._remaining = sum(VALUES[c] for c in trick)
+        for seat, hand in enumerate(self._hands):
+            for card in iter_cards(hand):
+                self._key ^= ZOBRIST[seat][card.id]
+                self._remaining += card.value
+        sizes = [
+            popcount(self._hands[(leader + i) % 3]) + (i < len(trick)) for i in range(3)
+        ]
+        if len(trick) > 2 or min(sizes) != max(sizes):
+            raise ValueError("hands don't fit the trick")
+        self.nodes = 0
+        best: list = [None]
+        if alpha is not None or beta is not None:
+            alpha = -1 if alpha is None else alpha
+            beta = MAX_POINTS + 1 if beta is None else beta
+            value = self._search(leader, trick, alpha, beta, best)
+            if best[0] is None:
+                # decided by a bound, every move reaches the value
+                best[0] = self._moves((leader + len(trick)) % 3, trick, None)[0]
+            return Solution(value, best[0])
+        maximize = (leader + len(trick)) % 3 == self.soloist
+        lower, upper = 0, MAX_POINTS if self.null else self._remaining
+        move = None
+        while lower < upper:
+            test = MAX_POINTS if self.null else (lower + upper + 1) // 2
+            value = self._search(leader, trick, test - 1, test, best)
+            if value >= test:
+                lower = value
+                if maximize:
+                    move = best[0]
+            else:
+                upper = value
+                if not maximize:
+                    move = best[0]
+        if move is None:
+            # every move reaches the value
+            move = self._moves((leader + len(trick)) % 3, trick, None)[0]
+        return Solution(lower, move)
+
+    def _moves(self, player: int, trick: list[int], best: Optional[int]) -> list:
+        """Return the ordered, representative legal card ids of player."""
+        hand = self._hands[player]
+        if trick:
+            legal = hand & self.follow[trick[0]] or hand
+        else:
+            legal = hand
+        live = self._hands[0] | self._hands[1] | self._hands[2]
+        for card in trick:
+            live |= 1 << card
+        moves = list()
+        rest = legal
+        while rest:
+            low = rest & -rest
+            rest ^= low
+            c = low.bit_length() - 1
+            # skip c if the next stronger live card of its group is an equivalent
+            # legal card of the same hand
+            for d in self.above[c]:
+                if live >> d & 1:
+                    if legal >> d & 1 and VALUES[d] == VALUES[c]:
+                        c = -1
+                    break
+            if c >= 0:
+                moves.append(c)
+        if trick:
+            strength = self.strength[trick[0]]
+            top = max(range(len(trick)), key=lambda i: strength[trick[i]])
+            top_strength = strength[trick[top]]
+            partner_wins = ((player - len(trick) + top) % 3 == self.soloist) == (
+                player == self.soloist
+            )
+            if partner_wins:
+                # don't take the trick from the partner, add points to it
+                moves.sort(key=lambda c: (strength[c] <= top_strength, VALUES[c]))
+                moves.reverse()
+            else:
+                # take the trick as cheap as possible, otherwise add no points
+                moves.sort(
+                    key=lambda c: (
+                        strength[c] > top_strength,
+                        -strength[c] if strength[c] > top_strength else -VALUES[c],
+                    ),
+                    reverse=True,
+                )
+        else:
+            history = self.history[player]
+            order = self.lead_order
+            moves.sort(key=lambda c: (history[c], order[c]), reverse=True)
+        if best is not None and best in moves:
+            moves.remove(best)
+            moves.insert(0, best)
+        return moves
+
+    def _search(self, leader: int, trick: list[int], alpha: int, beta: int, best):
+        self.nodes += 1
+        # the value is at least 0 and at most the points still in play
+        if beta <= 0:
+            return 0
+        upper = MAX_POINTS if self.null else self._remaining
+        if upper <= alpha:
+            return upper
+        hands = self._hands
+        index = 0
+        entry = None
+        if not trick:
+            if not (hands[0] | hands[1] | hands[2]):
+                return MAX_POINTS if self.null else 0
+            if not hands[leader] & hands[leader] - 1:
+                return self._last_trick(leader)
+            key = self._key ^ LEADER_KEYS[leader]
+            index = key & self.table_mask
+            if self.table_keys[index] == key:
+                entry = self.table[index]
+                lower, upper = entry[0], min(upper, entry[1])  # type: ignore
+                if lower >= beta or lower == upper:
+                    best[0] = entry[2]  # type: ignore
+                    return lower
+                if upper <= alpha:
+                    best[0] = entry[2]  # type: ignore
+                    return upper
+                alpha, beta = max(alpha, lower), min(beta, upper)
+        alpha_start, beta_start = alpha, beta
+        player = (leader + len(trick)) % 3
+        maximize = player == self.soloist
+        best_value = -1 if maximize else MAX_POINTS + 1
+        best_move = None
+        child: list = [None]
+        for card in self._moves(player, trick, entry[2] if entry else None):
+            bit = 1 << card
+            hands[player] ^= bit
+            self._key ^= ZOBRIST[player][card]
+            trick.append(card)
+            if len(trick) == 3:
+                position = lookup_winner(self.strength[trick[0]], *trick)
+                winner = (leader + position) % 3
+                points = VALUES[trick[0]] + VALUES[trick[1]] + VALUES[trick[2]]
+                self._remaining -= points
+                if self.null:
+                    if winner == self.soloist:
+                        value = 0
+                    else:
+                        value = self._search(winner, [], alpha, beta, child)
+                else:
+                    gain = points if winner == self.soloist else 0
+                    value = gain + self._search(
+                        winner, [], alpha - gain, beta - gain, child
+                    )
+                self._remaining += points
+            else:
+                value = self._search(leader, trick, alpha, beta, child)
+            trick.pop()
+            self._key ^= ZOBRIST[player][card]
+            hands[player] ^= bit
+            if maximize:
+                if value > best_value:
+                    best_value, best_move = value, card
+                    alpha = max(alpha, value)
+            elif value < best_value:
+                best_value, best_move = value, card
+                beta = min(beta, value)
+            if alpha >= beta:
+                if not trick:
+                    self.history[player][card] += 1 << popcount(hands[player])
+                break
+        best[0] = best_move
+        if not trick:
+            self._store(index, key, best_value, alpha_start, beta_start, best_move)
+        return best_value
+
+    def _last_trick(self, leader: int) -> int:
+        """Return the value of the last trick, every hand holds one card."""
+        hands = self._hands
+        cards = [hands[(leader + i) % 3].bit_length() - 1 for i in range(3)]
+        winner = (leader + lookup_winner(self.strength[cards[0]], *cards)) % 3
+        if self.null:
+            return 0 if winner == self.soloist else MAX_POINTS
+        if winner != self.soloist:
+            return 0
+        return VALUES[cards[0]] + VALUES[cards[1]] + VALUES[cards[2]]
+
+    def _store(self, index, key, value, alpha, beta, move) -> None:
+        """Store a bound of a trick-start position, deeper positions are kept."""
+        depth = popcount(self._hands[0] | self._hands[1] | self._hands[2])
+        lower, upper = 0, MAX_POINTS
+        entry = self.table[index] if self.table_keys[index] == key else None
+        if entry is not None:
+            lower, upper = entry[0], entry[1]
+        elif self.table[index] is not None and self.table[index][3] > depth:
+            return
+        if value <= alpha:
+            upper = min(upper, value)
+        elif value >= beta:
+            lower = max(lower, value)
+        else:
+            lower = upper = value
+        self.table_keys[index] = key
+        self.table[index] = (lower, upper, move, depth)  # type: ignore
+
+
+def solve(
+    hands: Sequence[int],
+    type_id: int,
+    soloist: int,
+    leader: int,
+    trick: Sequence[int] = (),
+) -> Solution:
+    """Solve a position once, see Solver.solve."""
+    return Solver(type_id, soloist).solve(hands, leader, trick)
+
+
+def solve_round(state, solver: Optional[Solver] = None) -> Solution:
+    """
+    Solve the card play of a Round in the PLAYING phase. The value is the final
+    card points of the soloist (or the null value), the card is a best card for
+    the next player.
+    """
+    game = state.game
+    if solver is None:
+        solver = Solver(game.type_id, state.solo_player_id)
+    hands = [player.hand.mask for player in state.player]
+    trick = [turn.card.id for turn in game.trick.buffer]
+    solution = solver.solve(hands, state.front_hand, trick)
+    if solver.null:
+        return solution
+    return Solution(solution.value + state.points_soloist, solution.card)
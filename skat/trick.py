@@ -1,12 +1,27 @@
 from abc import ABC, abstractmethod
 from collections import namedtuple
-from typing import Optional
+from typing import NamedTuple, Optional, Union
 
 import numpy as np
 
-from skat.card import Card
+from skat.card import CARDS, Card
 
 Turn = namedtuple("Turn", ("player_id", "card"))
+# the turns of the three seats, indexed by player_id and card id
+TURNS: tuple[tuple[Turn, ...], ...] = tuple(
+    tuple(Turn(player_id, card) for card in CARDS) for player_id in range(3)
+)
+
+
+def lookup_winner(strength: tuple[int, ...], first: int, second: int, third: int):
+    """
+    Return the position (0, 1 or 2) of the winning card in a trick of card ids.
+    `strength` is the strength row selected by the led card: cards which neither
+    follow the led suit nor trump have strength 0, the led card is always > 0.
+    """
+    if strength[first] >= strength[second]:
+        return 0 if strength[first] >= strength[third] else 2
+    return 1 if strength[second] >= strength[third] else 2
 
 
 class Trick(ABC):
@@ -35,9 +50,22 @@ class Trick(ABC):
         return len(self.buffer) == 3
 
     @property
-    def forced_cards(self) -> set[Card]:
+    def forced_cards(self) -> frozenset[Card]:
         raise NotImplementedError
 
+    @property
+    def forced_mask(self) -> int:
+        """Returns the card mask a player has to follow, 0 for an empty trick."""
+        raise NotImplementedError
+
+    @property
+    def mask(self) -> int:
+        """Returns the card mask of the cards in the trick."""
+        mask = 0
+        for _, card in self.buffer:
+            mask |= 1 << card.id
+        return mask
+
     @property
     def is_trump(self) -> bool:
         """Returns True if first card in Trick is a trump card"""
@@ -65,9 +93,49 @@ class Trick(ABC):
         return arr
 
 
+class TrickRecord(NamedTuple):
+    """
+    An immutable, completed trick. Cards are stored as card ids in playing order,
+    the card at position i was played by seat (leader + i) % 3.
+    """
+
+    leader: int
+    cards: tuple[int, int, int]
+    winner: int
+    value: int
+
+    @classmethod
+    def from_trick(cls, trick: Trick) -> "TrickRecord":
+        """Freeze a full trick."""
+        winner = trick.winner
+        if winner is None:
+            raise Exception("only full tricks can be recorded")
+        turns = trick.buffer
+        return cls(
+            leader=turns[0].player_id,
+            cards=(turns[0].card.id, turns[1].card.id, turns[2].card.id),
+            winner=winner,
+            value=trick.value,
+        )
+
+    @property
+    def buffer(self) -> tuple[Turn, ...]:
+        """Return the (player, card)-tuples like Trick.buffer."""
+        return tuple(
+            Turn((self.leader + i) % 3, CARDS[card_id])
+            for i, card_id in enumerate(self.cards)
+        )
+
+    @property
+    def mask(self) -> int:
+        """Returns the card mask of the cards in the trick."""
+        return (1 << self.cards[0]) | (1 << self.cards[1]) | (1 << self.cards[2])
+
+
 class TrickHistory:
     def __init__(self) -> None:
-        self.buffer: list[Trick] = list()
+        self.buffer: list[TrickRecord] = list()
+        self.mask: int = 0  # mask of all played cards
 
     def __getitem__(self, item):
         return self.buffer[item]
@@ -75,8 +143,30 @@ class TrickHistory:
     def __len__(self) -> int:
         return len(self.buffer)
 
-    def append(self, trick: Trick):
+    def clear(self) -> None:
+        self.buffer.clear()
+        self.mask = 0
+
+    def copy(self) -> "TrickHistory":
+        """Return a history sharing the immutable TrickRecords."""
+        history = TrickHistory()
+        history.buffer = self.buffer.copy()
+        history.mask = self.mask
+        return history
+
+    def pop(self) -> TrickRecord:
+        """Remove and return the last trick."""
+        record = self.buffer.pop()
+        self.mask ^= record.mask
+        return record
+
+    def append(self, trick: Union[Trick, TrickRecord]) -> TrickRecord:
+        """Append a completed trick, a full Trick is frozen into a TrickRecord."""
+        if isinstance(trick, Trick):
+            trick = TrickRecord.from_trick(trick)
         self.buffer.append(trick)
+        self.mask |= trick.mask
+        return trick
 
     def to_numpy(self, player_id=None) -> np.ndarray:
         """
@@ -85,10 +175,7 @@ class TrickHistory:
         """
         arr = np.zeros(32)
         for trick in self.buffer:
-            for pid, card in trick.buffer:
-                if player_id is None:
-                    arr[card.np_index] = 1
-                else:
-                    if pid == player_id:
-                        arr[card.np_index] = 1
+            for i, card_id in enumerate(trick.cards):
+                if player_id is None or (trick.leader + i) % 3 == player_id:
+                    arr[card_id] = 1
         return arr
@@ -0,0 +1,58 @@
+import random
+from typing import Union
+
+import numpy as np
+
+Seed = Union[
+    None, int, str, bytes, random.Random, np.random.Generator, np.random.SeedSequence
+]
+
+
+def make_rng(seed: Seed = None) -> random.Random:
+    """
+    Return a random.Random stream for a seed. A given random.Random is used as it
+    is, numpy Generators and SeedSequences are turned into a new seeded stream.
+    The process-global random module is never touched.
+    """
+    if isinstance(seed, random.Random):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        return random.Random(int(seed.integers(2**63)))
+    if isinstance(seed, np.random.SeedSequence):
+        return random.Random(int.from_bytes(seed.generate_state(4).tobytes(), "little"))
+    return random.Random(seed)
+
+
+def make_generator(seed: Seed = None) -> np.random.Generator:
+    """Return a numpy Generator for a seed, a given Generator is used as it is."""
+    if isinstance(seed, np.random.Generator):
+        return seed
+    if isinstance(seed, random.Random):
+        return np.random.default_rng(seed.getrandbits(128))
+    return np.random.default_rng(make_seed_sequence(seed))
+
+
+def make_seed_sequence(seed: Seed = None) -> np.random.SeedSequence:
+    """Return a numpy SeedSequence for a seed, e.g. a tournament master seed."""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        return np.random.SeedSequence(int(seed.integers(2**63)))
+    if isinstance(seed, random.Random):
+        return np.random.SeedSequence(seed.getrandbits(128))
+    if isinstance(seed, str):
+        seed = seed.encode()
+    if isinstance(seed, bytes):
+        return np.random.SeedSequence(int.from_bytes(seed, "little"))
+    return np.random.SeedSequence(seed)
+
+
+def round_seed(master: np.random.SeedSequence, index: int) -> np.random.SeedSequence:
+    """
+    Return the SeedSequence of the round with the given index. It only depends on
+    the master seed and the index, so rounds can be reproduced in any order and
+    on any worker.
+    """
+    return np.random.SeedSequence(
+        master.entropy, spawn_key=tuple(master.spawn_key) + (index,)
+    )
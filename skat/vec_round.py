@@ -0,0 +1,163 @@
+from typing import Optional, Union
+
+import numpy as np
+
+from skat.card import CARDS
+from skat.deck import Deck
+from skat.game import REWARD_GOALS
+from skat.games.tables import FOLLOW_MASKS, GAME_TYPES, LEAD_STRENGTH
+from skat.utils.rng import Seed, make_generator
+
+_FOLLOW = np.array(FOLLOW_MASKS, dtype=np.uint32)  # (game type, led card)
+_STRENGTH = np.array(LEAD_STRENGTH, dtype=np.uint8)  # (game type, led card, card)
+_POINTS = np.array([card.value for card in CARDS], dtype=np.int16)
+_BITS = np.arange(len(CARDS), dtype=np.uint32)
+
+
+def _mask_value(masks: np.ndarray) -> np.ndarray:
+    """Return the point values of an array of card masks."""
+    bits = (masks[..., None] >> _BITS) & 1
+    return (bits * _POINTS).sum(axis=-1)
+
+
+class VecRound:
+    """
+    A batch of N Skat rounds played in lockstep. All rounds are in the same
+    phase of the card play, so every step plays one card in every round: ply
+    0-29, the position in the current trick is ply % 3.
+
+    Hands are stored as (N, 3) card masks, the rules (following suit, trick
+    winners) are the precomputed tables of skat.games.tables and match Round for
+    suit games, grand and null.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        seed: Seed = None,
+        reward_goals: Optional[dict[str, float]] = None,
+    ) -> None:
+        self.n = n
+        self.reward_goals = REWARD_GOALS if reward_goals is None else reward_goals
+        self.rng = make_generator(seed)
+        self._rows = np.arange(n)
+        self.hands = np.zeros((n, 3), dtype=np.uint32)
+        self.skat = np.zeros(n, dtype=np.uint32)
+        self.game_type = np.zeros(n, dtype=np.int8)
+        self.soloist = np.zeros(n, dtype=np.int8)
+        self.front_hand = np.zeros(n, dtype=np.int8)
+        self.trick = np.zeros((n, 3), dtype=np.int8)  # card ids by position
+        self.points = np.zeros((n, 3), dtype=np.int16)  # per seat, incl. skat
+        self.ply = 0
+
+    def reset(
+        self,
+        decks: Optional[np.ndarray] = None,
+        game_type: Union[int, np.ndarray] = 0,
+        soloist: Union[int, np.ndarray] = 0,
+        dealer: Union[int, np.ndarray] = 0,
+    ) -> None:
+        """
+        Deal new rounds. decks is an (N, 32) array of card ids in the layout of
+        Deck.batch, random decks are dealt if None. game_type is a Game.type_id,
+        the skat counts for the soloist, front hand is the seat after the dealer.
+        """
+        if decks is None:
+            decks = Deck.batch(self.n, seed=self.rng)
+        masks = Deck.batch_masks(decks)
+        self.hands[:] = masks[:, :3]
+        self.skat[:] = masks[:, 3]
+        self.game_type[:] = game_type
+        if np.any((self.game_type < 0) | (self.game_type >= GAME_TYPES)):
+            raise ValueError("invalid game type")
+        self.soloist[:] = soloist
+        self.front_hand[:] = (np.asarray(dealer) + 1) % 3
+        self.trick[:] = 0
+        self.points[:] = 0
+        self.points[self._rows, self.soloist] = _mask_value(self.skat)
+        self.ply = 0
+
+    @property
+    def is_finished(self) -> bool:
+        return self.ply == 30
+
+    @property
+    def next_player(self) -> np.ndarray:
+        """Return the seat of the player who has to act in every round."""
+        return (self.front_hand + self.ply % 3) % 3
+
+    def legal_actions(self) -> np.ndarray:
+        """Return the (N,) card masks of legal moves of the next player."""
+        hand = self.hands[self._rows, self.next_player]
+        if self.ply % 3 == 0:
+            return hand
+        follow = hand & _FOLLOW[self.game_type, self.trick[:, 0]]
+        return np.where(follow != 0, follow, hand)
+
+    def legal_mask(self) -> np.ndarray:
+        """Return the (N, 32) bool mask of legal moves of the next player."""
+        return ((self.legal_actions()[:, None] >> _BITS) & 1).astype(bool)
+
+    def random_actions(self) -> np.ndarray:
+        """Return a uniformly chosen legal card id for every round."""
+        legal = self.legal_actions()
+        k = (self.rng.random(self.n) * np.bitwise_count(legal)).astype(np.uint8)
+        for i in range(int(k.max(initial=0))):
+            # drop the lowest card until the k-th legal card is the lowest one
+            legal = np.where(k > i, legal & (legal - np.uint32(1)), legal)
+        lowest = legal & (~legal + np.uint32(1))
+        return np.bitwise_count(lowest - np.uint32(1)).astype(np.int8)
+
+    def step(self, actions: np.ndarray, validate: bool = True) -> None:
+        """Play the (N,) card ids `actions` for the next player of every round."""
+        if self.is_finished:
+            raise Exception("all tricks are played")
+        actions = np.asarray(actions)
+        bits = np.left_shift(np.uint32(1), actions.astype(np.uint32))
+        if validate and np.any(self.legal_actions() & bits == 0):
+            raise ValueError("illegal action")
+        position = self.ply % 3
+        self.hands[self._rows, self.next_player] &= ~bits
+        self.trick[:, position] = actions
+        self.ply += 1
+        if position == 2:
+            self._finish_trick()
+
+    def _finish_trick(self) -> None:
+        strength = _STRENGTH[self.game_type, self.trick[:, 0]]
+        trick_strength = np.take_along_axis(strength, self.trick.astype(np.intp), 1)
+        winner = (self.front_hand + trick_strength.argmax(axis=1)) % 3
+        self.points[self._rows, winner] += _POINTS[self.trick].sum(axis=1)
+        self.front_hand[:] = winner
+
+    @property
+    def points_soloist(self) -> np.ndarray:
+        return self.points[self._rows, self.soloist]
+
+    @property
+    def points_defenders(self) -> np.ndarray:
+        return self.points.sum(axis=1) - self.points_soloist
+
+    def rewards(self) -> np.ndarray:
+        """
+        Return the (N, 3) cumulative rewards of every seat, the same as
+        Round.cumulative_reward.
+        """
+        soloist = self.points_soloist
+        defenders = self.points_defenders
+        win = (soloist > 60).astype(float) - (defenders >= 60)
+        schneider = (soloist > 90).astype(float) - (defenders >= 90)
+        schwarz = (soloist == 120).astype(float) - (defenders == 120)
+        goals = self.reward_goals
+        reward = (
+            (soloist - defenders) * goals["points"]
+            + win * goals["win"]
+            + schneider * goals["schneider"]
+            + schwarz * goals["schwarz"]
+        )
+        is_soloist = np.arange(3) == self.soloist[:, None]
+        return np.where(is_soloist, reward[:, None], -reward[:, None]) / 10.0
+
+    def soloist_won(self) -> np.ndarray:
+        """Return True for every round the soloist has won, like Round.start."""
+        return self.points_soloist > self.points_defenders
@@ -0,0 +1,17 @@
+import os
+import tempfile
+import unittest
+
+
+class TempDirTestCase(unittest.TestCase):
+    """Runs every test in a new temporary working directory."""
+
+    def setUp(self) -> None:
+        # DQN writes tensorboard logs and checkpoints relative to the cwd
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+
+    def tearDown(self) -> None:
+        os.chdir(self.cwd)
+        self.directory.cleanup()
@@ -0,0 +1,151 @@
+import unittest
+
+import numpy as np
+import torch
+
+from skat.agents.rl.buffer import PrioritizedReplayBuffer, ReplayBuffer, SumTree
+
+
+class ReplayBufferTest(unittest.TestCase):
+    def push(self, buffer: ReplayBuffer, i: int, final: bool = False) -> None:
+        action = torch.zeros((1, 32), dtype=torch.long)
+        action[0][i % 32] = 1
+        buffer.push(
+            state=torch.full((1, 4), float(i)),
+            action=action,
+            next_state=None if final else torch.full((1, 4), i + 0.5),
+            reward=torch.tensor([[i]], dtype=torch.float64),
+        )
+
+    def test_push(self) -> None:
+        buffer = ReplayBuffer(buffer_size=8)
+        self.assertEqual(0, len(buffer))
+        self.push(buffer, 3)
+        self.push(buffer, 5, final=True)
+        self.assertEqual(2, len(buffer))
+        self.assertEqual((8, 4), tuple(buffer.states.shape))
+        batch = buffer.gather(torch.tensor([0, 1]))
+        torch.testing.assert_close(batch.state[:, 0], torch.tensor([3.0, 5.0]))
+        torch.testing.assert_close(batch.next_state[:, 0], torch.tensor([3.5, 0.0]))
+        self.assertEqual([3, 5], batch.action.tolist())
+        self.assertEqual([3.0, 5.0], batch.reward.tolist())
+        self.assertEqual([False, True], batch.done.tolist())
+
+    def test_ring(self) -> None:
+        buffer = ReplayBuffer(buffer_size=4, state_size=4)
+        for i in range(6):
+            self.push(buffer, i)
+        self.assertEqual(4, len(buffer))
+        self.assertEqual(2, buffer.cursor)
+        self.assertEqual([4.0, 5.0, 2.0, 3.0], buffer.states[:, 0].tolist())
+
+    def test_push_batch(self) -> None:
+        buffer = ReplayBuffer(buffer_size=4)
+        self.push(buffer, 0)
+        n = 5
+        rows = buffer.push_batch(
+            torch.arange(n, dtype=torch.float32).unsqueeze(1).repeat(1, 4),
+            torch.arange(n),
+            torch.zeros((n, 4)),
+            torch.ones(n),
+            torch.tensor([True, False, True, False, True]),
+        )
+        self.assertEqual([2, 3, 0, 1], rows.tolist())
+        self.assertEqual(4, len(buffer))
+        self.assertEqual(2, buffer.cursor)
+        self.assertEqual([3.0, 4.0, 1.0, 2.0], buffer.states[:, 0].tolist())
+        self.assertEqual([False, True, False, True], buffer.dones.tolist())
+
+    def test_sample(self) -> None:
+        buffer = ReplayBuffer(buffer_size=16, seed=1)
+        for i in range(10):
+            self.push(buffer, i)
+        batch = buffer.sample(10)
+        self.assertEqual(list(range(10)), sorted(batch.action.tolist()))
+        torch.testing.assert_close(batch.state[:, 0], batch.action.float())
+        self.assertEqual((10, 4), tuple(batch.next_state.shape))
+        with self.assertRaises(ValueError):
+            buffer.sample(11)
+        again = ReplayBuffer(buffer_size=16, seed=1)
+        for i in range(10):
+            self.push(again, i)
+        self.assertEqual(batch.action.tolist(), again.sample(10).action.tolist())
+
+    def test_sample_indices(self) -> None:
+        n = 64
+        buffer = ReplayBuffer(buffer_size=n, seed=3)
+        buffer.push_batch(
+            torch.zeros((n, 4)), torch.arange(n), torch.zeros((n, 4)), [0] * n, [1] * n
+        )
+        samples = [buffer.sample_indices(batch_size) for batch_size in (20, 40) * 50]
+        for rows in samples:
+            self.assertEqual(len(rows), len(rows.unique()))
+            self.assertTrue(0 <= rows.min() and rows.max() < n)
+        # every row is drawn
+        self.assertEqual(n, len(torch.cat(samples).unique()))
+
+
+class SumTreeTest(unittest.TestCase):
+    def test_update(self) -> None:
+        tree = SumTree(5)
+        self.assertEqual(8, tree.capacity)
+        tree.update([0, 1, 4], [1.0, 2.0, 3.0])
+        self.assertEqual(6.0, tree.total)
+        tree.update([1, 1], [0.5, 4.0])
+        self.assertEqual(8.0, tree.total)
+        self.assertEqual([1.0, 4.0, 0.0], tree[[0, 1, 2]].tolist())
+
+    def test_find(self) -> None:
+        tree = SumTree(4)
+        tree.update(np.arange(4), [1.0, 0.0, 2.0, 1.0])
+        values = np.array([0.0, 0.99, 1.0, 2.5, 3.0, 3.99])
+        self.assertEqual([0, 0, 2, 2, 3, 3], tree.find(values).tolist())
+        single = SumTree(1)
+        single.update([0], 2.0)
+        self.assertEqual([0], single.find(np.array([1.0])).tolist())
+
+
+class PrioritizedReplayBufferTest(unittest.TestCase):
+    def test_sample(self) -> None:
+        buffer = PrioritizedReplayBuffer(buffer_size=8, seed=2, beta=0.5)
+        for i in range(4):
+            ReplayBufferTest.push(self, buffer, i)  # type: ignore
+        batch = buffer.sample(4)
+        self.assertEqual([1.0] * 4, batch.weight.tolist())
+        self.assertAlmostEqual(0.5 + 1e-4, buffer.beta)
+
+        buffer.update_priorities(torch.arange(4), torch.tensor([0.0, 0.0, 0.0, 9.0]))
+        rows = torch.cat([buffer.sample(4).rows for _ in range(250)])
+        self.assertGreater(np.bincount(rows.numpy(), minlength=4)[3], 900)
+        # new transitions get the maximum priority
+        ReplayBufferTest.push(self, buffer, 4)  # type: ignore
+        self.assertAlmostEqual(buffer.tree[3], buffer.tree[4])
+
+    def test_overwritten_rows(self) -> None:
+        buffer = PrioritizedReplayBuffer(buffer_size=4, seed=0, alpha=1.0)
+        for i in range(4):
+            ReplayBufferTest.push(self, buffer, i)  # type: ignore
+        rows = torch.arange(4)
+        versions = buffer.row_versions(rows)
+        # a push during the gradient step replaces the transition in row 0
+        ReplayBufferTest.push(self, buffer, 4)  # type: ignore
+        buffer.update_priorities(rows, torch.zeros(4), versions)
+        self.assertEqual(1.0, buffer.tree[0])
+        self.assertEqual([1e-3] * 3, buffer.tree[[1, 2, 3]].tolist())
+        buffer.update_priorities(rows[:1], torch.zeros(1), versions[:1])
+        self.assertEqual(1.0, buffer.tree[0])
+
+    def test_weights(self) -> None:
+        buffer = PrioritizedReplayBuffer(buffer_size=4, seed=0, alpha=1.0, beta=1.0)
+        buffer.push_batch(
+            torch.zeros((2, 3)), torch.zeros(2), torch.zeros((2, 3)), [0, 1], [1, 1]
+        )
+        buffer.update_priorities(torch.tensor([0, 1]), torch.tensor([1.0, 3.0]))
+        # weights (n P) ** -1 are scaled to a maximum of 1 per batch
+        for _ in range(20):
+            batch = buffer.sample(2)
+            self.assertEqual(1.0, batch.weight.max().item())
+            if batch.rows.tolist() == [0, 1]:
+                self.assertAlmostEqual(1 / 3, batch.weight[1].item(), places=2)
+        with self.assertRaises(ValueError):
+            buffer.sample(3)
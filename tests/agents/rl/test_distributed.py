@@ -0,0 +1,42 @@
+import unittest
+
+import torch
+
+from skat.agents.rl.distributed import ActorLearner, SharedWeights, materialize
+from skat.agents.rl.dqn import DQN
+from skat.models import SuitSoloNet
+from tests.agents.rl import TempDirTestCase
+
+
+class SharedWeightsTest(unittest.TestCase):
+    def test_publish_load(self) -> None:
+        model = materialize(SuitSoloNet())
+        weights = SharedWeights(model)
+        copy = materialize(SuitSoloNet())
+        self.assertEqual(0, weights.load(copy))
+        for name, tensor in copy.state_dict().items():
+            torch.testing.assert_close(model.state_dict()[name], tensor)
+        with torch.no_grad():
+            for parameter in model.parameters():
+                parameter.add_(1.0)
+        self.assertEqual(0, weights.load(copy, version=0))
+        self.assertEqual(1, weights.publish(model))
+        self.assertEqual(1, weights.load(copy, version=0))
+        for name, tensor in copy.state_dict().items():
+            torch.testing.assert_close(model.state_dict()[name], tensor)
+
+
+class ActorLearnerTest(TempDirTestCase):
+    def test_train(self) -> None:
+        dqn = DQN(batch_size=32, target_update=100, model_path="checkpoint.pt")
+        learner = ActorLearner(
+            dqn, actors=2, publish_every=2, num_envs=4, chunk_size=8, seed=1
+        )
+        with learner:
+            learner.train(steps=5)
+            self.assertEqual(5, learner.steps)
+            self.assertEqual(2, learner.weights.version.value)
+            self.assertGreaterEqual(len(dqn.replay_buffer), 32)
+            self.assertEqual(len(dqn.replay_buffer), learner.transitions)
+            self.assertEqual(0, learner.transitions % 8)
+        self.assertEqual([], learner.processes)
@@ -0,0 +1,72 @@
+import threading
+
+import torch
+
+from skat.agents.rl.dqn import DQN
+from skat.observation import OBSERVATION_SIZE
+from tests.agents.rl import TempDirTestCase
+
+
+def push(dqn: DQN, n: int) -> None:
+    for i in range(n):
+        action = torch.zeros((1, 32), dtype=torch.long)
+        action[0][i % 32] = 1
+        dqn.push(
+            state=torch.rand((1, OBSERVATION_SIZE)),
+            action=action,
+            next_state=None if i % 10 == 9 else torch.rand((1, OBSERVATION_SIZE)),
+            reward=torch.tensor([[float(i % 10 == 9)]], dtype=torch.float64),
+        )
+
+
+class DQNTest(TempDirTestCase):
+    def test_update_ratio(self) -> None:
+        dqn = DQN(batch_size=8, model_path="checkpoint.pt", update_ratio=0.5)
+        push(dqn, 21)
+        self.assertEqual(10, dqn.episode)
+        self.assertEqual(0.5, dqn.pending)
+        self.assertIsNone(dqn.learner)
+
+    def test_asynchronous(self) -> None:
+        dqn = DQN(
+            batch_size=8,
+            model_path="checkpoint.pt",
+            update_ratio=2.0,
+            asynchronous=True,
+            max_pending=3,
+        )
+        self.assertTrue(dqn.learner.is_alive())
+        before = [p.detach().clone() for p in dqn.policy_net.parameters()]
+        for _ in range(10):
+            push(dqn, 3)
+            self.assertLessEqual(dqn.pending, 3)
+        dqn.close()
+        self.assertIsNone(dqn.learner)
+        self.assertEqual(60, dqn.episode + dqn.pending)
+        self.assertGreater(dqn.episode, 50)
+        after = list(dqn.policy_net.parameters())
+        self.assertFalse(all(torch.equal(a, b) for a, b in zip(before, after)))
+
+    def test_learner_error(self) -> None:
+        dqn = DQN(batch_size=8, model_path="checkpoint.pt", asynchronous=True)
+        dqn.gamma = None  # breaks the targets of the first gradient step
+        with self.assertRaises(Exception):
+            push(dqn, 100)
+        dqn.close()
+        self.assertIsInstance(dqn.learner_error, TypeError)
+
+    def test_net_lock(self) -> None:
+        dqn = DQN(batch_size=8, model_path="checkpoint.pt")
+        state = torch.rand((1, OBSERVATION_SIZE))
+        actions = []
+        greedy = threading.Thread(
+            target=lambda: actions.append(
+                dqn.select_action(state, torch.ones(32, dtype=bool), explore=False)
+            )
+        )
+        with dqn.net_lock:  # held by the learner during an optimizer step
+            greedy.start()
+            greedy.join(timeout=0.2)
+            self.assertTrue(greedy.is_alive())
+        greedy.join()
+        self.assertEqual(1, int(actions[0].sum()))
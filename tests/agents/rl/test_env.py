@@ -0,0 +1,54 @@
+import unittest
+
+import torch
+
+from skat.agents.rl.env import SkatVectorEnv
+
+
+def first_legal(masks: torch.Tensor) -> torch.Tensor:
+    return masks.int().argmax(dim=1)
+
+
+class SkatVectorEnvTest(unittest.TestCase):
+    def test_in_process(self) -> None:
+        env = SkatVectorEnv(num_envs=4, seed=1)
+        observations, masks = env.reset()
+        self.assertEqual(torch.Size([4, 171]), observations.size())
+        self.assertEqual(torch.Size([4, 32]), masks.size())
+        dones = 0
+        for _ in range(25):
+            observations, masks, rewards, done, info = env.step(first_legal(masks))
+            self.assertEqual(torch.Size([4]), rewards.size())
+            self.assertTrue(masks.any(dim=1).all())  # auto-reset
+            for k in range(4):
+                if done[k]:
+                    self.assertIsNotNone(info["final_observation"][k])
+            dones += int(done.sum())
+        self.assertEqual(8, dones)  # 10 turns per round, two rounds per env
+
+    def test_invalid_action(self) -> None:
+        env = SkatVectorEnv(num_envs=1, seed=1)
+        _, masks = env.reset()
+        with self.assertRaises(ValueError):
+            env.step([int((~masks[0]).int().argmax())])
+
+    def test_worker_error(self) -> None:
+        with SkatVectorEnv(num_envs=2, workers=2, seed=1) as env:
+            _, masks = env.reset()
+            actions = [int((~masks[0]).int().argmax()), int(first_legal(masks)[1])]
+            with self.assertRaisesRegex(Exception, "ValueError"):
+                env.step(actions)
+            # the workers keep serving
+            observations, _ = env.reset()
+            self.assertEqual(torch.Size([2, 171]), observations.size())
+
+    def test_workers(self) -> None:
+        local = SkatVectorEnv(num_envs=3, seed=2)
+        with SkatVectorEnv(num_envs=3, workers=2, seed=2) as remote:
+            results = [local.reset(), remote.reset()]
+            self.assertTrue(torch.equal(results[0][0], results[1][0]))
+            for _ in range(12):
+                actions = first_legal(results[0][1])
+                results = [local.step(actions), remote.step(actions)]
+                self.assertTrue(torch.equal(results[0][0], results[1][0]))
+                self.assertTrue(torch.equal(results[0][2], results[1][2]))
@@ -0,0 +1,132 @@
+import unittest
+
+import numpy as np
+
+from skat.agents.ismcts import ISMCTSAgent, NetPolicy, observation
+from skat.agents.random import RandomAgent
+from skat.bitboard import popcount
+from skat.game import Round
+from skat.games.grand import Grand
+from skat.games.null import Null
+from skat.games.suit import SuitGame
+from skat.models import SuitSoloNet
+from skat.search import SearchState
+
+
+def new_round(game, agents, seed=5) -> Round:
+    r = Round(
+        dealer=0,
+        skip_bidding=True,
+        solo_player_id=1,
+        declare_game=game,
+        hand_game=True,
+        agents=agents,
+        start=False,
+        seed=seed,
+    )
+    r.prepare()
+    return r
+
+
+def play_round(test: unittest.TestCase, r: Round) -> None:
+    while not r.is_finished:
+        player = r.player[r.next_player]
+        valid, hand = player.valid_mask(r.game.trick), player.hand.mask
+        r.step()
+        played = hand & ~player.hand.mask
+        test.assertEqual(1, popcount(played))
+        test.assertEqual(played, played & valid)
+    test.assertEqual(120, r.points_soloist + r.points_defenders)
+
+
+class ISMCTSAgentTest(unittest.TestCase):
+    def test_rollout_policies(self) -> None:
+        for game, rollout in (
+            (SuitGame(0), "random"),
+            (Grand(), "heuristic"),
+            (Null(), "heuristic"),
+        ):
+            agents = [
+                ISMCTSAgent(iterations=50, rollout=rollout, rng=i) for i in range(3)
+            ]
+            play_round(self, new_round(game, agents))
+        with self.assertRaises(ValueError):
+            ISMCTSAgent(rollout="unknown")
+
+    def test_net_policy(self) -> None:
+        policy = NetPolicy(SuitSoloNet())
+        agents = [RandomAgent(0), ISMCTSAgent(iterations=5, rollout=policy, rng=1)]
+        agents.append(RandomAgent(2))
+        play_round(self, new_round(SuitGame(1), agents))
+
+    def test_observation(self) -> None:
+        for game in (SuitGame(2), Grand(), Null()):
+            r = new_round(game, [RandomAgent(i) for i in range(3)])
+            while not r.is_finished:
+                played = [0, 0, 0]
+                for record in r.trick_history:
+                    for i, card in enumerate(record.cards):
+                        played[(record.leader + i) % 3] |= 1 << card
+                state = SearchState(
+                    game.type_id,
+                    r.solo_player_id,
+                    [player.hand.mask for player in r.player],
+                    r.front_hand,
+                    [turn.card.id for turn in r.game.trick.buffer],
+                    r.points_soloist,
+                    r.points_defenders,
+                    played,
+                )
+                for seat in range(3):
+                    np.testing.assert_array_equal(
+                        r.get_state(seat), observation(state, seat)
+                    )
+                r.step()
+
+    def test_budget(self) -> None:
+        agents = [RandomAgent(0), ISMCTSAgent(iterations=40, time_budget=None)]
+        agents.append(RandomAgent(2))
+        r = new_round(SuitGame(3), agents)
+        while r.next_player != 1:
+            r.step()
+        r.step()
+        self.assertEqual(40, agents[1].searched)
+        self.assertEqual(40, agents[1].root.visits)
+        agents[1] = ISMCTSAgent(iterations=10**9, time_budget=0.01)
+        r = new_round(SuitGame(3), agents)
+        while r.next_player != 1:
+            r.step()
+        r.step()
+        self.assertLess(agents[1].searched, 10**9)
+
+    def test_reuse(self) -> None:
+        agent = ISMCTSAgent(iterations=300, time_budget=None, rng=3)
+        agents = [RandomAgent(0), agent, RandomAgent(2)]
+        r = new_round(SuitGame(0), agents)
+        reused = 0
+        while not r.is_finished:
+            if r.next_player != 1:
+                r.step()
+                continue
+            node, visits = agent.root, 0
+            cards = [c for record in r.trick_history for c in record.cards]
+            cards += [turn.card.id for turn in r.game.trick.buffer]
+            known = len(agent._root_cards)
+            for card in cards[known:]:
+                node = node.children.get(card) if node else None
+            if node is not None:
+                visits = node.visits
+            r.step()
+            if node is not None:
+                self.assertIs(node, agent.root)
+                reused += 1
+            if len(agent.root.children) > 1:
+                self.assertEqual(visits + 300, agent.root.visits)
+        self.assertGreater(reused, 0)
+
+        agent.reuse = False
+        r = new_round(SuitGame(0), agents, seed=6)
+        while r.next_player != 1:
+            r.step()
+        r.step()
+        self.assertEqual(300, agent.root.visits)
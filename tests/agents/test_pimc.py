@@ -0,0 +1,102 @@
+import unittest
+
+from skat.agents.pimc import PIMCAgent
+from skat.bitboard import FULL_MASK, popcount
+from skat.game import Round, Tournament
+from skat.games.grand import Grand
+from skat.games.null import Null
+from skat.games.suit import SuitGame
+
+
+def new_round(game, agents, seed=5) -> Round:
+    r = Round(
+        dealer=0,
+        skip_bidding=True,
+        solo_player_id=1,
+        declare_game=game,
+        hand_game=True,
+        agents=agents,
+        start=False,
+        seed=seed,
+    )
+    r.prepare()
+    return r
+
+
+class PIMCAgentTest(unittest.TestCase):
+    def test_worlds(self) -> None:
+        agents = [PIMCAgent(worlds=4, rng=i) for i in range(3)]
+        r = new_round(SuitGame(2), agents)
+        for _ in range(14):
+            r.step()
+        agent = agents[r.next_player]
+        position, worlds = agent.sample_worlds(20)
+        self.assertEqual(r.front_hand, position.leader)
+        self.assertEqual(
+            r.points_soloist - sum(c.value for c in r.skat), position.points
+        )
+        played = r.trick_history.mask | r.game.trick.mask
+        _, known, _, _, allowed = agent.observe()
+        for hands, skat in worlds:
+            self.assertEqual(agent.state.hand.mask, hands[r.next_player])
+            self.assertEqual(FULL_MASK & ~played, hands[0] | hands[1] | hands[2] | skat)
+            for seat in range(3):
+                self.assertEqual(len(r.player[seat].hand), popcount(hands[seat]))
+                self.assertEqual(
+                    hands[seat], hands[seat] & (allowed[seat] | known[seat])
+                )
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            PIMCAgent(worlds=0)
+        with self.assertRaises(ValueError):
+            PIMCAgent(evaluator="oracle")
+
+    def test_plays_rounds(self) -> None:
+        for game, evaluator in (
+            (SuitGame(0), "solver"),
+            (Grand(), "rollout"),
+            (Null(), "solver"),
+        ):
+            agents = [PIMCAgent(worlds=4, evaluator=evaluator, rng=i) for i in range(3)]
+            r = new_round(game, agents)
+            while not r.is_finished:
+                player = r.player[r.next_player]
+                valid, hand = player.valid_mask(r.game.trick), player.hand.mask
+                r.step()
+                played = hand & ~player.hand.mask
+                self.assertEqual(1, popcount(played))
+                self.assertEqual(played, played & valid)
+            self.assertEqual(120, r.points_soloist + r.points_defenders)
+
+    def test_time_budget(self) -> None:
+        agents = [PIMCAgent(worlds=1000, time_budget=0.0, rng=i) for i in range(3)]
+        r = new_round(SuitGame(1), agents)
+        leader = r.front_hand
+        r.step()
+        self.assertEqual(1, agents[leader].evaluated)
+
+    def test_workers(self) -> None:
+        agents = [
+            PIMCAgent(worlds=4, time_budget=None, workers=2, rng=i) for i in range(3)
+        ]
+        r = new_round(SuitGame(3), agents)
+        leader = r.front_hand
+        try:
+            for _ in range(3):
+                r.step()
+        finally:
+            for agent in agents:
+                agent.close()
+        self.assertEqual(4, agents[leader].evaluated)
+
+    def test_tournament_closes_pools(self) -> None:
+        agents = [
+            PIMCAgent(worlds=2, time_budget=None, workers=2, rng=i) for i in range(3)
+        ]
+        tournament = Tournament(
+            rounds=1, agents=agents, seed=1, declare_game=SuitGame(0)
+        )
+        tournament.start()
+        self.assertEqual(1, len(tournament.results))
+        self.assertTrue(all(agent._pool is None for agent in agents))
@@ -1,10 +1,18 @@
 import unittest
 
-from skat.card import Card
-from skat.games.suit import SuitGame
+from skat.bitboard import popcount
+from skat.card import CARDS, Card
+from skat.games.suit import TRUMP_FLAGS, TRUMP_MASKS, TRUMP_SETS, SuitGame
 
 
 class SuitGameTest(unittest.TestCase):
+    def test_trump_tables(self) -> None:
+        for i in range(4):
+            self.assertEqual(11, popcount(TRUMP_MASKS[i]))
+            for card in CARDS:
+                self.assertEqual(card in TRUMP_SETS[i], TRUMP_FLAGS[i][card.id])
+            self.assertIs(SuitGame.trump_cards(i), SuitGame.trump_cards(i))
+
     def test_find_all_trump_cards(self) -> None:
         for i in range(4):
             suit_game = SuitGame(i)
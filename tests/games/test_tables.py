@@ -0,0 +1,46 @@
+import itertools
+import os
+import tempfile
+import unittest
+
+from skat.card import CARDS
+from skat.games import tables
+from skat.games.grand import Grand
+from skat.games.null import Null
+from skat.games.suit import SuitGame
+
+
+class TablesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.games = [SuitGame(0), SuitGame(1), SuitGame(2), SuitGame(3)]
+        self.games += [Grand(), Null()]
+
+    def test_type_id(self) -> None:
+        self.assertEqual(list(range(6)), [g.type_id for g in self.games])
+
+    def test_trick_winner(self) -> None:
+        for game in self.games:
+            for cards in itertools.permutations(CARDS[::3], 3):
+                game.new_trick()
+                for i, card in enumerate(cards):
+                    game.trick.append(i, card)
+                ids = [card.id for card in cards]
+                self.assertEqual(
+                    game.trick.winner, tables.trick_winner(game.type_id, *ids)
+                )
+
+    def test_winner_table(self) -> None:
+        tables._winner_tables.clear()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            table = tables.winner_table(tables.GRAND, cache_dir=cache_dir)
+            path = os.path.join(cache_dir, f"winner_table_{tables.GRAND}.npy")
+            self.assertTrue(os.path.exists(path))
+            tables._winner_tables.clear()
+            cached = tables.winner_table(tables.GRAND, cache_dir=cache_dir)
+            self.assertTrue((table == cached).all())
+        self.assertEqual((32, 32, 32), table.shape)
+        for a, b, c in itertools.permutations(range(0, 32, 5), 3):
+            self.assertEqual(tables.trick_winner(tables.GRAND, a, b, c), table[a, b, c])
+        for type_id in range(tables.GAME_TYPES):
+            table = tables.winner_table(type_id, cache_dir=None)
+            self.assertEqual(tables.trick_winner(type_id, 0, 3, 31), table[0, 3, 31])
@@ -0,0 +1,106 @@
+import random
+import unittest
+
+from skat.belief import SKAT, BeliefState
+from skat.bitboard import FULL_MASK, to_mask
+from skat.card import CARDS
+from skat.game import Round
+from skat.games.grand import Grand
+from skat.games.null import Null
+from skat.games.suit import SuitGame
+from skat.sampling import multinomial
+
+
+def new_round(game, seed=3, hand_game=True) -> Round:
+    r = Round(
+        dealer=2,
+        skip_bidding=True,
+        solo_player_id=0,
+        declare_game=game,
+        hand_game=hand_game,
+        start=False,
+        seed=seed,
+    )
+    r.prepare()
+    return r
+
+
+class BeliefStateTest(unittest.TestCase):
+    def test_incremental_matches_rebuild(self) -> None:
+        for game in (SuitGame(1), Grand(), Null()):
+            r = new_round(game)
+            r.belief.out()
+            while not r.is_finished:
+                r.step()
+                self.assertIsNotNone(r.belief.key)  # no rebuild needed
+                rebuilt = BeliefState(r)
+                rebuilt.sync()
+                self.assertEqual(rebuilt.played, r.belief.played)
+                self.assertEqual(rebuilt.played_by, r.belief.played_by)
+                self.assertEqual(rebuilt.voids, r.belief.voids)
+
+    def test_consistent_with_deal(self) -> None:
+        r = new_round(SuitGame(3), seed=8, hand_game=False)
+        while not r.is_finished:
+            for seat in range(3):
+                for slot in range(3):
+                    hand = r.player[slot].hand.mask
+                    self.assertEqual(0, hand & r.belief.voids[slot])
+                    self.assertEqual(hand, hand & r.belief.possible(slot, seat))
+                skat = to_mask(r.skat)
+                self.assertEqual(skat, skat & r.belief.possible(SKAT, seat))
+                for slot, player in enumerate(r.player):
+                    for card in player.hand:
+                        self.assertIn(slot, r.belief.holders(card, seat))
+                self.assertGreater(r.belief.count_deals(seat), 0)
+            r.step()
+        # the soloist picked up the skat and knows it
+        self.assertEqual(to_mask(r.skat), r.belief.possible(SKAT, 0))
+
+    def test_queries(self) -> None:
+        r = new_round(SuitGame(0))
+        belief = r.belief
+        own = r.player[1].hand.mask
+        self.assertEqual(FULL_MASK & ~own, belief.out(1))
+        self.assertEqual(FULL_MASK, belief.out())
+        self.assertEqual([1], belief.holders(r.player[1].hand[0], 1))
+        self.assertEqual([0, 2, SKAT], belief.holders(r.player[0].hand[0], 1))
+        self.assertEqual(multinomial([10, 0, 10, 2]), belief.count_deals(1))
+        self.assertEqual(multinomial([10, 10, 10, 2]), belief.count_deals())
+
+    def test_apply_undo(self) -> None:
+        r = new_round(Grand(), seed=4)
+        rng = random.Random(1)
+        for _ in range(12):
+            player = r.player[r.next_player]
+            r.apply(rng.choice(sorted(player.valid_moves(r.game.trick))))
+        played = r.trick_history.mask | r.game.trick.mask
+        self.assertEqual(FULL_MASK & ~played, r.belief.out())
+        rebuilt = BeliefState(r)
+        rebuilt.sync()
+        self.assertEqual(rebuilt.voids, r.belief.voids)
+        for _ in range(12):
+            r.undo()
+        self.assertEqual(FULL_MASK, r.belief.out())
+        self.assertEqual([0, 0, 0], r.belief.voids)
+        card = CARDS[0]
+        self.assertEqual([0, 1, 2, SKAT], r.belief.holders(card))
+
+    def test_transposed_moves(self) -> None:
+        # the same nine cards in other tricks, with other voids
+        r = new_round(Grand(), seed=1)
+        voids = list()
+        for line in (
+            [5, 1, 0, 7, 22, 6, 21, 19, 20],
+            [7, 1, 0, 21, 22, 20, 19, 6, 5],
+        ):
+            for card_id in line:
+                r.apply(CARDS[card_id])
+            r.belief.out()
+            rebuilt = BeliefState(r)
+            rebuilt.sync()
+            self.assertEqual(rebuilt.voids, r.belief.voids)
+            voids.append(r.belief.voids)
+            for _ in line:
+                r.undo()
+        self.assertNotEqual(voids[0], voids[1])
@@ -0,0 +1,47 @@
+import unittest
+
+from skat.bitboard import (
+    FULL_MASK,
+    JACK_MASK,
+    SUIT_MASKS,
+    card_ids,
+    from_mask,
+    legal_moves,
+    popcount,
+    to_mask,
+)
+from skat.card import CARDS, Card
+from skat.games.grand import GrandTrick
+from skat.games.null import NullTrick
+from skat.games.suit import SuitGameTrick
+
+
+class BitboardTest(unittest.TestCase):
+    def test_masks(self) -> None:
+        self.assertEqual(FULL_MASK, to_mask(CARDS))
+        self.assertEqual(4, popcount(JACK_MASK))
+        self.assertEqual(FULL_MASK, sum(SUIT_MASKS))
+        self.assertEqual([Card(1, i) for i in range(8)], from_mask(SUIT_MASKS[1]))
+
+    def test_round_trip(self) -> None:
+        cards = [Card(0, 0), Card(2, 3), Card(3, 7)]
+        mask = to_mask(cards)
+        self.assertEqual(3, popcount(mask))
+        self.assertEqual(cards, from_mask(mask))
+        self.assertEqual((0, 19, 31), card_ids(mask))
+
+    def test_legal_moves(self) -> None:
+        hand = to_mask([Card(0, 0), Card(1, 0)])
+        self.assertEqual(to_mask([Card(1, 0)]), legal_moves(hand, SUIT_MASKS[1]))
+        self.assertEqual(hand, legal_moves(hand, SUIT_MASKS[2]))
+        self.assertEqual(hand, legal_moves(hand, 0))
+
+    def test_forced_mask(self) -> None:
+        tricks = [lambda s=s: SuitGameTrick(s) for s in range(4)]
+        tricks += [GrandTrick, NullTrick]
+        for new_trick in tricks:
+            self.assertEqual(0, new_trick().forced_mask)
+            for card in CARDS:
+                trick = new_trick()
+                trick.append(0, card)
+                self.assertEqual(to_mask(trick.forced_cards), trick.forced_mask)
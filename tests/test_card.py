@@ -1,6 +1,8 @@
+import copy
+import pickle
 import unittest
 
-from skat.card import Card
+from skat.card import CARDS, Card
 
 
 class CardTest(unittest.TestCase):
@@ -43,3 +45,27 @@ class CardTest(unittest.TestCase):
         )
         for card, expected_index in test_set:
             self.assertEqual(expected_index, card.np_index)
+
+    def test_interned(self) -> None:
+        self.assertEqual(32, len(CARDS))
+        self.assertIs(self.card_1, self.card_2)
+        self.assertIs(self.card_1, copy.deepcopy(self.card_1))
+        self.assertIs(self.card_1, pickle.loads(pickle.dumps(self.card_1)))
+        for i, card in enumerate(CARDS):
+            self.assertEqual(i, card.id)
+            self.assertIs(card, Card(card.suit_index, card.rank_index))
+
+    def test_out_of_range(self) -> None:
+        for suit, rank in ((0, 8), (3, -1), (4, 0), (-1, 7)):
+            with self.assertRaises(ValueError):
+                Card(suit, rank)
+
+    def test_immutable(self) -> None:
+        with self.assertRaises(AttributeError):
+            self.card_1.value = 42
+        with self.assertRaises(AttributeError):
+            self.card_1.foo = 42
+
+    def test_value(self) -> None:
+        self.assertEqual(120, sum(card.value for card in CARDS))
+        self.assertEqual(11, Card(2, 7).value)
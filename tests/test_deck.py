@@ -1,7 +1,12 @@
+import random
 import unittest
 
-from skat.card import Card
+import numpy as np
+
+from skat.card import CARDS, Card
 from skat.deck import Deck
+from skat.game import DEAL_ORDER
+from skat.hand import Hand
 
 
 class DeckTest(unittest.TestCase):
@@ -48,3 +53,56 @@ class DeckTest(unittest.TestCase):
         deck = Deck.factory(p2_hand=p2)
         self.assertEqual(Card(3, 0), deck[20])
         self.assertEqual(Card(3, 2), deck[22])
+
+    def test_rng_streams(self) -> None:
+        state = random.getstate()
+        decks = [Deck(rng=random.Random(7)), Deck(rng=random.Random(7)), Deck(7)]
+        decks.append(Deck(rng=np.random.default_rng(7)))
+        for deck in decks:
+            deck.initialize_cards()
+            deck.shuffle()
+        self.assertEqual(decks[0], decks[1])
+        self.assertEqual(decks[0], decks[2])
+        self.assertNotEqual(decks[0], decks[3])
+        Deck.factory(seed=3)
+        self.assertEqual(state, random.getstate())
+
+    def test_batch(self) -> None:
+        decks = Deck.batch(100, seed=1)
+        self.assertEqual((100, 32), decks.shape)
+        self.assertTrue((np.sort(decks, axis=1) == np.arange(32)).all())
+        self.assertTrue((decks == Deck.batch(100, seed=1)).all())
+
+    def test_batch_fixed(self) -> None:
+        p2 = [Card(3, x) for x in range(7)]
+        skat = [Card(0, 0), Card(1, 1)]
+        decks = Deck.batch(50, p2_hand=p2, skat=skat, seed=np.random.default_rng(2))
+        self.assertTrue((decks[:, 20:27] == [c.id for c in p2]).all())
+        self.assertTrue((decks[:, 30:] == [c.id for c in skat]).all())
+        deck = Deck.from_ids(decks[0])
+        self.assertEqual(skat, deck.to_list()[3])
+        self.assertTrue((deck.ids == decks[0]).all())
+        masks = Deck.batch_masks(decks)
+        self.assertEqual((50, 4), masks.shape)
+        self.assertEqual(1 | 1 << 9, masks[0, 3])
+        with self.assertRaises(ValueError):
+            Deck.batch(1, p0_hand=skat, skat=skat)
+        with self.assertRaises(ValueError):
+            Deck.batch(2, p0_hand=CARDS[:11])
+        with self.assertRaises(ValueError):
+            Deck.batch(2, skat=CARDS[:3])
+        decks = Deck.batch(5, p2_hand=np.array(p2), skat=np.array([]))
+        self.assertTrue((decks[:, 20:27] == [c.id for c in p2]).all())
+
+    def test_batch_masks_to_hands(self) -> None:
+        decks = Deck.batch(20, seed=4)
+        masks = Deck.batch_masks(decks)
+        for deck, row in zip(decks, masks):
+            cards = Deck.from_ids(deck).to_list()
+            for slot, mask in zip(cards, row):
+                hand = Hand.from_mask(mask)
+                self.assertEqual(sorted(c.id for c in slot), [c.id for c in hand])
+                self.assertEqual(int(mask), hand.mask)
+                ordered = Hand.from_mask(mask, order=DEAL_ORDER)
+                hand.sort(order=DEAL_ORDER)
+                self.assertEqual(list(hand), list(ordered))
@@ -108,3 +108,26 @@ class GameTest(unittest.TestCase):
             self.assertAlmostEqual(
                 0.0333332, self.round.cumulative_reward((soloist_id + 1) % 3), places=3
             )
+
+    def test_reward_goals(self) -> None:
+        goals = {"points": 0.0, "win": 1.0, "schneider": 0.0, "schwarz": 0.0}
+        custom_round = Round(
+            skip_bidding=True,
+            solo_player_id=0,
+            declare_game=SuitGame(suit=3),
+            start=False,
+            reward_goals=goals,
+        )
+        with patch(
+            "skat.game.Round.points_soloist",
+            new_callable=PropertyMock,
+            return_value=61,
+        ):
+            self.assertAlmostEqual(0.1, custom_round.cumulative_reward(0))
+            self.assertAlmostEqual(-0.1, custom_round.cumulative_reward(1))
+
+    def test_running_points(self) -> None:
+        self.round.start()
+        for player in self.round.player:
+            self.assertEqual(player.trick_stack.value, player.trick_stack_value)
+        self.assertEqual(120, self.round.points_soloist + self.round.points_defenders)
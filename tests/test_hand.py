@@ -41,6 +41,17 @@ class HandTest(unittest.TestCase):
     def test_insert(self) -> None:
         pass
 
+    def test_mask(self) -> None:
+        hand = Hand([Card(0, 0), Card(3, 1)])
+        self.assertEqual(0b1 | 1 << 25, hand.mask)
+        hand.append(Card(3, 7))
+        self.assertEqual(self.filled_hand.mask, hand.mask)
+        hand.remove(Card(0, 0))
+        self.assertNotIn(Card(0, 0), hand)
+        hand[0] = Card(1, 1)
+        self.assertEqual(1 << 9 | 1 << 31, hand.mask)
+        self.assertEqual(hand, Hand.from_mask(hand.mask))
+
     def test_value(self) -> None:
         hand_value = (
             (Hand([Card(0, 0), Card(0, 1), Card(0, 2)]), 0),
@@ -139,3 +150,13 @@ class HandTest(unittest.TestCase):
             [Card(3, 3), Card(0, 3), Card(1, 2), Card(3, 4), Card(2, 2)]
         )
         self.assertEqual(expected_hand, initial_hand)
+
+    def test_sort_keys(self) -> None:
+        order = HandOrder("♦♥♠♣", "789QKXA", "♦♥♠♣", "J")
+        self.assertIs(order.sort_keys, HandOrder(*order).sort_keys)
+        self.assertEqual(32, len(set(order.sort_keys)))
+        self.assertEqual(Card(3, 3), order.sequence[0])
+        self.assertEqual(Card(0, 0), order.sequence[-1])
+        hand = Hand([Card(0, 0), Card(1, 3), Card(2, 7)])
+        hand.sort(order)
+        self.assertEqual(hand, Hand.from_mask(hand.mask, order))
@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+
+from skat.game import Round
+from skat.games.grand import Grand
+from skat.games.null import Null
+from skat.games.suit import SuitGame
+from skat.observation import OBSERVATION_SIZE, observe_batch
+
+
+def reference_state(r: Round, player_id: int) -> np.ndarray:
+    """The observation built from scratch, like Round.get_state used to do."""
+    played = [r.trick_history.to_numpy(player_id=i) for i in range(3)]
+    position = np.zeros(3)
+    position[(player_id - r.front_hand) % 3] = 1
+    return np.concatenate(
+        (
+            r.player[player_id].hand.as_vector,
+            r.game.to_numpy(),
+            [r.points_soloist / 120.0, r.points_defenders / 120.0],
+            *played,
+            [r.game.trick.value / 120.0],
+            r.game.trick.as_vector,
+            position,
+        ),
+        dtype=np.float32,
+    )
+
+
+def new_round(game, seed=3) -> Round:
+    r = Round(
+        dealer=1,
+        skip_bidding=True,
+        solo_player_id=2,
+        declare_game=game,
+        hand_game=True,
+        start=False,
+        seed=seed,
+    )
+    r.prepare()
+    return r
+
+
+class ObservationBuilderTest(unittest.TestCase):
+    def test_incremental_matches_rebuild(self) -> None:
+        for game in (SuitGame(1), Grand(), Null()):
+            r = new_round(game)
+            while not r.is_finished:
+                for seat in range(3):
+                    expected = reference_state(r, seat)
+                    np.testing.assert_array_equal(expected, r.get_state(seat))
+                r.step()
+            for seat in range(3):
+                np.testing.assert_array_equal(
+                    reference_state(r, seat), r.get_state(seat)
+                )
+
+    def test_size(self) -> None:
+        self.assertEqual(OBSERVATION_SIZE, new_round(SuitGame(0)).get_state(0).size)
+        self.assertEqual(OBSERVATION_SIZE - 4, new_round(Null()).get_state(0).size)
+
+    def test_out(self) -> None:
+        r = new_round(SuitGame(2))
+        out = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+        self.assertIs(out, r.get_state(1, out=out))
+        state = r.get_state(1)
+        state[:] = -1  # a copy, the builder is not affected
+        np.testing.assert_array_equal(out, r.get_state(1))
+
+    def test_external_change(self) -> None:
+        r = new_round(SuitGame(2))
+        r.get_state(0)
+        card = r.player[0].hand[0]
+        r.player[0].hand.remove(card)
+        np.testing.assert_array_equal(reference_state(r, 0), r.get_state(0))
+
+    def test_batch(self) -> None:
+        rounds = [new_round(SuitGame(i), seed=i) for i in range(4)]
+        for r in rounds[:2]:
+            r.step()
+        seats = [0, 1, 2, 0]
+        batch = observe_batch(rounds, seats)
+        self.assertEqual((4, OBSERVATION_SIZE), batch.shape)
+        for k, (r, seat) in enumerate(zip(rounds, seats)):
+            np.testing.assert_array_equal(reference_state(r, seat), batch[k])
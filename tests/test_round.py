@@ -1,7 +1,20 @@
+import random
 import unittest
 
 from skat.agents.random import RandomAgent
-from skat.game import Round
+from skat.card import CARDS
+from skat.game import ParallelTournament, Round, Tournament
+from skat.games.suit import SuitGame
+
+
+class PickupCountingAgent(RandomAgent):
+    def __init__(self, rng=None) -> None:
+        super().__init__(rng)
+        self.pickups = 0
+
+    def pickup_skat(self, state) -> bool:
+        self.pickups += 1
+        return self.pickups % 2 == 1
 
 
 class RoundTest(unittest.TestCase):
@@ -20,3 +33,167 @@ class RoundTest(unittest.TestCase):
             self.simple_round.points_soloist + self.simple_round.points_defenders
         )
         self.assertEqual(120, points_dealt)
+
+    def test_seeded_tournament(self):
+        scores = list()
+        for _ in range(2):
+            agents = [RandomAgent(), RandomAgent(), RandomAgent()]
+            tournament = Tournament(rounds=8, agents=agents, seed=42)
+            tournament.start()
+            scores.append(tournament.scores)
+        self.assertEqual(scores[0], scores[1])
+
+    def test_tournament_agent_rngs(self):
+        rngs = [random.Random(i) for i in range(3)]
+        agents = [RandomAgent(rng) for rng in rngs]
+        Tournament(rounds=2, agents=agents, seed=1, seed_agents=False).start()
+        self.assertTrue(all(a.rng is rng for a, rng in zip(agents, rngs)))
+        Tournament(rounds=2, agents=agents, seed=1).start()
+        self.assertFalse(any(a.rng is rng for a, rng in zip(agents, rngs)))
+
+    def test_parallel_tournament(self):
+        agents = [RandomAgent(), RandomAgent(), RandomAgent()]
+        serial = Tournament(rounds=12, agents=agents, seed=7)
+        serial.start()
+        parallel = ParallelTournament(workers=2, chunk_size=5, rounds=12, seed=7)
+        parallel.start()
+        self.assertEqual(serial.results, parallel.results)
+        self.assertEqual(serial.scores, parallel.scores)
+        self.assertEqual(serial.seat_scores, parallel.seat_scores)
+
+    def test_pooled_tournament(self):
+        results = list()
+        for pooled in (False, True):
+            agents = [RandomAgent(), RandomAgent(), RandomAgent()]
+            tournament = Tournament(rounds=9, agents=agents, seed=5, pooled=pooled)
+            tournament.start()
+            results.append(tournament.results)
+        self.assertEqual(results[0], results[1])
+
+    def test_reset(self):
+        r = Round(
+            skip_bidding=True,
+            solo_player_id=0,
+            declare_game=SuitGame(0),
+            hand_game=True,
+            start=False,
+            seed=11,
+        )
+        r.start()
+        players, history = list(r.player), r.trick_history
+        r.reset(soloist=1, game=SuitGame(2), dealer=2, rng=11)
+        self.assertEqual(0, len(r.trick_history))
+        self.assertEqual(0, r.points_soloist + r.points_defenders)
+        self.assertTrue(all(len(p.hand) == 0 for p in r.player))
+        self.assertEqual(1, r.solo_player_id)
+        self.assertEqual(0, r.front_hand)
+        r.start()
+        self.assertEqual(10, len(r.trick_history))
+        self.assertEqual(120, r.points_soloist + r.points_defenders)
+        self.assertEqual(players, r.player)
+        self.assertIs(history, r.trick_history)
+
+    def test_reset_skat_pickup(self):
+        agents = [PickupCountingAgent(i) for i in range(3)]
+        r = Round(
+            skip_bidding=True,
+            solo_player_id=0,
+            declare_game=SuitGame(0),
+            agents=agents,
+            start=False,
+            seed=3,
+        )
+        for i, hand_game in enumerate((False, True, False)):
+            if i:
+                r.reset(game=SuitGame(1))
+                self.assertIsNone(r.hand_game)
+                self.assertEqual(0, r.solo_player_id)
+            r.start()
+            self.assertEqual(i + 1, agents[0].pickups)
+            self.assertEqual(hand_game, r.hand_game)
+            self.assertEqual(120, r.points_soloist + r.points_defenders)
+        self.assertEqual(0, agents[1].pickups + agents[2].pickups)
+
+    def test_default_deck_not_shared(self):
+        self.assertIsNot(Round(start=False).deck, Round(start=False).deck)
+
+    def test_snapshot_restore(self):
+        r = Round(
+            skip_bidding=True,
+            solo_player_id=1,
+            declare_game=SuitGame(3),
+            hand_game=True,
+            start=False,
+            seed=4,
+        )
+        r.prepare()
+        for _ in range(13):
+            r.step()
+        snapshot = r.snapshot()
+        state = r.get_state(0)
+        stacks = [list(p.trick_stack) for p in r.player]
+        while not r.is_finished:
+            r.step()
+        r.restore(snapshot)
+        self.assertEqual(snapshot, r.snapshot())
+        self.assertEqual(stacks, [list(p.trick_stack) for p in r.player])
+        self.assertEqual(13 % 3, len(r.game.trick))
+        self.assertTrue((state == r.get_state(0)).all())
+
+    def test_clone(self):
+        r = Round(
+            skip_bidding=True,
+            solo_player_id=0,
+            declare_game=SuitGame(1),
+            hand_game=True,
+            start=False,
+            seed=8,
+        )
+        r.prepare()
+        for _ in range(7):
+            r.step()
+        state = r.rng.getstate()
+        clone = r.clone()
+        self.assertEqual(state, r.rng.getstate())  # the source stream is untouched
+        self.assertEqual(r.snapshot(), clone.snapshot())
+        self.assertIsNot(r.game, clone.game)
+        self.assertIsNot(r.player[0].hand, clone.player[0].hand)
+        # every clone gets its own stream
+        self.assertNotEqual(clone.rng.getstate(), r.clone().rng.getstate())
+        while not clone.is_finished:
+            clone.step()
+        self.assertEqual(120, clone.points_soloist + clone.points_defenders)
+        self.assertEqual(30 - 7, sum(len(p.hand) for p in r.player))
+
+    def test_apply_undo(self):
+        r = Round(
+            skip_bidding=True,
+            solo_player_id=2,
+            declare_game=SuitGame(0),
+            hand_game=True,
+            start=False,
+            seed=6,
+        )
+        r.prepare()
+        start = r.snapshot()
+        while not r.is_finished:
+            r.step()
+        end = r.snapshot()
+        cards = [CARDS[i] for record in end.history for i in record.cards]
+        r.restore(start)
+        trick = r.game.trick
+        for _ in range(2):
+            for card in cards:
+                r.apply(card)
+            self.assertEqual(end, r.snapshot())
+            for _ in cards:
+                r.undo()
+            self.assertEqual(start, r.snapshot())
+        # the trick and the undo entries are reused
+        self.assertIs(trick, r.game.trick)
+        self.assertEqual(30, len(r._undo_stack))
+        with self.assertRaises(Exception):
+            r.undo()
+        self.assertEqual(0, sum(len(p.trick_stack) for p in r.player[:2]))
+        with self.assertRaises(ValueError):
+            r.apply(list(r.player[(r.front_hand + 1) % 3].hand)[0])
@@ -0,0 +1,103 @@
+import itertools
+import random
+import unittest
+from collections import Counter
+
+from skat.bitboard import FULL_MASK, SUIT_MASKS, popcount
+from skat.sampling import DealSampler, card_groups, count_deals, multinomial
+
+
+def brute_force(hidden, sizes, allowed) -> int:
+    cards = [c for c in range(32) if hidden >> c & 1]
+    count = 0
+    for slots in itertools.product(range(len(sizes)), repeat=len(cards)):
+        masks = [0] * len(sizes)
+        for card, slot in zip(cards, slots):
+            masks[slot] |= 1 << card
+        if all(
+            popcount(mask) == n and mask & ~allowed_mask == 0
+            for mask, n, allowed_mask in zip(masks, sizes, allowed)
+        ):
+            count += 1
+    return count
+
+
+def random_constraints(rng, n_cards):
+    cards = rng.sample(range(32), n_cards)
+    hidden = sum(1 << c for c in cards)
+    sizes = [0, 0, 0, 0]
+    for _ in cards:
+        sizes[rng.randrange(4)] += 1
+    allowed = [sum(1 << c for c in cards if rng.random() < 0.7) for _ in range(4)]
+    return hidden, sizes, allowed
+
+
+class SamplingTest(unittest.TestCase):
+    def test_count_deals(self) -> None:
+        rng = random.Random(2)
+        for _ in range(60):
+            hidden, sizes, allowed = random_constraints(rng, rng.randrange(1, 8))
+            self.assertEqual(
+                brute_force(hidden, sizes, allowed),
+                count_deals(hidden, sizes, allowed),
+            )
+
+    def test_unconstrained(self) -> None:
+        hidden = (1 << 22) - 1
+        sizes = [10, 10, 0, 2]
+        self.assertEqual(multinomial(sizes), count_deals(hidden, sizes, [hidden] * 4))
+        self.assertEqual(1, len(card_groups(hidden, [hidden] * 4)))
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            count_deals(0b111, [1, 1, 0, 0], [0b111] * 4)
+        self.assertEqual(0, count_deals(0b11, [2, 0, 0, 0], [0b1, 0b11, 0, 0]))
+
+    def test_sample_constraints(self) -> None:
+        rng = random.Random(1)
+        hidden = FULL_MASK & ~SUIT_MASKS[0]
+        sizes = [8, 8, 6, 2]
+        allowed = [FULL_MASK, ~SUIT_MASKS[1], ~SUIT_MASKS[2], FULL_MASK]
+        sampler = DealSampler(hidden, sizes, allowed)
+        deals = [sampler.sample(rng) for _ in range(50)]
+        deals += [list(map(int, row)) for row in sampler.batch(50, seed=1)]
+        for slots in deals:
+            self.assertEqual(hidden, slots[0] | slots[1] | slots[2] | slots[3])
+            self.assertEqual(sizes, [popcount(slot) for slot in slots])
+            for slot, mask in zip(slots, allowed):
+                self.assertEqual(slot, slot & mask)
+
+    def test_uniform(self) -> None:
+        rng = random.Random(3)
+        hidden, sizes, allowed = (
+            0b111111,
+            [2, 2, 1, 1],
+            [0b111, 0b111111, 0b110001, 0b111000],
+        )
+        sampler = DealSampler(hidden, sizes, allowed)
+        total = brute_force(hidden, sizes, allowed)
+        self.assertEqual(total, sampler.total)
+        n = 200 * total
+        for deals in (
+            Counter(tuple(sampler.sample(rng)) for _ in range(n)),
+            Counter(tuple(map(int, row)) for row in sampler.batch(n, seed=3)),
+        ):
+            self.assertEqual(total, len(deals))
+            # every deal is drawn about 200 times, far from the bounds by chance
+            self.assertLess(max(deals.values()), 300)
+            self.assertGreater(min(deals.values()), 120)
+
+    def test_tight(self) -> None:
+        # a late-game situation: every seat is void in most suits
+        rng = random.Random(0)
+        hidden = SUIT_MASKS[0] | SUIT_MASKS[1]
+        allowed = [SUIT_MASKS[0], SUIT_MASKS[1], FULL_MASK, FULL_MASK]
+        sampler = DealSampler(hidden, [7, 7, 1, 1], allowed)
+        self.assertEqual(2 * 8 * 8, sampler.total)
+        for _ in range(20):
+            slots = sampler.sample(rng)
+            self.assertEqual(slots[0], slots[0] & SUIT_MASKS[0])
+            self.assertEqual(slots[1], slots[1] & SUIT_MASKS[1])
+        with self.assertRaises(ValueError):
+            impossible = [SUIT_MASKS[1], SUIT_MASKS[1], 0, 0]
+            DealSampler(hidden, [8, 8, 0, 0], impossible).sample(rng)
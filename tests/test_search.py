@@ -0,0 +1,61 @@
+import random
+import unittest
+
+from skat.bitboard import card_ids
+from skat.card import CARDS
+from skat.game import Round
+from skat.games.grand import Grand
+from skat.games.null import Null
+from skat.games.suit import SuitGame
+from skat.search import SearchState
+
+
+def from_round(r: Round) -> SearchState:
+    return SearchState(
+        r.game.type_id,
+        r.solo_player_id,
+        [player.hand.mask for player in r.player],
+        r.front_hand,
+        [turn.card.id for turn in r.game.trick.buffer],
+        r.points_soloist,
+        r.points_defenders,
+    )
+
+
+class SearchStateTest(unittest.TestCase):
+    def test_matches_round(self) -> None:
+        rng = random.Random(4)
+        for game in (SuitGame(3), Grand(), Null()):
+            r = Round(
+                skip_bidding=True,
+                solo_player_id=0,
+                declare_game=game,
+                hand_game=True,
+                start=False,
+                seed=2,
+            )
+            r.prepare()
+            state = from_round(r)
+            while not r.is_finished:
+                legal = card_ids(state.legal_mask())
+                valid = r.player[r.next_player].valid_moves(r.game.trick)
+                self.assertEqual(sorted(card.id for card in valid), list(legal))
+                card = rng.choice(legal)
+                copy = state.copy()
+                state.play(card)
+                self.assertEqual(r.next_player, copy.next_player)
+                r.apply(CARDS[card])
+                self.assertEqual(r.next_player, state.next_player)
+                self.assertEqual(r.points_soloist, state.points)
+                self.assertEqual(r.points_defenders, state.defender_points)
+            self.assertTrue(state.is_terminal)
+            if game.type_id != Null().type_id:
+                self.assertEqual(r.points_soloist, state.value())
+
+    def test_copy(self) -> None:
+        state = SearchState(0, 1, [1, 2, 4], 0)
+        copy = state.copy()
+        copy.play(0)
+        self.assertEqual([1, 2, 4], state.hands)
+        self.assertEqual([], state.trick)
+        self.assertEqual([0, 2, 4], copy.hands)
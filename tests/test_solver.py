@@ -0,0 +1,137 @@
+import random
+import unittest
+
+from skat.bitboard import iter_cards, legal_moves
+from skat.card import CARDS
+from skat.deck import Deck
+from skat.game import Round
+from skat.games.suit import SuitGame
+from skat.games.tables import FOLLOW_MASKS, LEAD_STRENGTH, NULL
+from skat.solver import VALUES, Solver, solve, solve_round
+from skat.trick import lookup_winner
+
+
+def minimax(type_id, soloist, hands, leader, trick) -> int:
+    """Plain minimax without any pruning, the reference of the solver."""
+    if not trick and not any(hands):
+        return 120 if type_id == NULL else 0
+    player = (leader + len(trick)) % 3
+    forced = FOLLOW_MASKS[type_id][trick[0]] if trick else 0
+    values = list()
+    for card in iter_cards(legal_moves(hands[player], forced)):
+        next_hands = list(hands)
+        next_hands[player] ^= 1 << card.id
+        next_trick = trick + [card.id]
+        if len(next_trick) < 3:
+            value = minimax(type_id, soloist, next_hands, leader, next_trick)
+        else:
+            strength = LEAD_STRENGTH[type_id][next_trick[0]]
+            winner = (leader + lookup_winner(strength, *next_trick)) % 3
+            if type_id == NULL:
+                if winner == soloist:
+                    value = 0
+                else:
+                    value = minimax(type_id, soloist, next_hands, winner, [])
+            else:
+                points = sum(VALUES[c] for c in next_trick)
+                value = minimax(type_id, soloist, next_hands, winner, [])
+                value += points if winner == soloist else 0
+        values.append(value)
+    return max(values) if player == soloist else min(values)
+
+
+def random_position(rng, n):
+    """Deal n cards per seat and play 0-2 random cards of the first trick."""
+    cards = list(range(32))
+    rng.shuffle(cards)
+    hands = [sum(1 << c for c in cards[i::3][:n]) for i in range(3)]
+    type_id, soloist, leader = rng.randrange(6), rng.randrange(3), rng.randrange(3)
+    trick: list[int] = list()
+    for i in range(rng.randrange(3)):
+        player = (leader + i) % 3
+        forced = FOLLOW_MASKS[type_id][trick[0]] if trick else 0
+        legal = [c.id for c in iter_cards(legal_moves(hands[player], forced))]
+        card = rng.choice(legal)
+        hands[player] ^= 1 << card
+        trick.append(card)
+    return type_id, soloist, hands, leader, trick
+
+
+class SolverTest(unittest.TestCase):
+    def test_matches_minimax(self) -> None:
+        rng = random.Random(1)
+        for _ in range(100):
+            position = random_position(rng, rng.randrange(1, 4))
+            type_id, soloist, hands, leader, trick = position
+            expected = minimax(type_id, soloist, hands, leader, list(trick))
+            solution = solve(hands, type_id, soloist, leader, trick)
+            self.assertEqual(expected, solution.value, msg=position)
+            # the best move keeps the value
+            player = (leader + len(trick)) % 3
+            hands[player] ^= 1 << solution.card
+            trick = trick + [solution.card]
+            if len(trick) == 3:
+                strength = LEAD_STRENGTH[type_id][trick[0]]
+                winner = (leader + lookup_winner(strength, *trick)) % 3
+                if type_id == NULL:
+                    value = 0 if winner == soloist else None
+                    if value is None:
+                        value = minimax(type_id, soloist, hands, winner, [])
+                else:
+                    value = minimax(type_id, soloist, hands, winner, [])
+                    value += sum(VALUES[c] for c in trick) if winner == soloist else 0
+            else:
+                value = minimax(type_id, soloist, hands, leader, trick)
+            self.assertEqual(expected, value, msg=position)
+
+    def test_window(self) -> None:
+        rng = random.Random(2)
+        for _ in range(30):
+            type_id, soloist, hands, leader, trick = random_position(rng, 3)
+            solver = Solver(type_id, soloist)
+            exact = solver.solve(hands, leader, trick).value
+            bound = solver.solve(hands, leader, trick, alpha=exact, beta=exact + 1)
+            self.assertEqual(exact, bound.value)
+            above = solver.solve(hands, leader, trick, alpha=exact + 1, beta=121)
+            self.assertLessEqual(above.value, exact + 1)
+
+    def test_node_budget(self) -> None:
+        # full deals, the solver visits about half of the budget on them
+        for seed, type_id, budget in ((8, 0, 100000), (3, 4, 200000), (8, 5, 40000)):
+            deck = Deck.batch(1, seed=seed)[0]
+            hands = [
+                sum(1 << int(c) for c in cards) for cards in deck[:30].reshape(3, 10)
+            ]
+            solver = Solver(type_id, 0)
+            solver.solve(hands, 0)
+            self.assertLess(solver.nodes, budget)
+
+    def test_win_query_budget(self) -> None:
+        # the exact solve of this suit deal (44 points) visits about 5M nodes
+        deck = Deck.batch(1, seed=5)[0]
+        hands = [sum(1 << int(c) for c in cards) for cards in deck[:30].reshape(3, 10)]
+        solver = Solver(0, 0)
+        self.assertEqual(60, solver.solve(hands, 0, alpha=60, beta=61).value)
+        self.assertLess(solver.nodes, 150000)
+
+    def test_invalid_hands(self) -> None:
+        with self.assertRaises(ValueError):
+            solve([0b1, 0b10, 0b1100], 0, 0, 0)
+
+    def test_solve_round(self) -> None:
+        r = Round(
+            skip_bidding=True,
+            solo_player_id=1,
+            declare_game=SuitGame(3),
+            hand_game=True,
+            start=False,
+            seed=3,
+        )
+        r.prepare()
+        for _ in range(22):
+            r.step()
+        solution = solve_round(r)
+        # playing the solver's moves for everybody reaches its value
+        while not r.is_finished:
+            r.apply(CARDS[solve_round(r).card])
+        self.assertEqual(solution.value, r.points_soloist)
@@ -4,7 +4,7 @@ import numpy as np
 
 from skat.card import Card
 from skat.games.suit import SuitGameTrick
-from skat.trick import TrickHistory
+from skat.trick import TrickHistory, TrickRecord, Turn
 
 
 class SuitGameTrickTest(unittest.TestCase):
@@ -261,3 +261,22 @@ class TrickHistoryTest(unittest.TestCase):
             ]
         )
         self.assertTrue(np.array_equal(exp, self.history.to_numpy(player_id=0)))
+
+    def test_records(self) -> None:
+        self.add_tricks()
+        first = self.history[0]
+        self.assertIsInstance(first, TrickRecord)
+        self.assertEqual((8, 9, 10), first.cards)
+        self.assertEqual(0, first.leader)
+        self.assertEqual(2, first.winner)  # ♥9 wins the ♥ trick
+        self.assertEqual(0, first.value)
+        self.assertEqual(Turn(1, Card(1, 1)), first.buffer[1])
+        with self.assertRaises(AttributeError):
+            first.winner = 0  # type: ignore
+        self.assertEqual(first.mask | self.history[1].mask, self.history.mask)
+
+    def test_record_incomplete_trick(self) -> None:
+        trick = SuitGameTrick(0)
+        trick.append(0, Card(1, 0))
+        with self.assertRaises(Exception):
+            self.history.append(trick)
@@ -1,7 +1,11 @@
+import random
 import unittest
 
+import numpy as np
+
 from skat.card import Card
 from skat.utils.misc import disjoint
+from skat.utils.rng import make_rng, make_seed_sequence, round_seed
 
 
 class UtilsTest(unittest.TestCase):
@@ -38,3 +42,18 @@ class UtilsTest(unittest.TestCase):
         self.assertTrue(disjoint(card_list))
         card_list.append((Card(1, 5), Card(1, 2)))
         self.assertFalse(disjoint(card_list))
+
+    def test_make_rng(self) -> None:
+        rng = random.Random(1)
+        self.assertIs(rng, make_rng(rng))
+        self.assertEqual(make_rng(5).random(), make_rng(5).random())
+        ss = np.random.SeedSequence(5)
+        self.assertEqual(make_rng(ss).random(), make_rng(ss).random())
+        self.assertIsInstance(make_rng(np.random.default_rng(5)), random.Random)
+
+    def test_round_seed(self) -> None:
+        master = make_seed_sequence(42)
+        self.assertEqual(42, master.entropy)
+        first = round_seed(master, 0).generate_state(2)
+        self.assertTrue((first == round_seed(master, 0).generate_state(2)).all())
+        self.assertFalse((first == round_seed(master, 1).generate_state(2)).all())
@@ -0,0 +1,90 @@
+import unittest
+
+import numpy as np
+
+from skat.agents.random import RandomAgent
+from skat.bitboard import to_mask
+from skat.card import CARDS
+from skat.deck import Deck
+from skat.game import Round
+from skat.games.grand import Grand
+from skat.games.null import Null
+from skat.games.suit import SuitGame
+from skat.vec_round import VecRound
+
+
+class ScriptedAgent(RandomAgent):
+    """Plays the cards of a script and records the valid moves it was offered."""
+
+    def __init__(self, script: list) -> None:
+        super().__init__()
+        self.script = script
+        self.offered: list[int] = list()
+
+    def choose_card(self, valid_moves):
+        self.offered.append(to_mask(valid_moves))
+        choice = self.script.pop(0)
+        self.state.hand.remove(choice)
+        return choice
+
+
+class VecRoundTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.n = 12
+        self.vec = VecRound(self.n, seed=3)
+        self.game_types = np.arange(self.n) % 6
+        self.soloists = np.arange(self.n) % 3
+        self.decks = Deck.batch(self.n, seed=4)
+        self.vec.reset(self.decks, game_type=self.game_types, soloist=self.soloists)
+
+    def play(self) -> tuple[list, list]:
+        actions, legal = list(), list()
+        while not self.vec.is_finished:
+            legal.append(self.vec.legal_actions().copy())
+            actions.append(self.vec.random_actions())
+            self.vec.step(actions[-1])
+        return actions, legal
+
+    def test_points(self) -> None:
+        self.play()
+        self.assertTrue((self.vec.points.sum(axis=1) == 120).all())
+        self.assertTrue((self.vec.hands == 0).all())
+
+    def test_illegal_action(self) -> None:
+        with self.assertRaises(ValueError):
+            self.vec.step(np.full(self.n, self.decks[0, 0]))
+
+    def test_matches_round(self) -> None:
+        actions, legal = self.play()
+        for i in range(self.n):
+            # the seat of a card follows from the deck layout, 10 cards per seat
+            seats = [list(self.decks[i]).index(a[i]) // 10 for a in actions]
+            scripts: list[list] = [[], [], []]
+            for ply, seat in enumerate(seats):
+                scripts[seat].append(CARDS[actions[ply][i]])
+            agents = [ScriptedAgent(script) for script in scripts]
+            r = Round(
+                skip_bidding=True,
+                solo_player_id=int(self.soloists[i]),
+                declare_game=self.new_game(self.game_types[i]),
+                hand_game=True,
+                agents=agents,
+                start=False,
+                initial_cards=Deck.from_ids(self.decks[i]).to_list(),
+            )
+            r.start()
+            for ply, seat in enumerate(seats):
+                self.assertEqual(legal[ply][i], agents[seat].offered.pop(0))
+            for seat in range(3):
+                self.assertEqual(
+                    self.vec.points[i, seat], r.player[seat].trick_stack_value
+                )
+                self.assertAlmostEqual(
+                    self.vec.rewards()[i, seat], r.cumulative_reward(seat)
+                )
+
+    @staticmethod
+    def new_game(type_id):
+        if type_id < 4:
+            return SuitGame(int(type_id))
+        return Grand() if type_id == 4 else Null()